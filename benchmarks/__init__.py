@@ -0,0 +1,9 @@
+# 油库里普通话性能基准测试。
+#
+# 在项目根目录运行：
+#   python -m benchmarks                    各阶段及完整转换的吞吐量与延迟（JSON）
+#   python -m benchmarks.bench_backend      拼音表查询后端对比
+#   python -m benchmarks.bench_parallel     多进程转换的扩展性
+#   python -m benchmarks.bench_threads      多线程共享数据库查询的扩展性
+#   python -m benchmarks.bench_schema       各版本数据表结构的导入与查询速度
+#   python -m benchmarks.bench_convert_file 文件转换的耗时与内存峰值
@@ -0,0 +1,56 @@
+# 运行各阶段基准测试并输出JSON。
+# 在项目根目录运行：python -m benchmarks --sizes small,medium --output result.json
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from benchmarks.corpus import SIZES, make_corpus
+from benchmarks.stages import STAGES, run
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="油库里普通话各阶段吞吐量与延迟")
+    parser.add_argument("--sizes", default="small,medium",
+                        help=f"语料规模，逗号分隔，可选 {','.join(SIZES)} 或句子数（默认 small,medium）")
+    parser.add_argument("--stages", default=",".join(STAGES), help="要测量的阶段，逗号分隔（默认全部）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个阶段重复测量的轮数")
+    parser.add_argument("--seed", type=int, default=0, help="语料随机种子")
+    parser.add_argument("--backend", default="sqlite", help="拼音表查询后端：sqlite 或 memory")
+    parser.add_argument("--output", help="结果文件路径，默认输出到标准输出")
+    args = parser.parse_args(argv)
+
+    corpora = {}
+    for size in args.sizes.split(","):
+        count = SIZES[size] if size in SIZES else int(size)
+        corpora[size] = make_corpus(count, args.seed)
+
+    try:
+        from yukkurimandarin import __version__
+    except ImportError:
+        __version__ = "dev"
+    report = {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "backend": args.backend,
+        },
+        "results": run(corpora, args.stages.split(","), args.repeat, args.backend),
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# 比较拼音表查询后端的单句延迟。
+# 在项目根目录运行：python -m benchmarks.bench_backend
+
+import random
+from time import perf_counter
+from typing import List, Tuple
+
+from yukkurimandarin import DatabaseManager
+from yukkurimandarin.generate_gana import YINJIE
+
+
+def make_serials(count: int, length: int, seed: int = 0) -> List[List[Tuple[str, str]]]:
+    """生成随机拼音序列，模拟每句 `length` 个字的句子"""
+    rng = random.Random(seed)
+    syllables = list(YINJIE)
+    serials = []
+    for _ in range(count):
+        tones = ["0"] + [rng.choice("12345") for _ in range(length)] + ["0"]
+        serials.append([(rng.choice(syllables), f"{tones[i-1]}{tones[i]}{tones[i+1]}")
+                        for i in range(1, length + 1)])
+    return serials
+
+
+def bench(name: str, dm: DatabaseManager, serials: List[List[Tuple[str, str]]]) -> None:
+    start = perf_counter()
+    for serial in serials:
+        dm.serial_search(serial, "")
+    elapsed = perf_counter() - start
+    print(f"{name:<16} {elapsed / len(serials) * 1e6:>10.1f} us/句")
+
+
+if __name__ == "__main__":
+    serials = make_serials(count=2000, length=20)
+    bench("sqlite-per-call", DatabaseManager(), serials)
+    with DatabaseManager() as dm:
+        bench("sqlite-open", dm, serials)
+    with DatabaseManager(backend="memory") as dm:
+        bench("memory", dm, serials)
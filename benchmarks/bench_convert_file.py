@@ -0,0 +1,58 @@
+# 比较 convert_file 与“全部读入后逐行转换”的耗时和内存峰值。
+# 在项目根目录运行：python -m benchmarks.bench_convert_file [行数]
+
+import random
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Tuple
+
+from yukkurimandarin import convert_file, text_convert
+
+BASE = "油库里普通话是什么？嗯，好问题。你想不想要说不要？不，不行还是部分不会。我很想你跑起来，进入蒙古展览馆。有一个人前来买瓜。"
+
+
+def make_file(path: Path, lines: int, seed: int = 0) -> None:
+    """生成随机文本文件"""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(lines):
+            f.write("".join(rng.choice(BASE) for _ in range(rng.randint(10, 60))))
+            f.write("\n")
+
+
+def naive(src: Path, dst: Path) -> None:
+    """全部读入内存后逐行转换"""
+    lines = src.read_text(encoding="utf-8").splitlines()
+    results = [text_convert(line) for line in lines]
+    dst.write_text("\n".join(results) + "\n", encoding="utf-8")
+
+
+def streaming(src: Path, dst: Path) -> None:
+    convert_file(str(src), str(dst))
+
+
+def measure(func: Callable[[Path, Path], None], src: Path, dst: Path) -> Tuple[float, float]:
+    """返回(耗时秒数, 内存峰值MB)"""
+    start = perf_counter()
+    func(src, dst)
+    elapsed = perf_counter() - start
+    tracemalloc.start()
+    func(src, dst)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src.txt"
+        make_file(src, lines)
+        text_convert("预热")
+        print(f"输入: {lines} 行, {src.stat().st_size / 1024 / 1024:.1f} MB")
+        for name, func in (("naive", naive), ("convert_file", streaming)):
+            elapsed, peak = measure(func, src, Path(tmp) / f"{name}.txt")
+            print(f"{name:<14} {elapsed:>8.2f} s  内存峰值 {peak:>8.1f} MB")
@@ -0,0 +1,34 @@
+# 测量多进程转换随进程数增加的吞吐量。
+# 在项目根目录运行：python -m benchmarks.bench_parallel [最大进程数]
+
+import os
+import random
+import sys
+from time import perf_counter
+from typing import List
+
+from yukkurimandarin import convert_parallel
+
+BASE = "油库里普通话是什么？嗯，好问题。你想不想要说不要？不，不行还是部分不会。我很想你跑起来，进入蒙古展览馆。有一个人前来买瓜。"
+
+
+def make_book(lines: int, seed: int = 0) -> List[str]:
+    """生成随机文本，模拟一本书的各行"""
+    rng = random.Random(seed)
+    return ["".join(rng.choice(BASE) for _ in range(rng.randint(10, 60))) for _ in range(lines)]
+
+
+if __name__ == "__main__":
+    max_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    book = make_book(20000)
+    chars = sum(len(line) for line in book)
+    jobs = 1
+    baseline = 0.0
+    while jobs <= max_jobs:
+        start = perf_counter()
+        convert_parallel(book, jobs=jobs, chunksize=500)
+        elapsed = perf_counter() - start
+        if jobs == 1:
+            baseline = elapsed
+        print(f"jobs={jobs:<3} {chars / elapsed:>12.0f} 字/秒  加速比 {baseline / elapsed:.2f}")
+        jobs *= 2
@@ -0,0 +1,59 @@
+# 比较各版本数据表结构的导入与查询速度。
+# 在项目根目录运行：python -m benchmarks.bench_schema
+
+import os
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import List, Tuple
+
+from benchmarks.bench_backend import make_serials
+from yukkurimandarin.database import SCHEMAS, Database
+
+INSERT = "INSERT INTO pinyin_data (yinjie, tone, hiragana) VALUES (?, ?, ?)"
+SELECT = "SELECT hiragana FROM pinyin_data WHERE yinjie = ? AND tone = ?"
+
+
+def load_rows() -> List[Tuple[str, str, str]]:
+    db = Database(Database.DEFAULT_DB_PATH, read_only=True)
+    try:
+        rows = db.query_all()
+    finally:
+        db.close()
+    random.Random(0).shuffle(rows)
+    return rows
+
+
+def bench(version: int, path: Path, rows: List[Tuple[str, str, str]], lookups: List[Tuple[str, str]]) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMAS[version])
+    conn.commit()
+    # 导入全部数据
+    start = perf_counter()
+    conn.executemany(INSERT, rows)
+    conn.commit()
+    import_s = perf_counter() - start
+    # 再次导入，全部覆盖已有数据
+    start = perf_counter()
+    conn.executemany(INSERT, rows)
+    conn.commit()
+    upsert_s = perf_counter() - start
+    conn.execute("VACUUM")
+    # 逐条查询
+    start = perf_counter()
+    for entry in lookups:
+        conn.execute(SELECT, entry).fetchone()
+    lookup_s = perf_counter() - start
+    conn.close()
+    print(f"v{version}  导入 {len(rows) / import_s:>9.0f} 行/秒  覆盖 {len(rows) / upsert_s:>9.0f} 行/秒  "
+          f"查询 {len(lookups) / lookup_s:>9.0f} 次/秒  文件 {os.path.getsize(path) / 1024:>7.0f} KiB")
+
+
+if __name__ == "__main__":
+    rows = load_rows()
+    lookups = [entry for serial in make_serials(count=2500, length=20) for entry in serial]
+    with tempfile.TemporaryDirectory() as tmp:
+        for version in sorted(SCHEMAS):
+            bench(version, Path(tmp) / f"v{version}.db", rows, lookups)
@@ -0,0 +1,72 @@
+# 测量多个线程共享同一个 DatabaseManager 时的查询吞吐量。
+# 在项目根目录运行：python -m benchmarks.bench_threads [最大线程数] [--writer]
+#
+# 使用内置数据库的临时副本；指定 --writer 时另有一个线程持续写入，用于观察WAL模式下读取是否被阻塞。
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from time import perf_counter
+from typing import List, Tuple
+
+from benchmarks.bench_backend import make_serials
+from yukkurimandarin import DatabaseManager
+from yukkurimandarin.database import Database
+
+
+def stress(dm: DatabaseManager, serials: List[List[Tuple[str, str]]], threads: int) -> float:
+    """每个线程查询全部序列，返回每秒查询的句数"""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker() -> None:
+        barrier.wait()
+        for serial in serials:
+            dm.serial_search(serial, "")
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    start = perf_counter()
+    for t in workers:
+        t.join()
+    return threads * len(serials) / (perf_counter() - start)
+
+
+def write_loop(dm: DatabaseManager, stop: threading.Event) -> None:
+    """持续修改同一条数据"""
+    i = 0
+    while not stop.is_set():
+        dm.add_pinyin("giao", "040", f"ぎゃ'お{i % 2}", report=False)
+        i += 1
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    max_threads = int(args[0]) if args else 2 * (os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        shutil.copy(Database.DEFAULT_DB_PATH, db_path)
+        serials = make_serials(count=500, length=20)
+        with DatabaseManager(db_path) as dm:
+            stop = threading.Event()
+            writer = None
+            if "--writer" in sys.argv:
+                writer = threading.Thread(target=write_loop, args=(dm, stop))
+                writer.start()
+            threads = 1
+            baseline = 0.0
+            try:
+                while threads <= max_threads:
+                    rate = stress(dm, serials, threads)
+                    if threads == 1:
+                        baseline = rate
+                    print(f"threads={threads:<3} {rate:>10.0f} 句/秒  加速比 {rate / baseline:.2f}")
+                    threads *= 2
+            finally:
+                stop.set()
+                if writer is not None:
+                    writer.join()
@@ -0,0 +1,39 @@
+# 可复现的合成语料。
+
+import random
+from typing import Dict, List
+
+# 常用汉字（包含“不”“一”等变调字和大量上声字）
+HANZI = ("的一是不了人我在有他这中大来上国个到说们为子和你地出道也时年得就那要下以生会自着去之过家学对可她里后"
+         "小么心多天而能好都然没日于起还发成事只作当想看文无开手十用主行方又如前所本见经头面公同三已老从动两长"
+         "油库普通话展览馆蒙古水果买瓜跑起来很请问")
+LATIN_WORDS = ("city", "max-heap", "Python", "AquesTalk", "YMM4", "ok", "philosophers")
+KANA = ("ゆっくり", "していってね", "カタカナ", "ｶﾞｷﾞ", "ありがとう")
+PUNCTUATION = "，。、！？；：…—「」（）,.!?"
+DIGITS = ("1", "42", "2025", "3.14", "100%", "666 ")
+
+# 语料规模：句子数
+SIZES: Dict[str, int] = {"small": 100, "medium": 1000, "large": 10000}
+
+
+def make_sentence(rng: random.Random) -> str:
+    """生成一个混合了汉字、数字、英文、假名和标点的句子"""
+    parts = []
+    for _ in range(rng.randint(1, 6)):
+        roll = rng.random()
+        if roll < 0.65:
+            parts.append("".join(rng.choice(HANZI) for _ in range(rng.randint(2, 12))))
+        elif roll < 0.75:
+            parts.append(rng.choice(DIGITS))
+        elif roll < 0.85:
+            parts.append(rng.choice(LATIN_WORDS))
+        elif roll < 0.92:
+            parts.append(rng.choice(KANA))
+        parts.append(rng.choice(PUNCTUATION))
+    return "".join(parts)
+
+
+def make_corpus(size: int, seed: int = 0) -> List[str]:
+    """生成指定句子数的语料。相同的size和seed总是得到相同的语料"""
+    rng = random.Random(f"{seed}-{size}")
+    return [make_sentence(rng) for _ in range(size)]
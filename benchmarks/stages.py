@@ -0,0 +1,167 @@
+# 转换流程各阶段及完整转换的基准测试。
+
+import statistics
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from pypinyin import pinyin, Style
+
+from yukkurimandarin.core import Converter, divide
+from yukkurimandarin.database_mngr import DatabaseManager
+from yukkurimandarin.hanzi_process import default_tokenizer, tokenize
+from yukkurimandarin.sandhi import apply_sandhi, tone_array
+from yukkurimandarin.non_hanzi_process import non_hanzi_process
+from yukkurimandarin.post_process import post_process
+from yukkurimandarin.pre_process import pre_process
+
+MARK = "/0"
+
+
+class Context(NamedTuple):
+    """一个句子在各阶段的输入（预先计算，不计入耗时）"""
+    sentence: str
+    pre_processed: str
+    hanzi: List[str]
+    non_hanzi: List[str]
+    marked_frag: List[str]
+    tokens: List[str]
+    pinyin_list: List[List[str]]
+    serial: List[tuple]
+    combined: str
+    pinyin_text: str
+
+
+def prepare(sentence: str, db_mngr: DatabaseManager) -> Context:
+    """按 `hanzi_process` 的流程计算一个句子在各阶段的中间结果"""
+    pre_processed = pre_process(sentence)
+    hanzi, non_hanzi, _ = divide(pre_processed)
+    marked_frag = [MARK]
+    for f in hanzi:
+        marked_frag.append(f)
+        marked_frag.append(MARK)
+    tokens = tokenize(marked_frag, tokenizer=None, mark=MARK)
+    pinyin_list = pinyin(tokens, style=Style.TONE3, neutral_tone_with_five=True)
+    syllables = [p[0][:-1] for p in pinyin_list]
+    tones = tone_array(pinyin_list)
+    apply_sandhi(tones, syllables, tokens, MARK)
+    serial = [(syllables[i], f"{tones[i-1]}{tones[i]}{tones[i+1]}") for i in range(1, len(tones) - 1)]
+    # 完整转换前、后处理之前的句子
+    combined = "".join(db_mngr.serial_search(serial, ""))
+    # 用于 pinyin_convert 的拼音文本
+    pinyin_text = " ".join(f"{y}{tone[1]}" for y, tone in serial if y != "/")
+    return Context(sentence, pre_processed, hanzi, non_hanzi, marked_frag, tokens,
+                   pinyin_list, serial, combined, pinyin_text)
+
+
+def _sandhi(ctx: Context) -> Callable[[], Any]:
+    # 与 hanzi_process 相同：取出音节和声调后一次完成变调
+    def run() -> None:
+        syllables = [p[0][:-1] for p in ctx.pinyin_list]
+        apply_sandhi(tone_array(ctx.pinyin_list), syllables, ctx.tokens, MARK)
+    return run
+
+
+def make_stages(converter: Converter) -> Dict[str, Callable[[Context], Callable[[], Any]]]:
+    """
+    各阶段的测量函数
+
+    每个函数接收句子的 `Context`，返回一个无参数的可调用对象，只有调用它的时间计入耗时。
+    """
+    tokenizer = converter.tokenizer
+    db_mngr = converter.pinyin_database
+    return {
+        "pre_process": lambda ctx: lambda: pre_process(ctx.sentence),
+        "divide": lambda ctx: lambda: divide(ctx.pre_processed),
+        "tokenize": lambda ctx: lambda: tokenize(ctx.marked_frag, tokenizer=tokenizer, mark=MARK),
+        "pypinyin": lambda ctx: lambda: pinyin(ctx.tokens, style=Style.TONE3, neutral_tone_with_five=True),
+        "sandhi": _sandhi,
+        "serial_search": lambda ctx: lambda: db_mngr.serial_search(ctx.serial, ""),
+        "non_hanzi_process": lambda ctx: lambda: non_hanzi_process(ctx.non_hanzi, converter.non_hanzi_config),
+        "post_process": lambda ctx: lambda: post_process(ctx.combined, False),
+        "text_convert": lambda ctx: lambda: converter.text(ctx.sentence),
+        "pinyin_convert": lambda ctx: lambda: converter.pinyin(ctx.pinyin_text),
+    }
+
+
+STAGES = ("pre_process", "divide", "tokenize", "pypinyin", "sandhi", "serial_search",
+          "non_hanzi_process", "post_process", "text_convert", "pinyin_convert")
+
+
+def percentile(sorted_values: Sequence[int], q: float) -> int:
+    """最近秩法计算百分位数"""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def measure(setup: Callable[[Context], Callable[[], Any]],
+            contexts: Sequence[Context],
+            repeat: int = 3) -> Dict[str, Any]:
+    """
+    逐句测量一个阶段
+
+    Returns:
+        总字符数、总耗时、吞吐量（字符/秒）和单句延迟的p50/p99（微秒）
+    """
+    samples: List[int] = []
+    totals: List[int] = []
+    for _ in range(repeat):
+        total = 0
+        for ctx in contexts:
+            call = setup(ctx)
+            start = perf_counter_ns()
+            call()
+            elapsed = perf_counter_ns() - start
+            samples.append(elapsed)
+            total += elapsed
+        totals.append(total)
+    samples.sort()
+    chars = sum(len(ctx.sentence) for ctx in contexts)
+    # 取各轮中位数作为总耗时，减少偶然波动
+    total_ns = statistics.median(totals)
+    return {
+        "sentences": len(contexts),
+        "chars": chars,
+        "total_s": total_ns / 1e9,
+        "chars_per_sec": chars / (total_ns / 1e9) if total_ns else 0.0,
+        "p50_us": percentile(samples, 50) / 1e3,
+        "p99_us": percentile(samples, 99) / 1e3,
+    }
+
+
+def run(corpora: Dict[str, List[str]],
+        stages: Optional[Sequence[str]] = None,
+        repeat: int = 3,
+        backend: str = "sqlite") -> List[Dict[str, Any]]:
+    """
+    对每个语料测量各阶段
+
+    Args:
+        corpora: 语料名 -> 句子列表
+        stages: 要测量的阶段，默认全部
+        repeat: 每个阶段重复测量的轮数
+        backend: 拼音表查询后端
+
+    Returns:
+        每个(语料, 阶段)一条记录
+    """
+    stages = list(stages) if stages is not None else list(STAGES)
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f"未知的阶段: {unknown}")
+    results = []
+    # 关闭缓存，测量每句的真实转换成本
+    with Converter(tokenizer=default_tokenizer(),
+                   pinyin_database=DatabaseManager(backend=backend),
+                   cache_size=0) as converter:
+        if converter.tokenizer is not None:
+            converter.tokenizer.initialize()
+        setups = make_stages(converter)
+        for name, sentences in corpora.items():
+            contexts = [prepare(s, converter.pinyin_database) for s in sentences]
+            for stage in stages:
+                record = {"corpus": name, "stage": stage}
+                record.update(measure(setups[stage], contexts, repeat))
+                results.append(record)
+    return results
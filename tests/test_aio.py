@@ -0,0 +1,103 @@
+import asyncio
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import yukkurimandarin as ym
+import yukkurimandarin.aio as t
+from yukkurimandarin.core import get_default_converter
+
+
+def test_atext_convert():
+    sentences = ["油库里普通话。", "不对，abc。", ""]
+    async def main():
+        return await asyncio.gather(*(t.atext_convert(s) for s in sentences))
+    assert asyncio.run(main()) == [ym.text_convert(s) for s in sentences]
+
+
+def test_apinyin_convert():
+    result = asyncio.run(t.apinyin_convert("you2 ku4 li3 pu3 tong1 hua4 ."))
+    assert result == ym.pinyin_convert("you2 ku4 li3 pu3 tong1 hua4 .")
+
+
+def test_max_concurrency():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    class CountingConverter(ym.Converter):
+        def text(self, *args, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            try:
+                return super().text(*args, **kwargs)
+            finally:
+                with lock:
+                    active -= 1
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        converter = t.AsyncConverter(CountingConverter(), executor=executor, max_concurrency=2)
+        async def main():
+            await converter.warmup()
+            return await asyncio.gather(*(converter.text(f"第{i}句话。") for i in range(20)))
+        results = asyncio.run(main())
+    assert len(results) == 20
+    assert peak <= 2
+
+
+def test_configure_async():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        converter = t.configure_async(executor=executor, max_concurrency=1)
+        assert t.get_default_async_converter() is converter
+        assert asyncio.run(t.atext_convert("你好。")) == ym.text_convert("你好。")
+    t.configure_async()
+    with pytest.raises(ValueError, match="max_concurrency"):
+        t.AsyncConverter(max_concurrency=0)
+
+
+def test_text_many():
+    converter = t.AsyncConverter()
+    # 与同步接口共用默认转换器
+    assert converter.converter is get_default_converter()
+    results = asyncio.run(converter.text_many(["你好。", "不对。"]))
+    assert results == ym.text_convert_many(["你好。", "不对。"])
+
+
+# 在新进程中测量首次异步转换期间事件循环的最长停顿（秒）
+HEARTBEAT_CODE = """
+import asyncio, time
+import yukkurimandarin as ym
+ym.warmup()
+
+async def main():
+    gaps = []
+    done = False
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    await ym.atext_convert("你好")
+    done = True
+    await task
+    print(max(gaps))
+
+asyncio.run(main())
+"""
+
+
+def test_loop_stays_responsive():
+    # 默认转换器的创建和预热都在执行器中进行，事件循环不会等待
+    result = subprocess.run([sys.executable, "-c", HEARTBEAT_CODE], capture_output=True, text=True, check=True)
+    assert float(result.stdout) < 0.5
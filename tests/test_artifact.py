@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from yukkurimandarin.artifact import ArtifactTable, build_artifact
+from yukkurimandarin.database import Database
+from yukkurimandarin.pinyin_table import MemoryTable
+
+
+@pytest.fixture
+def artifact_path(tmp_path):
+    path = tmp_path / "table.bin"
+    build_artifact([("ou", "010", "hiragana1"), ("yu", "011", "hiragana3"), ("yu", "131", "")], path)
+    yield path
+
+
+def test_query_batch(artifact_path):
+    table = ArtifactTable.open(artifact_path)
+    assert len(table) == 2
+    query_entries = [
+        ("ou", "010"),
+        ("ou", "111"),  # 不存在
+        ("yu", "011"),
+        ("ni", "114"),  # 不存在
+        ("yu", "999"),  # 声调无效
+    ]
+    assert table.query_batch(query_entries, "") == ["hiragana1", "", "hiragana3", "", ""]
+    assert table.query_batch(query_entries, "keep") == ["hiragana1", "ou", "hiragana3", "ni", "yu"]
+    assert table.query_batch([("yu", "131")], "keep") == [""]
+    assert table.query_batch([], "") == []
+
+
+def test_close(artifact_path):
+    table = ArtifactTable.open(artifact_path)
+    assert table.query_batch([("ou", "010")], "") == ["hiragana1"]
+    table.close()
+    with pytest.raises(ValueError):
+        table.query_batch([("yu", "011")], "")
+
+
+def test_empty(tmp_path):
+    path = tmp_path / "empty.bin"
+    assert build_artifact([], path) == 0
+    table = ArtifactTable.open(path)
+    assert table.query_batch([("ni", "131")], "keep") == ["ni"]
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "invalid.bin"
+    path.write_bytes(b"not an artifact")
+    with pytest.raises(ValueError):
+        ArtifactTable.open(path)
+
+
+def test_same_as_memory_table(tmp_path):
+    db = Database()
+    entries = db.query_all()
+    db.close()
+    path = tmp_path / "default.bin"
+    assert build_artifact(entries, path) == len(entries)
+    rng = random.Random(0)
+    syllables = sorted({yinjie for yinjie, _, _ in entries}) + ["/", "xyz"]
+    tones = sorted({tone for _, tone, _ in entries}) + ["301"]
+    query = [(rng.choice(syllables), rng.choice(tones)) for _ in range(5000)]
+    expected = MemoryTable(entries).query_batch(query, "keep")
+    assert ArtifactTable.open(path).query_batch(query, "keep") == expected
@@ -0,0 +1,32 @@
+import pytest
+
+from yukkurimandarin.cache import LRUCache, CacheInfo
+
+
+def test_lru_eviction():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1   # a变为最近使用
+    cache.put("c", 3)            # 淘汰b
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.cache_info() == CacheInfo(hits=2, misses=1, maxsize=2, currsize=2)
+
+
+def test_clear():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+    assert cache.cache_info() == CacheInfo(0, 0, 2, 0)
+    assert cache.get("a") is None
+
+
+def test_disabled():
+    cache = LRUCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        LRUCache(-1)
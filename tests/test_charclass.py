@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+
+import yukkurimandarin.charclass as t
+
+
+@pytest.mark.parametrize("input, expected", [
+    ("汉字", True),
+    ("㐀䶿", True),   # CJK统一汉字扩展A
+    ("豈", True),     # CJK兼容汉字
+    ("\ufa6e\ufada", False),  # 兼容汉字区中未分配的码位
+    ("〇", False),
+    ("あ", False),
+    ("𠀀", False),    # 扩展B暂不支持
+])
+def test_is_hanzi_char(input, expected):
+    for char in input:
+        assert t.is_hanzi_char(char) == expected
+
+
+@pytest.mark.parametrize("input, expected", [
+    ("", []),
+    ("abc、。あア１𠀀x!", [("latin", "abc"), ("punctuation", "、。"), ("gana", "あア"),
+                          ("others", "１𠀀"), ("latin", "x"), ("punctuation", "!")]),
+    ("ｶﾞ—α", [("gana", "ｶﾞ"), ("punctuation", "—"), ("others", "α")]),
+])
+def test_class_runs(input, expected):
+    assert t.class_runs(input) == expected
+
+
+@pytest.mark.parametrize("input, expected", [
+    ("", 0),
+    ("abc", 3),
+    ("汉字ab", 6),
+    ("㐀、あアＡｱ", 11),
+    ("𠀀", 1),
+])
+def test_display_width(input, expected):
+    assert t.display_width(input) == expected
+
+
+def test_lazy_table():
+    code = ("import yukkurimandarin.charclass as c\n"
+            "print(c.class_table.cache_info().currsize, c.hanzi_run.cache_info().currsize)")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["0", "0"]
+    assert t.CLASS_TABLE is t.class_table()
+    assert t.HANZI_RUN is t.hanzi_run()
+
+
+def test_normalize_hanzi():
+    assert t.normalize_hanzi("豈更車a") == "豈更車a"
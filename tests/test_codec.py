@@ -0,0 +1,47 @@
+import pytest
+
+import yukkurimandarin.codec as t
+
+
+@pytest.mark.parametrize("tone, expected", [
+    ("000", 0),
+    ("131", 1 * 36 + 3 * 6 + 1),
+    ("555", 215),
+    ("623", None),
+    ("13", None),
+    ("", None),
+])
+def test_encode_tone(tone, expected):
+    assert t.encode_tone(tone) == expected
+    if expected is not None:
+        assert t.decode_tone(expected) == tone
+        assert t.tone_code(*(int(d) for d in tone)) == expected
+
+
+def test_syllable_index():
+    index = t.SyllableIndex()
+    assert index.get("a") == 0
+    assert index.syllable(index.get("ni")) == "ni"
+    assert index.get("giao") is None
+    size = len(index)
+    assert index.add("giao") == size
+    assert index.add("giao") == size
+    assert len(index) == size + 1
+
+
+def test_kana_matrix():
+    matrix = t.KanaMatrix()
+    matrix.set("ni", t.encode_tone("131"), "'に/い")
+    matrix.set("hao", t.encode_tone("130"), "'は/お")
+    matrix.set("giao", t.encode_tone("040"), "ぎゃ'お")  # 自定义音节
+    assert len(matrix) == 3
+    assert matrix.get(matrix.index.get("ni"), t.encode_tone("131")) == "'に/い"
+    assert matrix.get(matrix.index.get("ni"), t.encode_tone("132")) is None
+    syllables = ["ni", "hao", "giao", "/", "ni"]
+    codes = [t.encode_tone("131"), t.encode_tone("130"), t.encode_tone("040"), 0, None]
+    assert matrix.query_codes(syllables, codes, "") == ["'に/い", "'は/お", "ぎゃ'お", "", ""]
+    assert matrix.query_codes(syllables, codes, "keep") == ["'に/い", "'は/お", "ぎゃ'お", "/", "ni"]
+
+
+def test_encode_serial():
+    assert t.encode_serial([("ni", "131"), ("/", "301"), ("x", "bad")]) == (["ni", "/", "x"], [55, 109, None])
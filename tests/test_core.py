@@ -1,6 +1,11 @@
+import shutil
+import sqlite3
+
 import pytest
 
+import yukkurimandarin as ym
 import yukkurimandarin.core as t
+from yukkurimandarin.database import Database
 
 
 @pytest.mark.parametrize("input, expected", [
@@ -14,6 +19,8 @@ import yukkurimandarin.core as t
     ("星座的主星之所以不一定是α星，是因为德国天文学家约翰・拜耳\n在以希腊字母为星座中的星星命名时，并非严格依据亮度排序", 
      (["星座的主星之所以不一定是", "星", "是因为德国天文学家约翰", "拜耳", "在以希腊字母为星座中的星星命名时", "并非严格依据亮度排序"], 
       ["α", "，", "・", "\n", "，"], True)),
+    ("扩展A㐀字和兼容豈字", (["扩展", "㐀字和兼容豈字"], ["A"], True)),
+    ("龎\ufada中文", (["龎", "中文"], ["\ufada"], True)),
 ])
 def test_divide(input, expected):
     assert t.divide(input) == expected
@@ -30,6 +37,16 @@ def test_combine(input, expected):
     assert t.combine(res_hanzi, res_non_hanzi, last_type) == expected
 
 
+@pytest.mark.parametrize("input, expected", [
+    ("", False),
+    ("汉字", True),
+    ("㐀豈", True),
+    ("汉字a", False),
+])
+def test_is_hanzi(input, expected):
+    assert t.is_hanzi(input) == expected
+
+
 def test_text_convert():
     invalid_input = 2
     with pytest.raises(ValueError, match=f"参数sentence必须是字符串: {invalid_input}"):
@@ -43,4 +60,151 @@ def test_text_convert():
     (", . ; ? invalid invalid1 ", "、。,?@@"),
 ])
 def test_pinyin_convert(input, expected):
-    assert t.pinyin_convert(input, "@") == expected
\ No newline at end of file
+    assert t.pinyin_convert(input, "@") == expected
+
+@pytest.mark.parametrize("input", [
+    "油库里普通话。",
+    "你想不想要说不要？不，不行还是部分不会。",
+    "max-heap 中父节点值始终大于等于子节点值，min-heap 则相反",
+])
+def test_converter_text(input):
+    with t.Converter() as converter:
+        assert converter.text(input) == t.text_convert(input)
+        assert converter.text(input, without_accent=True) == t.text_convert(input, without_accent=True)
+
+
+def test_converter_pinyin():
+    with t.Converter() as converter:
+        assert converter.pinyin(", . ; ? invalid invalid1 ", "@") == "、。,?@@"
+        with pytest.raises(ValueError):
+            converter.pinyin(2) # type: ignore
+
+
+def test_converter_keeps_connection(tmp_path):
+    dm = t.DatabaseManager(tmp_path / "converter.db")
+    converter = t.Converter(pinyin_database=dm)
+    assert converter.pinyin("giao4", "@") == "@"
+    assert dm.is_open
+    # 其他连接写入的数据可以立即查到
+    t.DatabaseManager(tmp_path / "converter.db").add_pinyin("giao", "040", "ぎゃ'お", report=False)
+    assert converter.pinyin("giao4", "@") == "ぎゃ'お"
+    converter.close()
+    assert not dm.is_open
+
+
+def test_converter_borrowed_connection(tmp_path):
+    with t.DatabaseManager(tmp_path / "converter.db") as dm:
+        with t.Converter(pinyin_database=dm) as converter:
+            converter.text("汉字")
+        # 不关闭外部打开的长连接
+        assert dm.is_open
+    assert not dm.is_open
+
+
+def test_default_converter_sees_writes(tmp_path, monkeypatch):
+    # 使用内置数据库的副本，避免修改内置数据库
+    db_path = tmp_path / "default.db"
+    shutil.copyfile(Database.DEFAULT_DB_PATH, db_path)
+    monkeypatch.setattr(Database, "DEFAULT_DB_PATH", db_path)
+    monkeypatch.setattr(t, "_DEFAULT_CONVERTER", None)
+    original = ym.text_convert("你")
+    # 通过另一个管理类写入后，默认转换器的缓存随之失效
+    ym.DatabaseManager().add_pinyin("ni", "030", "XXX", report=False)
+    assert ym.text_convert("你") == "XXX"
+    ym.DatabaseManager().add_pinyin("ni", "030", original, report=False)
+    assert ym.text_convert("你") == original
+    # 其他进程写入后，到达检查时间时缓存失效
+    dm = t.get_default_converter().pinyin_database
+    assert dm.reload_interval == t.DatabaseManager.DEFAULT_RELOAD_INTERVAL
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE pinyin_data SET hiragana = 'YYY' WHERE yinjie = 'ni' AND tone = '030'")
+    conn.close()
+    dm._next_check = 0.0
+    assert ym.text_convert("你") == "YYY"
+
+
+def test_converter_keeps_table(monkeypatch):
+    dm = t.DatabaseManager(backend="memory")
+    loads = []
+    build_table = dm._build_table
+    monkeypatch.setattr(dm, "_build_table", lambda: loads.append(1) or build_table())
+    # 每次调用都使用临时转换器，关闭长连接后内存拼音表仍然保留
+    for _ in range(3):
+        assert t.text_convert("油库里普通话。", pinyin_database=dm) == t.text_convert("油库里普通话。")
+    assert len(loads) == 1
+    dm.release()
+    assert not dm.is_open
+
+
+def test_text_convert_many():
+    sentences = [
+        "油库里普通话。",
+        "",
+        "你想不想要说不要？不，不行还是部分不会。",
+        "油库里普通话。",
+        "max-heap 中父节点值始终大于等于子节点值，min-heap 则相反",
+        "ゆっくりしていってね！1234 abc",
+        "不不不不不！",
+    ]
+    assert t.text_convert_many(sentences) == [t.text_convert(s) for s in sentences]
+    assert t.text_convert_many(sentences, without_accent=True) == [t.text_convert(s, without_accent=True) for s in sentences]
+    assert t.text_convert_many([]) == []
+    assert t.text_convert_many(["", ""]) == ["", ""]
+    with pytest.raises(ValueError, match="参数sentence必须是字符串: 2"):
+        t.text_convert_many(["汉字", 2]) # type: ignore
+
+
+def test_converter_cache():
+    converter = t.Converter(cache_size=8)
+    result = converter.text("不好意思，不好意思。")
+    assert converter.text("不好意思，不好意思。") == result
+    info = converter.cache_info()
+    assert info.currsize == 1
+    assert info.hits == 1 and info.misses == 1
+    converter.clear_cache()
+    assert converter.cache_info().currsize == 0
+    assert t.Converter(cache_size=0).cache_info().maxsize == 0
+
+
+def test_converter_cache_coherence(tmp_path):
+    db_path = tmp_path / "tmp_coherence.db"
+    dm = t.DatabaseManager(db_path, backend="memory", reload_interval=0)
+    dm.add_pinyin("hao", "030", "はお", report=False)
+    converter = t.Converter(pinyin_database=dm, cache_size=8)
+    assert converter.text("好。") == "はお。"
+    # 通过同一管理类写入
+    dm.add_pinyin("hao", "030", "ほ", report=False)
+    assert converter.text("好。") == "ほ。"
+    # 其他管理类（或进程）写入
+    t.DatabaseManager(db_path).add_pinyin("hao", "030", "ほう", report=False)
+    assert converter.text("好。") == "ほう。"
+    assert converter.cache_info().currsize == 1
+
+
+def test_converter_warmup():
+    jieba = pytest.importorskip("jieba")
+    converter = t.Converter(tokenizer=jieba.Tokenizer(), cache_size=0)
+    thread = converter.warmup()
+    assert converter.warmup() is thread
+    # 预热期间的转换等待预热完成，结果不变
+    assert converter.text("油库里普通话。") == t.text_convert("油库里普通话。")
+    assert not thread.is_alive()
+    assert converter.tokenizer.initialized
+    assert converter.pinyin_database.is_open
+    converter.close()
+
+
+def test_warmup_foreground():
+    converter = t.Converter()
+    assert converter.warmup(background=False) is None
+    assert converter.pinyin_database.is_open
+    converter.close()
+
+
+def test_default_warmup():
+    thread = t.warmup()
+    assert t.warmup() is thread
+    assert t.text_convert("你好。") == t.Converter().text("你好。")
+    assert not thread.is_alive()
+    assert t.warmup(background=False) is None
@@ -2,7 +2,7 @@ import pytest
 from pathlib import Path
 import sqlite3
 
-from yukkurimandarin.database import Database
+from yukkurimandarin.database import SCHEMA_VERSION, SCHEMAS, Database
 
 def test_is_db_exists():
     assert Database.DEFAULT_DB_PATH.exists(), "数据库不见了！"
@@ -134,5 +134,91 @@ def test_unique_constraint(temp_db):
     assert result[0][2] == "hiragana2", "重复数据未正确替换"
 
 
+def test_read_only(tmp_path):
+    temp_db_path = tmp_path / "temp_test.db"
+    db = Database(temp_db_path)
+    db.insert_entry("a", "121", "hiragana1")
+    db.close()
+    db = Database(temp_db_path, read_only=True, immutable=True, pragmas={"temp_store": "MEMORY", "cache_size": -1024})
+    assert db.query_batch([("a", "121"), ("b", "121")], "keep") == ["hiragana1", "b"]
+    assert db.cursor.execute("PRAGMA temp_store").fetchone() == (2,)
+    with pytest.raises(sqlite3.OperationalError):
+        db.insert_entry("b", "121", "hiragana2")
+    db.close()
+    # 只读时不创建数据表
+    empty_db_path = tmp_path / "empty.db"
+    sqlite3.connect(empty_db_path).close()
+    db = Database(empty_db_path, read_only=True)
+    db.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='pinyin_data'")
+    assert db.cursor.fetchone() is None
+    db.close()
 
 
+def test_invalid_pragma(tmp_path):
+    with pytest.raises(ValueError):
+        Database(tmp_path / "temp_test.db", pragmas={"cache_size": "1; DROP TABLE pinyin_data"})
+
+
+def test_query_by_pattern(temp_db):
+    temp_db.insert_batch([("ni", "131", "h1"), ("ni", "132", "h2"), ("ni", "241", "h3"),
+                          ("hao", "130", "h4"), ("a", "131", "h5")])
+    assert temp_db.query_by_pattern(["ni"], "?3?") == [("ni", "131", "h1"), ("ni", "132", "h2")]
+    assert temp_db.query_by_pattern(["hao", "ni"], "13[01]") == [("hao", "130", "h4"), ("ni", "131", "h1")]
+    assert temp_db.query_by_pattern(["ni", "ni"]) == [("ni", "131", "h1"), ("ni", "132", "h2"), ("ni", "241", "h3")]
+    assert temp_db.query_by_pattern([]) == []
+
+
+def test_delete_by_pattern(temp_db):
+    temp_db.insert_batch([("ni", "131", "h1"), ("ni", "241", "h3"), ("hao", "130", "h4"), ("a", "131", "h5")])
+    statements = []
+    temp_db.conn.set_trace_callback(statements.append)
+    deleted = temp_db.delete_by_pattern(["ni", "hao"], "1??")
+    temp_db.conn.set_trace_callback(None)
+    assert deleted == [("ni", "131", "h1"), ("hao", "130", "h4")]
+    # 只提交一次
+    assert sum(1 for sql in statements if sql.strip().upper() == "COMMIT") == 1
+    assert sorted(temp_db.query_all()) == [("a", "131", "h5"), ("ni", "241", "h3")]
+
+
+def test_schema_version(temp_db):
+    assert temp_db.schema_version() == SCHEMA_VERSION
+    temp_db.cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'pinyin_data'")
+    assert "WITHOUT ROWID" in temp_db.cursor.fetchone()[0]
+
+
+def test_migrate_v1(tmp_path):
+    temp_db_path = tmp_path / "v1.db"
+    conn = sqlite3.connect(temp_db_path)
+    conn.execute(SCHEMAS[1])
+    conn.executemany("INSERT INTO pinyin_data (yinjie, tone, hiragana) VALUES (?, ?, ?)",
+                     [("a", "121", "h1"), ("a", "121", "h2"), ("b", "131", "h3")])
+    conn.commit()
+    conn.close()
+    # 只读时不迁移
+    db = Database(temp_db_path, read_only=True)
+    assert db.schema_version() == 1
+    assert db.query_by_pinyin("a", "121") == [("a", "121", "h2")]
+    db.close()
+    db = Database(temp_db_path)
+    assert db.schema_version() == SCHEMA_VERSION
+    assert sorted(db.query_all()) == [("a", "121", "h2"), ("b", "131", "h3")]
+    db.insert_entry("a", "121", "h4")
+    assert db.query_by_pinyin("a", "121") == [("a", "121", "h4")]
+    db.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    assert "_pinyin_data_v1" not in [row[0] for row in db.cursor.fetchall()]
+    db.close()
+
+
+def test_query_batch_dedup(temp_db):
+    entries = [(f"y{i}", "121", f"h{i}") for i in range(600)]
+    temp_db.insert_batch(entries)
+    query = [(f"y{i % 700}", "121") for i in range(1500)] + [("y1", "131")]
+    statements = []
+    temp_db.conn.set_trace_callback(statements.append)
+    result = temp_db.query_batch(query, "keep")
+    temp_db.conn.set_trace_callback(None)
+    assert result == [f"h{i % 700}" if i % 700 < 600 else f"y{i % 700}" for i in range(1500)] + ["y1"]
+    # 701个不同的键分3段查询，不创建临时表
+    assert len(statements) == 3
+    assert not any("TEMP" in sql.upper() for sql in statements)
+    assert temp_db.query_batch(query[:3], "_") == ["h0", "h1", "h2"]
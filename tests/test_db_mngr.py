@@ -1,7 +1,12 @@
 import pytest
 from pathlib import Path
 import csv
+import os
+import sqlite3
+import threading
 
+from yukkurimandarin.database import SCHEMA_VERSION, SCHEMAS
+from yukkurimandarin import database_mngr
 from yukkurimandarin.database_mngr import DatabaseManager, _HAS_OPENPYXL
 
 @pytest.fixture(scope="function")
@@ -62,6 +67,12 @@ class TestAddPinyin:
         temp_dm.add_pinyin("yinA", "150", "gana1", report=False)
         result = temp_dm.search_by_pinyin("yinA", "103", report=False)
         assert result == []
+        # 长度不为3的声调
+        for tone in ("", "1", "15", "1500", "15**"):
+            assert temp_dm.search_by_pinyin("yinA", tone, report=False) == []
+            assert temp_dm.search_by_pinyin_batch(["yinA"], tone, report=False) == []
+            assert not temp_dm.delete_pinyin_batch(["yinA"], tone, report=False)
+        assert temp_dm.search_by_pinyin("yinA", "150", report=False) == [("yinA", "150", "gana1")]
 
     def test_delete_exact(self, temp_dm):
         temp_dm.add_pinyin("yinA", "123", "gana1", report=False)
@@ -88,6 +99,21 @@ class TestAddPinyin:
         assert len(result) == 0
 
 
+    def test_batch(self, temp_dm):
+        for yinjie in ("yinA", "yinB", "yinC"):
+            temp_dm.add_pinyin(yinjie, "141", "gana1", report=False)
+            temp_dm.add_pinyin(yinjie, "242", "gana2", report=False)
+        result = temp_dm.search_by_pinyin_batch(["yinC", "yinA"], "*4*", report=False)
+        assert result == [("yinC", "141", "gana1"), ("yinC", "242", "gana2"),
+                          ("yinA", "141", "gana1"), ("yinA", "242", "gana2")]
+        assert temp_dm.search_by_pinyin_batch(["yinA", "yinB"], "1**", report=False) == \
+            [("yinA", "141", "gana1"), ("yinB", "141", "gana1")]
+        assert temp_dm.delete_pinyin_batch(["yinA", "yinB"], "2*2", report=False)
+        assert temp_dm.search_by_pinyin_batch(["yinA", "yinB", "yinC"], report=False) == \
+            [("yinA", "141", "gana1"), ("yinB", "141", "gana1"), ("yinC", "141", "gana1"), ("yinC", "242", "gana2")]
+        assert not temp_dm.delete_pinyin_batch(["yinA"], "20*", report=False)
+
+
 class TestCSVOperations:
     def test_export_to_csv(self, temp_dm, temp_csv):
         temp_dm.add_pinyin("yinA", "123", "gana1", report=False)
@@ -176,3 +202,302 @@ class TestSerialSearch:
         assert temp_dm.serial_search(serial) == [""]
         assert temp_dm.serial_search(serial, "keep") == ["yinC"]
         assert temp_dm.serial_search(serial, "_") == ["_"]
+
+
+class TestMemoryBackend:
+    def test_invalid_backend(self, tmp_path):
+        with pytest.raises(ValueError):
+            DatabaseManager(db_path=tmp_path / "tmp.db", backend="redis")
+
+    def test_serial_search(self, tmp_path):
+        dm = DatabaseManager(db_path=tmp_path / "tmp_memory.db", backend="memory")
+        dm.add_pinyin("yinA", "123", "gana1", report=False)
+        serial = [("yinA", "123"), ("yinC", "213")]
+        assert dm.serial_search(serial) == ["gana1", ""]
+        assert dm.serial_search(serial, "keep") == ["gana1", "yinC"]
+        assert dm.is_open
+
+    def test_reload_after_write(self, tmp_path):
+        dm = DatabaseManager(db_path=tmp_path / "tmp_memory.db", backend="memory", reload_interval=None)
+        serial = [("yinB", "153")]
+        assert dm.serial_search(serial) == [""]
+        # 通过本管理类写入后自动重新载入
+        dm.add_pinyin("yinB", "153", "gana2", report=False)
+        assert dm.serial_search(serial) == ["gana2"]
+        # 本进程中其他管理类写入后也自动重新载入
+        DatabaseManager(db_path=tmp_path / "tmp_memory.db").add_pinyin("yinB", "153", "gana3", report=False)
+        assert dm.serial_search(serial) == ["gana3"]
+        # 不检查其他进程的写入时（reload_interval=None）需要手动重新载入
+        conn = sqlite3.connect(tmp_path / "tmp_memory.db")
+        with conn:
+            conn.execute("DELETE FROM pinyin_data WHERE yinjie = 'yinB'")
+        conn.close()
+        assert dm.serial_search(serial) == ["gana3"]
+        dm.reload()
+        assert dm.serial_search(serial) == [""]
+
+
+class TestReloadInterval:
+    @pytest.mark.parametrize("backend", DatabaseManager.BACKENDS)
+    def test_external_write(self, tmp_path, backend):
+        db_path = tmp_path / "tmp_reload.db"
+        dm = DatabaseManager(db_path=db_path, backend=backend, reload_interval=0)
+        dm.add_pinyin("yinD", "121", "gana1", report=False)
+        serial = [("yinD", "121")]
+        assert dm.serial_search(serial) == ["gana1"]
+        version = dm.data_version
+        # 其他管理类写入后自动重新载入
+        DatabaseManager(db_path=db_path).add_pinyin("yinD", "121", "gana2", report=False)
+        assert dm.serial_search(serial) == ["gana2"]
+        assert dm.data_version > version
+        # 没有修改时数据版本不变
+        assert dm.check_changes() == dm.data_version
+
+    def test_interval(self, tmp_path):
+        db_path = tmp_path / "tmp_reload.db"
+        dm = DatabaseManager(db_path=db_path, backend="memory", reload_interval=3600)
+        dm.add_pinyin("yinD", "121", "gana1", report=False)
+        serial = [("yinD", "121")]
+        assert dm.serial_search(serial) == ["gana1"]
+        # 其他进程写入，未到检查时间
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute("UPDATE pinyin_data SET hiragana = 'gana2' WHERE yinjie = 'yinD'")
+        conn.close()
+        version = dm.data_version
+        assert dm.check_changes() == version
+        assert dm.serial_search(serial) == ["gana1"]
+
+    def test_default(self, tmp_path, monkeypatch):
+        # 由测试控制时钟，结果与实际耗时无关
+        now = [1000.0]
+        monkeypatch.setattr(database_mngr, "monotonic", lambda: now[0])
+        db_path = tmp_path / "tmp_reload.db"
+        dm = DatabaseManager(db_path=db_path, backend="memory")
+        assert dm.reload_interval == DatabaseManager.DEFAULT_RELOAD_INTERVAL
+        dm.add_pinyin("yinD", "121", "gana1", report=False)
+        serial = [("yinD", "121")]
+        assert dm.serial_search(serial) == ["gana1"]
+        # 其他进程写入，未到检查时间
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute("UPDATE pinyin_data SET hiragana = 'gana2' WHERE yinjie = 'yinD'")
+        conn.close()
+        assert dm.serial_search(serial) == ["gana1"]
+        # 经过默认的检查间隔后自动重新载入
+        now[0] += DatabaseManager.DEFAULT_RELOAD_INTERVAL
+        assert dm.serial_search(serial) == ["gana2"]
+
+    def test_invalid(self, tmp_path):
+        with pytest.raises(ValueError):
+            DatabaseManager(db_path=tmp_path / "tmp.db", reload_interval=-1)
+        # 不可变的数据库不检查修改
+        assert DatabaseManager(db_path=tmp_path / "tmp.db", immutable=True).reload_interval is None
+        assert DatabaseManager(db_path=tmp_path / "tmp.db", reload_interval=None).reload_interval is None
+
+
+class TestRuleBackend:
+    def test_compact(self, temp_dm, tmp_path):
+        temp_dm.add_pinyin("ni", "131", "custom", report=False)
+        temp_dm.add_pinyin("hao", "130", "'は/お", report=False)
+        compact_path = tmp_path / "compact.db"
+        assert temp_dm.compact(compact_path, report=False)
+        # 目标文件已存在
+        assert not temp_dm.compact(compact_path, report=False)
+        rule_dm = DatabaseManager(db_path=compact_path, backend="rule")
+        rows = rule_dm.search_by_pinyin("ni", "131", report=False)
+        assert rows == [("ni", "131", "custom")]
+        assert rule_dm.search_by_pinyin("hao", "130", report=False) == []
+        serial = [("ni", "131"), ("hao", "130"), ("ni", "132"), ("/", "301")]
+        assert rule_dm.serial_search(serial, "keep") == temp_dm.serial_search(serial, "keep")
+
+    def test_override(self, tmp_path):
+        dm = DatabaseManager(db_path=tmp_path / "tmp_rule.db", backend="rule")
+        serial = [("ni", "131")]
+        assert dm.serial_search(serial) == ["'に/い"]
+        dm.add_pinyin("ni", "131", "custom", report=False)
+        assert dm.serial_search(serial) == ["custom"]
+        # 删除标记
+        dm.add_pinyin("ni", "131", "", report=False)
+        assert dm.serial_search(serial, "keep") == ["ni"]
+        assert dm.serial_search_codes(["ni"], [None]) == [""]
+
+
+class TestMmapBackend:
+    def test_build_and_reload(self, tmp_path):
+        db_path = tmp_path / "tmp_mmap.db"
+        dm = DatabaseManager(db_path=db_path, backend="mmap")
+        assert dm.artifact_path == tmp_path / "tmp_mmap.bin"
+        dm.add_pinyin("yinA", "123", "gana1", report=False)
+        # 首次查询时编译
+        assert dm.serial_search([("yinA", "123"), ("yinC", "213")], "keep") == ["gana1", "yinC"]
+        assert dm.artifact_path.exists()
+        # 通过本管理类写入后重新编译
+        dm.add_pinyin("yinC", "213", "gana2", report=False)
+        assert dm.serial_search([("yinA", "123"), ("yinC", "213")], "keep") == ["gana1", "gana2"]
+        # 其他进程可以直接映射已编译的文件
+        other = DatabaseManager(db_path=db_path, backend="mmap")
+        assert other.serial_search_codes(["yinC"], [2 * 36 + 1 * 6 + 3]) == ["gana2"]
+
+    def test_default_artifact_in_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("YUKKURIMANDARIN_CACHE_DIR", str(tmp_path / "cache"))
+        dm = DatabaseManager(backend="mmap")
+        # 内置数据库的二进制拼音表不写入安装目录
+        assert dm.artifact_path.parent == tmp_path / "cache"
+        assert dm.serial_search([("ni", "030")]) == [DatabaseManager().serial_search([("ni", "030")])[0]]
+        assert dm.artifact_path.exists()
+        assert not dm.db_path.with_suffix(".bin").exists()
+
+    def test_outdated_artifact(self, tmp_path):
+        db_path = tmp_path / "tmp_mmap.db"
+        dm = DatabaseManager(db_path=db_path, backend="mmap")
+        dm.add_pinyin("yinA", "123", "gana1", report=False)
+        assert dm.serial_search([("yinA", "123")]) == ["gana1"]
+        # 其他进程修改数据库后，早于数据库的二进制拼音表会被重新编译
+        DatabaseManager(db_path=db_path).add_pinyin("yinA", "123", "gana2", report=False)
+        os.utime(dm.artifact_path, ns=(0, 0))
+        assert DatabaseManager(db_path=db_path, backend="mmap").serial_search([("yinA", "123")]) == ["gana2"]
+
+    def test_build_artifact(self, temp_dm, tmp_path):
+        temp_dm.add_pinyin("yinA", "123", "gana1", report=False)
+        path = tmp_path / "custom.bin"
+        assert temp_dm.build_artifact(path, report=False)
+        dm = DatabaseManager(db_path=temp_dm.db_path, backend="mmap", artifact_path=path)
+        assert dm.serial_search([("yinA", "123")]) == ["gana1"]
+        assert not temp_dm.build_artifact(tmp_path / "missing" / "custom.bin", report=False)
+
+
+class TestThreads:
+    def test_concurrent_access(self, temp_dm):
+        temp_dm.add_pinyin("yinA", "123", "gana1", report=False)
+        errors = []
+        results = []
+        # 所有读取线程都建立长连接后才结束
+        barrier = threading.Barrier(4)
+
+        def read() -> None:
+            try:
+                for _ in range(50):
+                    results.append(temp_dm.serial_search([("yinA", "123")]))
+                barrier.wait()
+            except Exception as e:
+                errors.append(e)
+
+        def write() -> None:
+            for i in range(20):
+                if not temp_dm.add_pinyin("yinB", "123", f"gana{i}", report=False):
+                    errors.append(i)
+
+        with temp_dm:
+            threads = [threading.Thread(target=read) for _ in range(4)] + [threading.Thread(target=write)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            # 每个线程各自持有长连接
+            assert len(temp_dm._readers) == 5
+            # 新线程建立长连接时，关闭已结束的线程遗留的长连接
+            barrier = threading.Barrier(1)
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+            assert len(temp_dm._readers) == 2
+        assert not errors
+        assert results == [["gana1"]] * 250
+        assert not temp_dm.is_open
+        assert temp_dm._readers == []
+
+    def test_read_only_lookup(self, temp_dm):
+        temp_dm.add_pinyin("yinA", "123", "gana1", report=False)
+        with temp_dm:
+            # 查询连接以只读方式打开
+            reader = temp_dm._reader()
+            with pytest.raises(sqlite3.OperationalError):
+                reader.insert_entry("yinB", "123", "gana2")
+            assert temp_dm.serial_search([("yinA", "123")]) == ["gana1"]
+
+    def test_immutable(self, temp_dm):
+        # 内置数据库也可以通过管理接口写入，因此默认不以immutable=1打开
+        assert not DatabaseManager().immutable
+        assert not temp_dm.immutable
+        dm = DatabaseManager(temp_dm.db_path, immutable=True, pragmas={"cache_size": -1024})
+        assert dm.pragmas["cache_size"] == -1024 and dm.pragmas["temp_store"] == "MEMORY"
+        with dm:
+            assert dm.serial_search([("yinA", "123")]) == [""]
+            # 通过本实例写入后停用
+            dm.add_pinyin("yinA", "123", "gana1", report=False)
+            assert not dm.immutable
+            assert dm.serial_search([("yinA", "123")]) == ["gana1"]
+
+    def test_wal(self, temp_dm):
+        temp_dm.add_pinyin("yinA", "123", "gana1", report=False)
+        conn = sqlite3.connect(temp_dm.db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+    def test_default_database_journal_mode(self):
+        # 内置数据库不切换到WAL日志模式（只检查连接参数，不实际写入）
+        dm = DatabaseManager()
+        db = dm._connect(write=True)
+        try:
+            assert db.cursor.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        finally:
+            db.close()
+
+
+class TestSession:
+    def test_commit(self, temp_dm, capsys):
+        temp_dm.add_pinyin("yinA", "123", "gana0", report=False)
+        temp_dm.add_pinyin("yinB", "123", "gana0", report=False)
+        with temp_dm.session() as s:
+            s.add("yinC", "111", "gana1")
+            s.add_batch([("yinD", "111", "gana2"), ("yinD", "112", "gana3")])
+            assert s.update("yinA", "123", "gana4")
+            assert not s.update("yinE", "123", "gana4")
+            assert s.delete("yinB") == [("yinB", "123", "gana0")]
+            assert s.delete_batch(["yinD"], "11*") == [("yinD", "111", "gana2"), ("yinD", "112", "gana3")]
+        assert (s.added, s.updated, s.deleted) == (3, 1, 3)
+        # 只输出一次汇总
+        assert capsys.readouterr().out.count("操作:批量编辑拼音数据 成功") == 1
+        assert temp_dm.search_by_pinyin_batch(["yinA", "yinB", "yinC", "yinD"], report=False) == \
+            [("yinA", "123", "gana4"), ("yinC", "111", "gana1")]
+
+    def test_rollback(self, temp_dm):
+        temp_dm.add_pinyin("yinA", "123", "gana0", report=False)
+        with pytest.raises(ValueError):
+            with temp_dm.session(report=False) as s:
+                s.add("yinC", "111", "gana1")
+                s.delete("yinA")
+                s.add("yinC", "101", "gana1")  # 声调格式错误
+        assert temp_dm.search_by_pinyin_batch(["yinA", "yinC"], report=False) == [("yinA", "123", "gana0")]
+        with pytest.raises(ValueError):
+            s.add("yinC", "111", "gana1")
+
+    def test_reload_memory_table(self, tmp_path):
+        dm = DatabaseManager(db_path=tmp_path / "tmp_session.db", backend="memory")
+        assert dm.serial_search([("yinA", "123")]) == [""]
+        with dm.session(report=False) as s:
+            s.add("yinA", "123", "gana1")
+        assert dm.serial_search([("yinA", "123")]) == ["gana1"]
+
+
+class TestMigrate:
+    def test_migrate(self, tmp_path):
+        db_path = tmp_path / "tmp_v1.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(SCHEMAS[1])
+        conn.execute("INSERT INTO pinyin_data (yinjie, tone, hiragana) VALUES ('yinA', '123', 'gana1')")
+        conn.commit()
+        conn.close()
+        dm = DatabaseManager(db_path)
+        assert dm.serial_search([("yinA", "123")]) == ["gana1"]
+        assert dm.migrate(report=False)
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        conn.close()
+        assert dm.serial_search([("yinA", "123")]) == ["gana1"]
+
+    def test_default_database_is_current(self):
+        conn = sqlite3.connect(DatabaseManager().db_path)
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        conn.close()
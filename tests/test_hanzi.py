@@ -2,6 +2,7 @@ import pytest
 from pypinyin import pinyin, Style
 
 import yukkurimandarin.hanzi_process as t
+from yukkurimandarin.cache import LRUCache
 
 
 @pytest.mark.parametrize("input, expected", [
@@ -73,4 +74,34 @@ def test_hanzi(input):
 ])
 def test_hanzi_illegal(input):
     with pytest.raises(ValueError, match=r"处理结果出错：展开后的片段长度\(\d+\)与拼音列表长度\(\d+\)不相等！"):
-        t.hanzi_process(input, None, None)
\ No newline at end of file
+        t.hanzi_process(input, None, None)
+
+def test_hanzi_cache():
+    cache = LRUCache(16)
+    fragments = ["我不明白", "为什么大家都在谈论", "我不明白"]
+    expected = t.hanzi_process(fragments, None, None)
+    assert t.hanzi_process(fragments, None, None, cache) == expected
+    assert cache.cache_info().currsize == 2
+    # 再次转换时全部命中
+    assert t.hanzi_process(fragments, None, None, cache) == expected
+    assert cache.cache_info().hits == 2
+
+
+def test_word_cache():
+    words = ["/0", "油库", "里", "普通话", "/0", "油库", "/0"]
+    expected = pinyin(words, style=Style.TONE3, neutral_tone_with_five=True)
+    t.clear_word_cache()
+    assert t.to_pinyin(words) == expected
+    info = t.word_cache_info()
+    assert info.misses == 4 and info.currsize == 4
+    # 再次转换时全部命中；返回的列表可以安全地修改
+    result = t.to_pinyin(words)
+    assert result == expected
+    result[1][0] = "you3"
+    assert t.to_pinyin(["油库"]) == [["you2"], ["ku4"]]
+    assert t.word_cache_info().hits == 5
+    # 不缓存
+    t.clear_word_cache(0)
+    assert t.to_pinyin(words) == expected
+    assert t.word_cache_info().currsize == 0
+    t.clear_word_cache(t.WORD_CACHE_SIZE)
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+import yukkurimandarin as ym
+
+# 冷启动预算（秒）。CI机器较慢，预算留有余量；重型依赖是否被提前导入由下方断言保证
+IMPORT_BUDGET = 0.3
+CONVERTER_BUDGET = 0.5
+
+HEAVY_MODULES = ("jieba", "pypinyin", "openpyxl")
+
+
+def run_in_subprocess(code: str) -> str:
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def measure(statement: str) -> float:
+    """在新进程中测量语句的耗时，取3次中的最小值"""
+    code = ("import time\n"
+            "start = time.perf_counter()\n"
+            f"{statement}\n"
+            "print(time.perf_counter() - start)")
+    return min(float(run_in_subprocess(code)) for _ in range(3))
+
+
+def test_import_is_lazy():
+    code = ("import sys\n"
+            "import yukkurimandarin as ym\n"
+            "ym.Converter, ym.DatabaseManager, ym.fill_xlsx\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    assert run_in_subprocess(code) == ""
+
+
+def test_import_budget():
+    assert measure("import yukkurimandarin") < IMPORT_BUDGET
+    assert measure("import yukkurimandarin as ym; ym.Converter") < CONVERTER_BUDGET
+
+
+def test_lazy_attributes():
+    for name in ym.__all__:
+        assert getattr(ym, name) is not None
+    assert set(ym.__all__) <= set(dir(ym))
+    assert isinstance(ym.__version__, str)
+    from yukkurimandarin import text_convert
+    assert text_convert("你好") == ym.text_convert("你好")
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        ym.no_such_name
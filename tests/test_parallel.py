@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import yukkurimandarin.parallel as t
+from yukkurimandarin.core import text_convert
+
+
+SENTENCES = [
+    "油库里普通话。",
+    "你想不想要说不要？不，不行还是部分不会。",
+    "",
+    "有一个人前来买瓜 abc 123。",
+    "我很想你跑起来进入蒙古展览馆",
+] * 5
+
+
+@pytest.mark.parametrize("jobs, chunksize", [
+    (1, 256),
+    (2, 3),
+])
+def test_convert_parallel(jobs, chunksize):
+    assert t.convert_parallel(SENTENCES, jobs=jobs, chunksize=chunksize) == [text_convert(s) for s in SENTENCES]
+
+
+def test_convert_parallel_options():
+    result = t.convert_parallel(iter(SENTENCES), jobs=2, chunksize=4, without_accent=True)
+    assert result == [text_convert(s, without_accent=True) for s in SENTENCES]
+    assert t.convert_parallel([], jobs=2) == []
+
+
+def test_convert_parallel_error():
+    with pytest.raises(ValueError, match="参数sentence必须是字符串: 2"):
+        t.convert_parallel(["汉字", 2], jobs=2, chunksize=1) # type: ignore
+    with pytest.raises(ValueError):
+        t.convert_parallel(["汉字"], jobs=0)
+
+
+def test_bounded_map():
+    consumed = []
+
+    def source():
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = t._bounded_map(executor, lambda x: x * 2, source(), 3)
+        assert next(results) == 0
+        # 只读取了窗口内的输入
+        assert len(consumed) <= 4
+        assert list(results) == [x * 2 for x in range(1, 10)]
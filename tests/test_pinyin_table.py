@@ -0,0 +1,67 @@
+import pytest
+
+from yukkurimandarin.database import Database
+from yukkurimandarin.generate_gana import generate_hiragana
+from yukkurimandarin.pinyin_table import MemoryTable, RuleTable, rule_overrides
+
+
+@pytest.fixture
+def temp_table(tmp_path):
+    temp_db_path = tmp_path / "temp_table.db"
+    db = Database(temp_db_path)
+    db.insert_batch([("ou", "010", "hiragana1"), ("yu", "011", "hiragana3")])
+    db.close()
+    yield MemoryTable.load(temp_db_path)
+
+
+def test_load(temp_table):
+    assert len(temp_table) == 2
+
+
+def test_query_batch(temp_table):
+    query_entries = [
+        ("ou", "010"),
+        ("ou", "111"),  # 不存在
+        ("yu", "011"),
+        ("yu", "114")   # 不存在
+    ]
+    assert temp_table.query_batch(query_entries, "") == ["hiragana1", "", "hiragana3", ""]
+    assert temp_table.query_batch(query_entries, "keep") == ["hiragana1", "ou", "hiragana3", "yu"]
+    assert temp_table.query_batch(query_entries, "_") == ["hiragana1", "_", "hiragana3", "_"]
+    assert temp_table.query_batch([], "") == []
+
+
+def test_same_as_database():
+    db = Database()
+    entries = [("ni", "131"), ("hao", "130"), ("a", "050"), ("/", "301")]
+    expected = db.query_batch(entries, "keep")
+    db.close()
+    assert MemoryTable.load(Database.DEFAULT_DB_PATH).query_batch(entries, "keep") == expected
+
+
+def test_rule_table():
+    table = RuleTable([("ni", "131", "custom"), ("hao", "130", ""), ("giao", "040", "ぎゃ'お")])
+    assert len(table) == 3
+    entries = [("ni", "131"), ("hao", "130"), ("giao", "040"), ("a", "050"), ("/", "301"), ("xyz", "111")]
+    assert table.query_batch(entries, "keep") == ["custom", "hao", "ぎゃ'お", generate_hiragana("a", "050"), "/", "xyz"]
+    assert table.query_batch(entries, "_") == ["custom", "_", "ぎゃ'お", generate_hiragana("a", "050"), "_", "_"]
+
+
+def test_rule_overrides():
+    entries = [("ni", "131", generate_hiragana("ni", "131")), ("hao", "130", "custom"), ("giao", "040", "ぎゃ'お")]
+    overrides = rule_overrides(entries)
+    assert ("hao", "130", "custom") in overrides
+    assert ("giao", "040", "ぎゃ'お") in overrides
+    assert ("ni", "131", "") not in overrides
+    # 没有的条目记为删除标记
+    assert ("ni", "132", "") in overrides
+    table = RuleTable(overrides)
+    query = [("ni", "131"), ("hao", "130"), ("giao", "040"), ("ni", "132")]
+    assert table.query_batch(query, "") == MemoryTable(entries).query_batch(query, "")
+
+
+def test_default_database_follows_rule():
+    db = Database()
+    entries = db.query_all()
+    db.close()
+    assert rule_overrides(entries) == []
@@ -0,0 +1,69 @@
+import io
+import json
+
+import yukkurimandarin as ym
+from yukkurimandarin import profiling
+from yukkurimandarin.profiling import Profiler, StageStats
+
+
+def test_record_and_reset():
+    profiler = Profiler()
+    profiler.record("divide", 0.5, items=2)
+    profiler.record("divide", 0.25, items=1, misses=1)
+    assert profiler.stats()["divide"] == StageStats(calls=2, seconds=0.75, items=3, misses=1)
+    profiler.reset()
+    assert profiler.stats() == {}
+
+
+def test_callback():
+    calls = []
+    profiler = Profiler(callback=lambda *args: calls.append(args))
+    profiler.record("text", 1.0, 1)
+    assert calls == [("text", 1.0, 1, 0)]
+
+
+def test_disabled_by_default():
+    assert profiling.active_profiler() is None
+    ym.text_convert("油库里普通话。")
+    assert profiling.active_profiler() is None
+
+
+def test_profile_text_convert():
+    with ym.Converter(cache_size=0) as converter, ym.profile() as profiler:
+        converter.text("油库里普通话，abc。")
+        converter.text_many(["不对。", "你好。"])
+        converter.pinyin("you2 ku4 xx3 .")
+    stats = profiler.stats()
+    for stage in ("pre_process", "divide", "tokenize", "pypinyin", "sandhi", "serial_search",
+                  "hanzi_process", "non_hanzi_process", "post_process", "text", "text_many", "pinyin"):
+        assert stages_called(stats, stage)
+    assert stats["text"].calls == 1
+    assert stats["text_many"].items == 2
+    # 无效音节计为拼音表未命中
+    assert stats["serial_search"].misses == 1
+    # 退出后停用
+    assert profiling.active_profiler() is None
+
+
+def test_cache_misses():
+    with ym.Converter() as converter, ym.profile() as profiler:
+        converter.text("油库里普通话。")
+        converter.text("油库里普通话。")
+    stats = profiler.stats()["hanzi_process"]
+    assert stats.calls == 2
+    assert stats.items == 2
+    assert stats.misses == 1
+
+
+def test_dump():
+    with ym.profile() as profiler:
+        ym.text_convert("你好。")
+    buffer = io.StringIO()
+    profiler.dump(buffer)
+    data = json.loads(buffer.getvalue())
+    assert data["text"]["calls"] == 1
+    assert "hanzi_process" in profiler.report()
+
+
+def stages_called(stats, stage):
+    return stage in stats and stats[stage].calls > 0
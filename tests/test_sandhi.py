@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+import yukkurimandarin.sandhi as t
+
+
+def sandhi(words, pinyin):
+    """对分好的词语和拼音（不含分隔点）做变调，返回变调后的拼音"""
+    words = ["/0"] + words + ["/0"]
+    pinyin = ["/0"] + pinyin.split() + ["/0"]
+    tones = t.tone_array([[p] for p in pinyin])
+    t.apply_sandhi(tones, [p[:-1] for p in pinyin], words)
+    return " ".join(f"{p[:-1]}{tone}" for p, tone in zip(pinyin[1:-1], tones[1:-1]))
+
+
+@pytest.mark.parametrize("words, pinyin, expected", [
+    # 连续上声
+    (["你好"], "ni3 hao3", "ni2 hao3"),
+    (["展览馆"], "zhan3 lan3 guan3", "zhan2 lan2 guan3"),
+    (["我", "很", "好", "啊"], "wo3 hen3 hao3 a5", "wo2 hen2 hao3 a5"),
+    # 不
+    (["不", "对"], "bu4 dui4", "bu2 dui4"),
+    (["不", "好"], "bu4 hao3", "bu4 hao3"),
+    (["不不"], "bu4 bu4", "bu4 bu4"),
+    (["要不要"], "yao4 bu4 yao4", "yao4 bu2 yao4"),
+    # 一
+    (["一样"], "yi1 yang4", "yi2 yang4"),
+    (["一天"], "yi1 tian1", "yi4 tian1"),
+    (["买", "一", "本书"], "mai3 yi1 ben3 shu1", "mai3 yi4 ben3 shu1"),
+    (["一心一意"], "yi1 xin1 yi1 yi4", "yi4 xin1 yi2 yi4"),
+    (["一千一百"], "yi1 qian1 yi1 bai3", "yi4 qian1 yi4 bai3"),
+    (["第一次"], "di4 yi1 ci4", "di4 yi1 ci4"),
+    (["十一月"], "shi2 yi1 yue4", "shi2 yi1 yue4"),
+    (["统一规划"], "tong3 yi1 gui1 hua4", "tong3 yi1 gui1 hua4"),
+    (["唯一", "的"], "wei2 yi1 de5", "wei2 yi1 de5"),
+    (["一一"], "yi1 yi1", "yi1 yi1"),
+    (["一"], "yi1", "yi1"),
+    # 分隔点两侧互不影响
+    (["一", "/0", "个"], "yi1 /0 ge4", "yi1 /0 ge4"),
+])
+def test_apply_sandhi(words, pinyin, expected):
+    assert sandhi(words, pinyin) == expected
+
+
+def test_invalid_tone():
+    tones = t.tone_array([["/0"], ["㐀"], ["/0"]])
+    assert list(tones) == [0, t.INVALID, 0]
+
+
+def test_length_mismatch():
+    with pytest.raises(ValueError, match=r"展开后的片段长度\(4\)与拼音列表长度\(3\)"):
+        t.apply_sandhi(bytearray(3), ["", "", ""], ["/0", "你好", "/0"])
+
+
+def old_modify_consecutive_threes(tones):
+    """原来逐项处理字符串的实现（作为参照）"""
+    flag = 0
+    for i in range(len(tones) - 1):
+        if tones[i] == 3 and tones[i+1] == 3:
+            if flag == 0:
+                flag = 1
+            elif flag == 1:
+                flag = 2
+            else:
+                tones[i-1] = 3
+                flag = 1
+            tones[i] = 2
+        else:
+            flag = 0
+
+
+def test_threes_match_reference():
+    rng = random.Random(0)
+    for _ in range(2000):
+        tones = [rng.choice([0, 1, 3, 3, 3, 4, 5]) for _ in range(rng.randint(0, 12))]
+        expected = list(tones)
+        old_modify_consecutive_threes(expected)
+        actual = bytearray(tones)
+        t.apply_sandhi(actual, [""] * len(tones), ["/0"] * len(tones), rules=None)
+        assert list(actual) == expected, tones
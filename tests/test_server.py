@@ -0,0 +1,101 @@
+import io
+import json
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+import yukkurimandarin as ym
+import yukkurimandarin.server as t
+
+
+@pytest.fixture(scope="module")
+def converter():
+    with ym.Converter() as converter:
+        yield converter
+
+
+def test_handle_request(converter):
+    assert t.handle_request(converter, {"id": 1, "text": "油库里普通话。"}) == \
+        {"id": 1, "ok": True, "result": ym.text_convert("油库里普通话。")}
+    assert t.handle_request(converter, {"id": "a", "pinyin": "ni3 hao3", "without_accent": True}) == \
+        {"id": "a", "ok": True, "result": ym.pinyin_convert("ni3 hao3", without_accent=True)}
+    response = t.handle_request(converter, {"text": "abc你好", "non_hanzi": {"global_mode": "keep"}})
+    assert response["result"] == ym.text_convert("abc你好", non_hanzi_config=ym.NonHanziModes("keep"))
+
+
+@pytest.mark.parametrize("request_, message", [
+    ([1, 2], "请求必须是JSON对象"),
+    ({"id": 1}, "必须包含text或pinyin"),
+    ({"text": 1}, "参数sentence必须是字符串"),
+    ({"text": "你好", "without_accent": "yes"}, "without_accent"),
+    ({"text": "你好", "non_hanzi": {"foo": "keep"}}, "未知的non_hanzi参数"),
+    ({"text": "你好", "non_hanzi": {"global_mode": 1}}, "必须是字符串"),
+])
+def test_handle_request_error(converter, request_, message):
+    response = t.handle_request(converter, request_)
+    assert response["ok"] is False
+    assert message in response["message"]
+
+
+def test_serve_stream(converter):
+    infile = io.StringIO('{"id": 1, "text": "你好。"}\n\nnot json\n{"id": 2, "pinyin": "ni3"}\n')
+    outfile = io.StringIO()
+    t.serve_stream(converter, infile, outfile)
+    responses = [json.loads(line) for line in outfile.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [1, None, 2]
+    assert [r["ok"] for r in responses] == [True, False, True]
+
+
+def test_client_spawn():
+    sentences = [f"第{i}句话，不对。" for i in range(100)]
+    with t.Client.spawn() as client:
+        assert client.text("油库里普通话。") == ym.text_convert("油库里普通话。")
+        assert client.pinyin("you2 ku4 li3") == ym.pinyin_convert("you2 ku4 li3")
+        assert client.text_many(sentences) == ym.text_convert_many(sentences)
+        with pytest.raises(ValueError, match="未知的non_hanzi参数"):
+            client.text("你好", non_hanzi={"foo": "bar"})
+        # 出错后仍可继续使用
+        assert client.text("你好", without_accent=True) == ym.text_convert("你好", without_accent=True)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="需要Unix套接字")
+def test_client_connect(tmp_path):
+    path = str(tmp_path / "ym.sock")
+    process = subprocess.Popen([sys.executable, "-m", "yukkurimandarin", "serve", "--socket", path])
+    try:
+        # 等待服务启动
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                first = t.Client.connect(path)
+                break
+            except OSError:
+                assert time.monotonic() < deadline, "服务未能启动"
+                time.sleep(0.05)
+        with first, t.Client.connect(path) as second:
+            assert first.text("你好。") == second.text("你好。") == ym.text_convert("你好。")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def test_main_serve_options(monkeypatch):
+    from yukkurimandarin.__main__ import main
+
+    calls = []
+    monkeypatch.setattr(t, "serve", lambda *args: calls.append(args))
+    with pytest.raises(SystemExit):
+        main(["serve", "--backend", "redis"])
+    assert calls == []
+    main(["serve", "--backend", "sqlite"])
+    assert calls[-1] == (None, None, "sqlite", False, 1.0)
+    main(["serve", "--reload-interval", "5"])
+    assert calls[-1][4] == 5.0
+    # 0或负数表示不检查数据库的修改
+    main(["serve", "--reload-interval", "0"])
+    assert calls[-1][4] is None
+    main(["serve", "--reload-interval", "-1"])
+    assert calls[-1][4] is None
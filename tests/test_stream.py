@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+import yukkurimandarin.stream as t
+from yukkurimandarin.core import text_convert
+from yukkurimandarin.database_mngr import DatabaseManager
+
+
+SENTENCES = [
+    "油库里普通话。",
+    "",
+    "你想不想要说不要？不，不行还是部分不会。",
+    "ゆっくりしていってね！1234 abc",
+    "油库里普通话。",
+]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 64])
+def test_iter_convert(batch_size):
+    results = t.iter_convert(iter(SENTENCES), batch_size=batch_size)
+    assert list(results) == [text_convert(s) for s in SENTENCES]
+
+
+def test_iter_convert_lazy():
+    consumed = []
+
+    def source():
+        for s in SENTENCES:
+            consumed.append(s)
+            yield s
+
+    results = t.iter_convert(source(), batch_size=2)
+    assert next(results) == text_convert(SENTENCES[0])
+    assert len(consumed) == 2
+
+
+def test_iter_convert_options(tmp_path):
+    dm = DatabaseManager(tmp_path / "stream.db")
+    assert list(t.iter_convert(["汉字"], pinyin_database=dm)) == [""]
+    assert not dm.is_open
+    with pytest.raises(ValueError):
+        t.iter_convert(SENTENCES, batch_size=0)
+
+
+def test_convert_file(tmp_path):
+    src = tmp_path / "src.txt"
+    dst = tmp_path / "dst.txt"
+    src.write_text("\n".join(SENTENCES) + "\n", encoding="gbk")
+    assert t.convert_file(str(src), str(dst), encoding="gbk", batch_size=2, without_accent=True) == len(SENTENCES)
+    expected = [text_convert(s, without_accent=True) for s in SENTENCES]
+    assert dst.read_text(encoding="gbk").split("\n")[:-1] == expected
+
+
+def test_convert_file_same_path(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("油库里普通话。\n", encoding="utf-8")
+    link = tmp_path / "link.txt"
+    os.link(src, link)
+    for dst in (src, tmp_path / "." / "src.txt", link):
+        with pytest.raises(ValueError, match="同一个文件"):
+            t.convert_file(str(src), str(dst))
+    # 输入文件没有被清空
+    assert src.read_text(encoding="utf-8") == "油库里普通话。\n"
@@ -1,29 +1,73 @@
 # Yukkuri-Mandarin
 
-try:
-    from importlib.metadata import version
-    __version__ = version("yukkuri-mandarin")
-except ImportError:
-    __version__ = "dev"
-
 __title__ = "yukkurimandarin"
 __author__ = "wubzbz"
 __license__ = "MIT"
 __copyright__ = "Copyright (c) 2025 wubzbz"
 __all__ = [
     "text_convert",
+    "text_convert_many",
+    "convert_parallel",
+    "iter_convert",
+    "convert_file",
     "pinyin_convert",
+    "atext_convert",
+    "apinyin_convert",
+    "AsyncConverter",
+    "warmup",
+    "Converter",
     "DatabaseManager",
     "fill_xlsx",
     "fill_csv",
     "NonHanziModes",
+    "Profiler",
+    "profile",
     ]
 
-from yukkurimandarin.core import text_convert,pinyin_convert
-from yukkurimandarin.database_mngr import DatabaseManager
-from yukkurimandarin.generate_table import fill_csv, fill_xlsx
-from yukkurimandarin.settings import NonHanziModes
+# 公开接口所在的模块。首次访问时才导入，`import yukkurimandarin` 本身不会载入jieba、pypinyin和openpyxl
+_LAZY_ATTRS = {
+    "text_convert": "yukkurimandarin.core",
+    "text_convert_many": "yukkurimandarin.core",
+    "pinyin_convert": "yukkurimandarin.core",
+    "warmup": "yukkurimandarin.core",
+    "atext_convert": "yukkurimandarin.aio",
+    "apinyin_convert": "yukkurimandarin.aio",
+    "AsyncConverter": "yukkurimandarin.aio",
+    "Converter": "yukkurimandarin.core",
+    "convert_parallel": "yukkurimandarin.parallel",
+    "iter_convert": "yukkurimandarin.stream",
+    "convert_file": "yukkurimandarin.stream",
+    "DatabaseManager": "yukkurimandarin.database_mngr",
+    "fill_csv": "yukkurimandarin.generate_table",
+    "fill_xlsx": "yukkurimandarin.generate_table",
+    "NonHanziModes": "yukkurimandarin.settings",
+    "Profiler": "yukkurimandarin.profiling",
+    "profile": "yukkurimandarin.profiling",
+}
+
+
+def _get_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("yukkuri-mandarin")
+    except ImportError:
+        return "dev"
 
 
+def __getattr__(name: str):
+    # importlib.metadata 的导入耗时较长，版本号也在首次访问时才查询
+    if name == "__version__":
+        globals()[name] = _get_version()
+        return globals()[name]
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name), name)
+    # 缓存到模块字典，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
 
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
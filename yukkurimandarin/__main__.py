@@ -0,0 +1,49 @@
+# 命令行入口：python -m yukkurimandarin serve|compact|build-artifact|migrate
+
+import argparse
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from yukkurimandarin.database_mngr import DatabaseManager
+    parser = argparse.ArgumentParser(prog="python -m yukkurimandarin", description="油库里普通话")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="启动常驻转换服务（JSON Lines协议）")
+    serve_parser.add_argument("--socket", help="监听的Unix套接字路径，默认使用标准输入和标准输出")
+    serve_parser.add_argument("--db", help="拼音数据库路径，默认使用内置数据库")
+    serve_parser.add_argument("--backend", default="memory", choices=DatabaseManager.BACKENDS,
+                              help="拼音表查询后端：memory（默认）、sqlite、rule 或 mmap")
+    serve_parser.add_argument("--without-accent", action="store_true", help="默认去除音声记号")
+    serve_parser.add_argument("--reload-interval", type=float, default=DatabaseManager.DEFAULT_RELOAD_INTERVAL,
+                              help="检查拼音数据库是否被其他进程修改的间隔（秒），检测到修改后自动重新载入，"
+                                   "默认为1秒；0或负数表示不检查")
+    compact_parser = subparsers.add_parser("compact", help="将拼音数据库压缩为只含覆盖数据的新数据库（供rule后端使用）")
+    compact_parser.add_argument("output", help="新数据库的路径")
+    compact_parser.add_argument("--db", help="要压缩的拼音数据库路径，默认使用内置数据库")
+    artifact_parser = subparsers.add_parser("build-artifact", help="将拼音数据库编译为二进制拼音表（供mmap后端使用）")
+    artifact_parser.add_argument("output", nargs="?", help="输出文件路径，默认为数据库路径的后缀改为.bin")
+    artifact_parser.add_argument("--db", help="拼音数据库路径，默认使用内置数据库")
+    migrate_parser = subparsers.add_parser("migrate", help="将拼音数据库迁移到最新的数据表结构")
+    migrate_parser.add_argument("--db", help="拼音数据库路径，默认使用内置数据库")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        from yukkurimandarin.server import serve
+        reload_interval = args.reload_interval if args.reload_interval > 0 else None
+        try:
+            serve(args.socket, args.db, args.backend, args.without_accent, reload_interval)
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "compact":
+        if not DatabaseManager(args.db).compact(args.output):
+            raise SystemExit(1)
+    elif args.command == "build-artifact":
+        if not DatabaseManager(args.db).build_artifact(args.output):
+            raise SystemExit(1)
+    elif args.command == "migrate":
+        if not DatabaseManager(args.db).migrate():
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
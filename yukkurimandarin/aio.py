@@ -0,0 +1,186 @@
+# asyncio接口。
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, List, Optional
+
+from yukkurimandarin.core import Converter, get_default_converter
+from yukkurimandarin.settings import NonHanziModes
+
+
+class AsyncConverter:
+    """
+    供asyncio程序使用的转换器
+
+    分词、拼音化和拼音表查询都在执行器（默认为事件循环的线程池）中进行，不会阻塞事件循环。
+    由于转换器需要在执行器中直接调用，执行器应当是线程池。
+    默认使用 `text_convert` 等函数共享的默认转换器，同步和异步接口共用已预热的分词器、拼音表和缓存。
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> converter = ym.AsyncConverter(max_concurrency=4)
+      >>> result = await converter.text("油库里普通话。")
+
+    """
+
+    def __init__(self,
+                 converter: Optional[Converter] = None,
+                 executor: Optional[Executor] = None,
+                 max_concurrency: Optional[int] = None) -> None:
+        """
+        Args:
+            converter: 实际执行转换的转换器，默认使用共享的默认转换器（参见 `get_default_converter`）
+            executor: 执行转换的线程池，默认使用事件循环的默认执行器
+            max_concurrency: 同时在执行器中进行的转换数上限，None表示不限制
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"参数max_concurrency必须是正整数: {max_concurrency}")
+        # 未指定时在执行器中取得默认转换器，创建和预热都不会阻塞事件循环
+        self._converter = converter
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        # asyncio.Semaphore 与事件循环绑定，每个事件循环各用一个
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+
+    @property
+    def converter(self) -> Converter:
+        """
+        实际执行转换的转换器
+
+        未指定时为共享的默认转换器。首次访问时可能需要创建转换器或等待预热完成，请勿在事件循环中访问。
+        """
+        return self._converter if self._converter is not None else get_default_converter()
+
+
+    def _call(self, method: str, *args: Any) -> Any:
+        """在执行器中取得转换器并调用其方法"""
+        return getattr(self.converter, method)(*args)
+
+
+    async def _run(self, method: str, *args: Any) -> Any:
+        """在执行器中调用转换器的方法，并遵守并发上限"""
+        loop = asyncio.get_running_loop()
+        call = partial(self._call, method, *args)
+        if self.max_concurrency is None:
+            return await loop.run_in_executor(self.executor, call)
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            return await loop.run_in_executor(self.executor, call)
+
+
+    async def warmup(self) -> None:
+        """在执行器中预热转换器，参见 `Converter.warmup`"""
+        await self._run("warmup", False)
+
+
+    async def text(self,
+                   sentence: str,
+                   without_accent: Optional[bool] = None,
+                   non_hanzi_config: Optional[NonHanziModes] = None) -> str:
+        """异步版本的 `Converter.text`"""
+        return await self._run("text", sentence, without_accent, non_hanzi_config)
+
+
+    async def text_many(self,
+                        sentences: List[str],
+                        without_accent: Optional[bool] = None,
+                        non_hanzi_config: Optional[NonHanziModes] = None) -> List[str]:
+        """异步版本的 `Converter.text_many`"""
+        return await self._run("text_many", list(sentences), without_accent, non_hanzi_config)
+
+
+    async def pinyin(self,
+                     sentence: str,
+                     error: str = "",
+                     without_accent: Optional[bool] = None) -> str:
+        """异步版本的 `Converter.pinyin`"""
+        return await self._run("pinyin", sentence, error, without_accent)
+
+
+# 共享的默认异步转换器
+_DEFAULT_ASYNC_CONVERTER: Optional[AsyncConverter] = None
+_DEFAULT_ASYNC_CONVERTER_LOCK = threading.Lock()
+
+
+def configure_async(executor: Optional[Executor] = None, max_concurrency: Optional[int] = None) -> AsyncConverter:
+    """
+    设置 `atext_convert` 和 `apinyin_convert` 使用的执行器和并发上限
+
+    已经载入的拼音表和分词器会被保留。
+
+    Args:
+        executor: 执行转换的线程池，默认使用事件循环的默认执行器
+        max_concurrency: 同时在执行器中进行的转换数上限，None表示不限制
+
+    Returns:
+        新的默认异步转换器
+    """
+    global _DEFAULT_ASYNC_CONVERTER
+    with _DEFAULT_ASYNC_CONVERTER_LOCK:
+        converter = _DEFAULT_ASYNC_CONVERTER._converter if _DEFAULT_ASYNC_CONVERTER is not None else None
+        _DEFAULT_ASYNC_CONVERTER = AsyncConverter(converter, executor, max_concurrency)
+        return _DEFAULT_ASYNC_CONVERTER
+
+
+def get_default_async_converter() -> AsyncConverter:
+    """获取 `atext_convert` 和 `apinyin_convert` 共享的默认异步转换器"""
+    global _DEFAULT_ASYNC_CONVERTER
+    if _DEFAULT_ASYNC_CONVERTER is None:
+        with _DEFAULT_ASYNC_CONVERTER_LOCK:
+            if _DEFAULT_ASYNC_CONVERTER is None:
+                _DEFAULT_ASYNC_CONVERTER = AsyncConverter()
+    return _DEFAULT_ASYNC_CONVERTER
+
+
+async def atext_convert(sentence: str,
+                        without_accent: bool = False,
+                        non_hanzi_config: Optional[NonHanziModes] = None) -> str:
+    """
+    异步版本的 `text_convert`，转换在执行器中进行，不会阻塞事件循环
+
+    Args:
+        sentence: 输入的句子
+        without_accent: 是否去除音声记号
+        non_hanzi_config: 非汉字处理模式
+
+    Returns:
+        转换后的句子
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> result = await ym.atext_convert("油库里普通话。")
+
+    """
+    return await get_default_async_converter().text(sentence, without_accent, non_hanzi_config)
+
+
+async def apinyin_convert(sentence: str,
+                          error: str = "",
+                          without_accent: bool = False) -> str:
+    """
+    异步版本的 `pinyin_convert`，转换在执行器中进行，不会阻塞事件循环
+
+    Args:
+        sentence: 输入的拼音（以空格分开）
+        error: 无结果时的返回值
+        without_accent: 是否去除音声记号
+
+    Returns:
+        转换后的句子
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> result = await ym.apinyin_convert("you2 ku4 li3 pu3 tong1 hua4 。")
+
+    """
+    return await get_default_async_converter().pinyin(sentence, error, without_accent)
@@ -0,0 +1,260 @@
+# 预编译的二进制拼音表。
+#
+# 将 `pinyin_data` 表编译为一个文件，读取时通过mmap映射，启动时无需解析，多个进程可以共享同一份页面缓存。
+#
+# 文件格式（小端序，各段均按4字节对齐）：
+#   文件头    magic(4) version(u32) 音节数n(u32) 桶数m(u32) 字符串池长度(u32)
+#   位移表    u32[m]       音节所在桶的位移，用于最小完美哈希
+#   音节表    u32[n]       槽位上的音节在字符串池中的偏移，用于校验
+#   假名表    u32[n*216]   (槽位, 声调编码) -> 平假名在字符串池中的偏移，0表示没有数据
+#   字符串池  u16长度 + UTF-8字节，偏移0保留
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from zlib import crc32
+
+from yukkurimandarin.codec import TONE_CODES, encode_serial, encode_tone
+
+MAGIC = b"YMPT"
+VERSION = 1
+_HEADER = struct.Struct("<4sIIII")
+# 音节缓存的上限（包括不存在的音节）
+_SLOT_CACHE_SIZE = 4096
+
+
+def _bucket(key_hash: int, buckets: int) -> int:
+    return key_hash % buckets
+
+
+def _slot(key_hash: int, displacement: int, slots: int) -> int:
+    # CRC对位移是线性的，同长度的音节无论位移如何都可能冲突，因此再做一次乘法混合
+    x = (key_hash + displacement) * 0x9E3779B1 & 0xFFFFFFFF
+    x ^= x >> 15
+    x = x * 0x85EBCA6B & 0xFFFFFFFF
+    x ^= x >> 13
+    return x % slots
+
+
+def _perfect_hash(keys: List[bytes]) -> List[int]:
+    """
+    构造最小完美哈希（哈希-位移法）
+
+    音节先按 `_bucket` 分桶，再为每个桶找到一个位移，使桶内的音节经 `_slot` 落到互不相同的空槽位。
+
+    Returns:
+        每个桶的位移，0表示空桶
+    """
+    n = len(keys)
+    hashes = [crc32(key) for key in keys]
+    if len(set(hashes)) != n:
+        raise ValueError("音节的哈希值冲突，无法构造完美哈希。")
+    buckets = max(1, n // 2)
+    members: List[List[int]] = [[] for _ in range(buckets)]
+    for key_hash in hashes:
+        members[_bucket(key_hash, buckets)].append(key_hash)
+    displacements = [0] * buckets
+    occupied = bytearray(n)
+    # 先处理大桶
+    for b in sorted(range(buckets), key=lambda b: -len(members[b])):
+        bucket = members[b]
+        if not bucket:
+            break
+        for d in range(1, 1 << 20):
+            slots = {_slot(key_hash, d, n) for key_hash in bucket}
+            if len(slots) == len(bucket) and not any(occupied[s] for s in slots):
+                for s in slots:
+                    occupied[s] = 1
+                displacements[b] = d
+                break
+        else:
+            raise ValueError("无法构造完美哈希。")
+    return displacements
+
+
+def build_artifact(entries: Iterable[Tuple[str, str, str]], file_path: Union[str, Path]) -> int:
+    """
+    将拼音数据编译为二进制拼音表
+
+    先写入临时文件再替换，正在映射旧文件的进程不受影响。声调无法编码的数据会被忽略。
+
+    Args:
+        entries: 拼音数据
+        file_path: 输出文件路径
+
+    Returns:
+        写入的条目数
+    """
+    table: Dict[bytes, Dict[int, str]] = {}
+    count = 0
+    for yinjie, tone, hiragana in entries:
+        code = encode_tone(tone)
+        if code is None:
+            continue
+        table.setdefault(yinjie.encode("utf-8"), {})[code] = hiragana
+        count += 1
+    keys = list(table)
+    n = len(keys)
+    displacements = _perfect_hash(keys) if n else []
+    pool = bytearray(b"\0\0\0\0")
+    pool_offsets: Dict[bytes, int] = {}
+
+    def intern(data: bytes) -> int:
+        offset = pool_offsets.get(data)
+        if offset is None:
+            offset = pool_offsets[data] = len(pool)
+            pool.extend(struct.pack("<H", len(data)))
+            pool.extend(data)
+        return offset
+
+    key_offsets = array("I", bytes(4 * n))
+    cells = array("I", bytes(4 * n * TONE_CODES))
+    for key in keys:
+        key_hash = crc32(key)
+        slot = _slot(key_hash, displacements[_bucket(key_hash, len(displacements))], n)
+        key_offsets[slot] = intern(key)
+        for code, hiragana in table[key].items():
+            cells[slot * TONE_CODES + code] = intern(hiragana.encode("utf-8"))
+    pool.extend(bytes(-len(pool) % 4))
+    sections = [array("I", displacements), key_offsets, cells]
+    if sys.byteorder != "little":
+        for section in sections:
+            section.byteswap()
+
+    path = Path(file_path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, n, len(displacements), len(pool)))
+            for section in sections:
+                section.tofile(f)
+            f.write(pool)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return count
+
+
+class ArtifactTable:
+    """
+    通过mmap映射的二进制拼音表（参见 `build_artifact`）
+
+    打开时只读取文件头，各段直接在映射的内存上查询；已查询过的音节和平假名会被缓存。
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]) -> None:
+        """
+        Args:
+            buffer: 二进制拼音表的内容
+        """
+        if len(buffer) < _HEADER.size:
+            raise ValueError("不是有效的二进制拼音表。")
+        magic, version, n, buckets, pool_size = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"不是有效的二进制拼音表，或版本不匹配: {magic!r} {version}")
+        if len(buffer) != _HEADER.size + 4 * (buckets + n + n * TONE_CODES) + pool_size:
+            raise ValueError("二进制拼音表的长度不正确。")
+        self._buffer = buffer
+        self._n = n
+        view = self._view = memoryview(buffer)
+        start = _HEADER.size
+        sections = []
+        for size in (buckets, n, n * TONE_CODES):
+            section = view[start:start + 4 * size]
+            if sys.byteorder == "little":
+                sections.append(section.cast("I"))
+            else:
+                copied = array("I", section)
+                copied.byteswap()
+                sections.append(copied)
+            start += 4 * size
+        self._displacements, self._key_offsets, self._cells = sections
+        self._pool = view[start:]
+        # 音节 -> 槽位（-1表示不存在）
+        self._slots: Dict[str, int] = {}
+        # 字符串池偏移 -> 平假名
+        self._strings: Dict[int, str] = {}
+
+
+    @classmethod
+    def open(cls, file_path: Union[str, Path]) -> "ArtifactTable":
+        """以只读方式映射二进制拼音表文件"""
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("不是有效的二进制拼音表。")
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+    def close(self) -> None:
+        """释放映射，之后不能再查询"""
+        for section in (self._displacements, self._key_offsets, self._cells, self._pool, self._view):
+            if isinstance(section, memoryview):
+                section.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+    def __len__(self) -> int:
+        """音节数"""
+        return self._n
+
+
+    def _string(self, offset: int) -> str:
+        """读取字符串池中的字符串"""
+        string = self._strings.get(offset)
+        if string is None:
+            length = self._pool[offset] | self._pool[offset + 1] << 8
+            string = self._strings[offset] = str(self._pool[offset + 2:offset + 2 + length], "utf-8")
+        return string
+
+
+    def _find(self, yinjie: str) -> int:
+        """查找音节所在的槽位，不存在时返回-1"""
+        if not self._n:
+            return -1
+        key_hash = crc32(yinjie.encode("utf-8"))
+        displacement = self._displacements[_bucket(key_hash, len(self._displacements))]
+        slot = _slot(key_hash, displacement, self._n)
+        # 完美哈希只对表中的音节有效，需要校验
+        return slot if self._string(self._key_offsets[slot]) == yinjie else -1
+
+
+    def slot(self, yinjie: str) -> int:
+        """音节所在的槽位，不存在时返回-1"""
+        slot = self._slots.get(yinjie)
+        if slot is None:
+            slot = self._find(yinjie)
+            if len(self._slots) < _SLOT_CACHE_SIZE:
+                self._slots[yinjie] = slot
+        return slot
+
+
+    def query_batch(self, entries: List[Tuple[str, str]], default: str) -> List[str]:
+        """批量查询数据，无结果返回默认值（与 `Database.query_batch` 语义相同）"""
+        syllables, codes = encode_serial(entries)
+        return self.query_codes(syllables, codes, default)
+
+
+    def query_codes(self, syllables: Sequence[str], codes: Sequence[Optional[int]], default: str) -> List[str]:
+        """按音节和声调编码批量查询，无结果返回默认值"""
+        slots = self._slots
+        cells = self._cells
+        strings = self._strings
+        keep = default == "keep"
+        result = []
+        for yinjie, code in zip(syllables, codes):
+            slot = slots.get(yinjie)
+            if slot is None:
+                slot = self.slot(yinjie)
+            offset = cells[slot * TONE_CODES + code] if slot >= 0 and code is not None else 0
+            if offset:
+                hiragana = strings.get(offset)
+                result.append(hiragana if hiragana is not None else self._string(offset))
+            else:
+                result.append(yinjie if keep else default)
+        return result
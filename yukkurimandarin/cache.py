@@ -0,0 +1,71 @@
+# 转换结果缓存。
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+
+class CacheInfo(NamedTuple):
+    """缓存统计信息（与 `functools.lru_cache` 的 `cache_info()` 一致）"""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    线程安全的LRU缓存
+
+    超过 `maxsize` 时淘汰最久未使用的条目，`maxsize` 为0时不缓存任何内容。
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 0:
+            raise ValueError(f"参数maxsize不能为负数: {maxsize}")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """查询缓存，未命中时返回None"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._data.move_to_end(key)
+            return value
+
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """写入缓存"""
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+    def cache_info(self) -> CacheInfo:
+        """命中次数、未命中次数、容量和当前大小"""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
+
+
+    def clear(self) -> None:
+        """清空缓存和统计信息（例如拼音数据库被修改后）"""
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
@@ -0,0 +1,153 @@
+# 字符分类表。
+# 首次使用时为基本多文种平面（BMP）构建一次分类表，之后的分类、切分和宽度计算都只需查表。
+
+import re
+import string
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# 非汉字字符的种类（低3位）
+OTHERS = 0
+GANA = 1
+LATIN = 2
+PUNCTUATION = 3
+CLASS_MASK = 0b0111
+# 标志位
+HANZI = 0b1000
+WIDE = 0b10000
+
+CLASS_NAMES = {OTHERS: "others", GANA: "gana", LATIN: "latin", PUNCTUATION: "punctuation"}
+
+# 汉字范围：CJK统一汉字扩展A、CJK统一汉字、CJK兼容汉字（只有其中已分配的码位视为汉字）
+HANZI_RANGES = ((0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF))
+# 假名范围：平假名、片假名、半角片假名
+GANA_RANGES = ((0x3040, 0x309F), (0x30A0, 0x30FF), (0xFF65, 0xFF9F))
+LATIN_RANGES = ((0x0041, 0x005A), (0x0061, 0x007A))
+# 全宽字符范围（汉字之外）：全角标点、平假名、片假名（不包含半角片假名）、全角英数符号
+WIDE_RANGES = ((0x3000, 0x303F), (0x3040, 0x309F), (0x30A0, 0x30FF), (0xFF01, 0xFF5E))
+# 不含标点的大块区域，构建分类表时跳过：汉字、谚文音节、代理区和私用区
+_NO_PUNCTUATION_RANGES = HANZI_RANGES + ((0xAC00, 0xD7A3), (0xD800, 0xF8FF))
+_PUNCTUATION_CATEGORIES = {"Po", "Pd", "Ps", "Pe", "Pi", "Pf", "Pc"}
+
+
+@lru_cache(maxsize=None)
+def _hanzi_ranges() -> Tuple[Tuple[int, int], ...]:
+    """汉字范围内已分配的码位（未分配的码位不视为汉字）"""
+    ranges: List[Tuple[int, int]] = []
+    for start, end in HANZI_RANGES:
+        run_start = None
+        for code in range(start, end + 2):
+            assigned = code <= end and unicodedata.category(chr(code)) != "Cn"
+            if assigned and run_start is None:
+                run_start = code
+            elif not assigned and run_start is not None:
+                ranges.append((run_start, code - 1))
+                run_start = None
+    return tuple(ranges)
+
+
+def _build_table() -> bytearray:
+    """构建BMP分类表：每个码位一个字节，低3位为种类，其余为标志位"""
+    table = bytearray(0x10000)
+    # 标点：ASCII标点和Unicode标点类别
+    skip = bytearray(0x10000)
+    for start, end in _NO_PUNCTUATION_RANGES:
+        skip[start:end + 1] = b"\x01" * (end - start + 1)
+    for code in range(0x10000):
+        if not skip[code] and unicodedata.category(chr(code)) in _PUNCTUATION_CATEGORIES:
+            table[code] = PUNCTUATION
+    for char in string.punctuation:
+        table[ord(char)] = PUNCTUATION
+    # 字母和假名（优先于标点）
+    for ranges, kind in ((LATIN_RANGES, LATIN), (GANA_RANGES, GANA)):
+        for start, end in ranges:
+            table[start:end + 1] = bytes([kind]) * (end - start + 1)
+    # 汉字
+    for start, end in _hanzi_ranges():
+        table[start:end + 1] = bytes([HANZI | WIDE]) * (end - start + 1)
+    # 全宽字符
+    for start, end in WIDE_RANGES:
+        for code in range(start, end + 1):
+            table[code] |= WIDE
+    return table
+
+
+@lru_cache(maxsize=None)
+def class_table() -> bytearray:
+    """BMP分类表（首次调用时构建）"""
+    return _build_table()
+
+
+@lru_cache(maxsize=None)
+def _class_chars() -> str:
+    # 供 str.translate 使用的映射：每个BMP字符映射为代表其种类的单个字符。
+    # BMP以外的字符不在表中，translate时保持原样，按“其他”处理。
+    return class_table().translate(bytes(b"oglpoooo"[v & CLASS_MASK] for v in range(256))).decode("ascii")
+
+
+@lru_cache(maxsize=None)
+def _width_chars() -> str:
+    # 每个BMP字符映射为代表其宽度的单个字符，BMP以外的字符按半宽处理
+    return class_table().translate(bytes(ord("2") if v & WIDE else ord("1") for v in range(256))).decode("ascii")
+
+
+# 非汉字片段按种类切分
+_RUN = re.compile(r"g+|l+|p+|[^glp]+")
+_RUN_NAMES = {"g": "gana", "l": "latin", "p": "punctuation"}
+
+
+@lru_cache(maxsize=None)
+def hanzi_run() -> "re.Pattern[str]":
+    """匹配汉字连续片段的正则表达式（首次调用时构建）"""
+    hanzi_class = "".join(f"{chr(start)}-{chr(end)}" for start, end in _hanzi_ranges())
+    return re.compile(f"[{hanzi_class}]+")
+
+
+@lru_cache(maxsize=None)
+def _compat_map() -> Dict[int, str]:
+    """兼容汉字 -> 统一汉字"""
+    return {code: unicodedata.normalize("NFC", chr(code))
+            for code in range(0xF900, 0xFAFF + 1)
+            if unicodedata.normalize("NFC", chr(code)) != chr(code)}
+
+
+def __getattr__(name: str):
+    # 兼容旧的模块级常量，访问时才构建
+    if name == "CLASS_TABLE":
+        return class_table()
+    if name == "HANZI_RUN":
+        return hanzi_run()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def char_class(char: str) -> int:
+    """查询单个字符的分类值（种类与标志位）"""
+    code = ord(char)
+    return class_table()[code] if code < 0x10000 else OTHERS
+
+
+def is_hanzi_char(char: str) -> bool:
+    """判断单个字符是否为汉字"""
+    return bool(char_class(char) & HANZI)
+
+
+def class_runs(fragment: str) -> List[Tuple[str, str]]:
+    """
+    将非汉字片段切分为同类字符的连续片段
+
+    Returns:
+        (种类, 片段)的列表，种类为 `gana`、`latin`、`punctuation` 或 `others`
+    """
+    classes = fragment.translate(_class_chars())
+    return [(_RUN_NAMES.get(m.group()[0], "others"), fragment[m.start():m.end()]) for m in _RUN.finditer(classes)]
+
+
+def display_width(text: str) -> int:
+    """计算字符串的显示宽度，全宽字符计为2，半宽字符计为1"""
+    return len(text) + text.translate(_width_chars()).count("2")
+
+
+def normalize_hanzi(text: str) -> str:
+    """将CJK兼容汉字替换为对应的统一汉字，以便查询拼音"""
+    return text.translate(_compat_map())
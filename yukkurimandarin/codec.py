@@ -0,0 +1,142 @@
+# 音节和声调的紧凑整数编码。
+
+from array import array
+from sys import intern
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from yukkurimandarin.generate_gana import YINJIE
+
+# 声调三元组编码：前一字、本字、后一字的声调各取0~5，编码为 0~215
+TONE_DIGITS = "012345"
+TONE_CODES = len(TONE_DIGITS) ** 3
+_TONE_STRINGS: List[str] = [f"{a}{b}{c}" for a in TONE_DIGITS for b in TONE_DIGITS for c in TONE_DIGITS]
+_TONE_CODE: Dict[str, int] = {tone: code for code, tone in enumerate(_TONE_STRINGS)}
+# 单个声调数字
+TONE_VALUE: Dict[str, int] = {digit: value for value, digit in enumerate(TONE_DIGITS)}
+
+
+def encode_tone(tone: str) -> Optional[int]:
+    """将3位声调字符串编码为整数，格式不正确时返回None"""
+    return _TONE_CODE.get(tone)
+
+
+def decode_tone(code: int) -> str:
+    """将整数还原为3位声调字符串"""
+    return _TONE_STRINGS[code]
+
+
+def tone_code(last_tone: int, this_tone: int, next_tone: int) -> int:
+    """由三个声调数字直接计算编码"""
+    return last_tone * 36 + this_tone * 6 + next_tone
+
+
+class SyllableIndex:
+    """
+    音节与整数id的双向映射
+
+    默认按 `generate_gana.YINJIE` 的顺序编号，可以追加自定义音节。
+    """
+
+    def __init__(self, syllables: Iterable[str] = YINJIE) -> None:
+        self._ids: Dict[str, int] = {}
+        self._syllables: List[str] = []
+        for yinjie in syllables:
+            self.add(yinjie)
+
+
+    def __len__(self) -> int:
+        return len(self._syllables)
+
+
+    def add(self, yinjie: str) -> int:
+        """加入音节并返回其id，已存在时直接返回"""
+        sid = self._ids.get(yinjie)
+        if sid is None:
+            sid = len(self._syllables)
+            self._ids[yinjie] = sid
+            self._syllables.append(intern(yinjie))
+        return sid
+
+
+    def get(self, yinjie: str) -> Optional[int]:
+        """查询音节id，不存在时返回None"""
+        return self._ids.get(yinjie)
+
+
+    def syllable(self, sid: int) -> str:
+        """查询id对应的音节"""
+        return self._syllables[sid]
+
+
+class KanaMatrix:
+    """
+    以(音节id, 声调编码)为下标的假名矩阵
+
+    单元格为 `array` 中的整数，指向去重后的字符串池；0表示没有数据。
+    """
+
+    def __init__(self, index: Optional[SyllableIndex] = None) -> None:
+        self.index = index if index is not None else SyllableIndex()
+        self._pool: List[str] = [""]
+        self._pool_ids: Dict[str, int] = {}
+        self._cells = array("I", bytes(4 * TONE_CODES * len(self.index)))
+
+
+    def __len__(self) -> int:
+        """已填充的单元格数"""
+        return len(self._cells) - self._cells.count(0)
+
+
+    def set(self, yinjie: str, code: int, hiragana: str) -> None:
+        """写入一个单元格"""
+        sid = self.index.add(yinjie)
+        # 矩阵扩容
+        missing = (sid + 1) * TONE_CODES - len(self._cells)
+        if missing > 0:
+            self._cells.extend(array("I", bytes(4 * missing)))
+        pid = self._pool_ids.get(hiragana)
+        if pid is None:
+            pid = len(self._pool)
+            self._pool.append(intern(hiragana))
+            self._pool_ids[hiragana] = pid
+        self._cells[sid * TONE_CODES + code] = pid
+
+
+    def get(self, sid: int, code: int) -> Optional[str]:
+        """读取一个单元格，没有数据时返回None"""
+        pid = self._cells[sid * TONE_CODES + code]
+        return self._pool[pid] if pid else None
+
+
+    def query_codes(self, syllables: Sequence[str], codes: Sequence[Optional[int]], default: str) -> List[str]:
+        """
+        按音节和声调编码批量查询，无结果返回默认值
+
+        Args:
+            syllables: 音节序列
+            codes: 与音节一一对应的声调编码，None表示声调无效
+            default: 无结果时的返回值，`keep` 表示保留音节
+        """
+        ids = self.index._ids
+        cells = self._cells
+        pool = self._pool
+        keep = default == "keep"
+        result = []
+        for yinjie, code in zip(syllables, codes):
+            sid = ids.get(yinjie)
+            pid = cells[sid * TONE_CODES + code] if sid is not None and code is not None else 0
+            if pid:
+                result.append(pool[pid])
+            else:
+                result.append(yinjie if keep else default)
+        return result
+
+
+def encode_serial(serial: Iterable[Tuple[str, str]]) -> Tuple[List[str], List[Optional[int]]]:
+    """将(yinjie, tone)序列拆分为音节序列和声调编码序列"""
+    syllables = []
+    codes = []
+    for yinjie, tone in serial:
+        syllables.append(yinjie)
+        codes.append(_TONE_CODE.get(tone))
+    return syllables, codes
@@ -1,17 +1,20 @@
-from typing import Optional, Tuple, List
+import threading
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, List
 
+from yukkurimandarin.cache import CacheInfo, LRUCache
+from yukkurimandarin.charclass import hanzi_run
 from yukkurimandarin.pre_process import pre_process
-from yukkurimandarin.hanzi_process import hanzi_process
-from yukkurimandarin.non_hanzi_process import non_hanzi_process
+from yukkurimandarin.hanzi_process import hanzi_process, default_tokenizer, to_pinyin
+from yukkurimandarin.non_hanzi_process import non_hanzi_process, default_config
 from yukkurimandarin.settings import NonHanziModes
 from yukkurimandarin.database_mngr import DatabaseManager
 from yukkurimandarin.post_process import post_process
+from yukkurimandarin.profiling import active_profiler
 
-# 可选组件
-try:
+# 可选组件（仅用于类型注解）
+if TYPE_CHECKING:
     from jieba import Tokenizer
-except ImportError:
-    pass
 
 
 def text_convert(sentence: str, 
@@ -39,24 +42,47 @@ def text_convert(sentence: str,
       >>> print(result)
 
     """
-    # 参数类型检查
-    if not isinstance(sentence, str):
-        raise ValueError(f"参数sentence必须是字符串: {sentence}")
-    # 空字符串检查
-    if not sentence:
-        return ""
-    # 预处理
-    sentence = pre_process(sentence)
-    # 切分
-    hanzi, non_hanzi, last_type = divide(sentence)
-    # 分别处理汉字片段和非汉字片段
-    res_hanzi = hanzi_process(hanzi, tokenizer, pinyin_database)
-    res_non_hanzi = non_hanzi_process(non_hanzi, non_hanzi_config)
-    # 还原
-    result = combine(res_hanzi, res_non_hanzi, last_type)
-    # 后处理
-    result = post_process(result, without_accent)
-    return result
+    # 使用共享的默认转换器
+    if tokenizer is None and pinyin_database is None:
+        return get_default_converter().text(sentence, without_accent, non_hanzi_config)
+    # 使用临时转换器
+    with Converter(tokenizer=tokenizer, pinyin_database=pinyin_database) as converter:
+        return converter.text(sentence, without_accent, non_hanzi_config)
+
+
+def text_convert_many(sentences: Iterable[str],
+                      without_accent: bool = False,
+                      tokenizer: Optional["Tokenizer"] = None,
+                      pinyin_database: Optional[DatabaseManager] = None,
+                      non_hanzi_config: Optional[NonHanziModes] = None) -> List[str]:
+    """
+    批量转换多个句子。结果与逐句调用 `text_convert` 相同，但速度更快。
+
+    相同的句子和汉字片段只会处理一次，分词、拼音化和拼音数据库查询都对整批数据一次完成。
+
+    Args:
+        sentences: 输入的句子
+        without_accent: 是否去除音声记号
+        tokenizer: jieba分词器
+        pinyin_database: 拼音数据库管理类
+        non_hanzi_config: 非汉字处理模式
+
+    Returns:
+        与输入一一对应的转换结果
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> results = ym.text_convert_many(["油库里普通话。", "你好。"])
+      >>> print(results)
+
+    """
+    # 使用共享的默认转换器
+    if tokenizer is None and pinyin_database is None:
+        return get_default_converter().text_many(sentences, without_accent, non_hanzi_config)
+    # 使用临时转换器
+    with Converter(tokenizer=tokenizer, pinyin_database=pinyin_database) as converter:
+        return converter.text_many(sentences, without_accent, non_hanzi_config)
 
 
 def divide(sentence: str) -> Tuple[List[str], List[str], bool]:
@@ -74,31 +100,19 @@ def divide(sentence: str) -> Tuple[List[str], List[str], bool]:
     # 初始化变量
     hanzi: List[str] = []
     non_hanzi: List[str] = []
-    word_basket = []
-    basket_type = is_hanzi(sentence[0])
-    # 遍历句子
-    for char in sentence:
-        # 当前字符类型
-        current_type = is_hanzi(char)
-
-        if current_type == basket_type:
-            # 加入字篮
-            word_basket.append(char)
-        else:
-            # 处理字篮
-            if basket_type:
-                hanzi.append("".join(word_basket))
-            else:
-                non_hanzi.append("".join(word_basket))
-            # 初始化下一个字篮
-            word_basket = [char]
-            basket_type = current_type
-    # 处理最后一个字篮
-    if basket_type:
-        hanzi.append("".join(word_basket))
-    else:
-        non_hanzi.append("".join(word_basket))
-    return (hanzi, non_hanzi, basket_type)
+    pos = 0
+    # 按汉字连续片段切分
+    for match in hanzi_run().finditer(sentence):
+        start, end = match.span()
+        if start > pos:
+            non_hanzi.append(sentence[pos:start])
+        hanzi.append(match.group())
+        pos = end
+    # 处理最后一个片段
+    if pos < len(sentence):
+        non_hanzi.append(sentence[pos:])
+        return (hanzi, non_hanzi, False)
+    return (hanzi, non_hanzi, True)
 
 
 def combine(res_hanzi: List[str], res_non_hanzi: List[str], last_type: bool) -> str:
@@ -149,14 +163,10 @@ def combine(res_hanzi: List[str], res_non_hanzi: List[str], last_type: bool) ->
 
 
 def is_hanzi(fragment: str) -> bool:
-    """判断字符串是否为汉字"""
+    """判断字符串是否为汉字（CJK统一汉字、扩展A及兼容汉字）"""
     if not fragment:
         return False
-    for char in fragment:
-        # 基本汉字范围
-        if not 0x4E00 <= ord(char) <= 0x9FFF:
-            return False
-    return True
+    return hanzi_run().fullmatch(fragment) is not None
 
 
 def pinyin_convert(sentence: str,
@@ -182,38 +192,377 @@ def pinyin_convert(sentence: str,
       >>> print(result)
 
     """
-    # 参数类型检查
-    if not isinstance(sentence, str):
-        raise ValueError(f"参数sentence必须是字符串: {sentence}")
-    # 空字符串检查
-    if not sentence:
-        return ""
-    # 获取拼音序列
-    mark = "/0"
-    pinyin_list = [mark]
-    pinyin_list.extend(sentence.split())
-    pinyin_list.append(mark)
-    # 无效拼音
-    for i, pinyin in enumerate(pinyin_list):
-        if pinyin[-1] not in "012345":
-            pinyin_list[i] = f"{pinyin}0"
-    # 构造拼音序列
-    serial: List[Tuple[str, str]] = []
-    for i in range(1, len(pinyin_list)-1):
-        serial.append((pinyin_list[i][:-1], f"{pinyin_list[i-1][-1]}{pinyin_list[i][-1]}{pinyin_list[i+1][-1]}"))
-    # 查询假名拟音
+    # 使用共享的默认转换器
     if pinyin_database is None:
-        pinyin_database = DatabaseManager()
-    hiragana_list = pinyin_database.serial_search(serial, error)
-    result_list = []
-    punctuation_map = {",": "、", ".": "。", ";": ",", "?": "?"}
-    for i in range(len(serial)):
-        # 还原标点
-        if serial[i][1][1] == "0":
-            item = punctuation_map.get(serial[i][0], error)
-            result_list.append(item)
+        return get_default_converter().pinyin(sentence, error, without_accent)
+    # 使用临时转换器
+    with Converter(pinyin_database=pinyin_database) as converter:
+        return converter.pinyin(sentence, error, without_accent)
+
+
+class Converter:
+    """
+    可复用的转换器
+
+    长期持有jieba分词器、拼音数据库长连接、非汉字处理模式和后处理设置，
+    避免每次转换都重新初始化这些组件。适合需要大量转换的场景。
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> with ym.Converter() as converter:
+      ...     print(converter.text("油库里普通话。"))
+      ...     print(converter.pinyin("you2 ku4 li3 pu3 tong1 hua4 ."))
+
+    """
+    def __init__(self,
+                 without_accent: bool = False,
+                 tokenizer: Optional["Tokenizer"] = None,
+                 pinyin_database: Optional[DatabaseManager] = None,
+                 non_hanzi_config: Optional[NonHanziModes] = None,
+                 cache_size: int = 4096) -> None:
+        """
+        Args:
+            without_accent: 是否去除音声记号（默认值，可在每次转换时覆盖）
+            tokenizer: jieba分词器，默认使用内置分词器
+            pinyin_database: 拼音数据库管理类，默认使用默认数据库
+            non_hanzi_config: 非汉字处理模式（默认值，可在每次转换时覆盖）
+            cache_size: 汉字片段缓存的容量，0表示不缓存
+        """
+        self.without_accent = without_accent
+        self.tokenizer = tokenizer if tokenizer is not None else default_tokenizer()
+        self.pinyin_database = pinyin_database if pinyin_database is not None else DatabaseManager()
+        self.non_hanzi_config = non_hanzi_config if non_hanzi_config is not None else default_config()
+        self.cache = LRUCache(cache_size) if cache_size > 0 else None
+        # 缓存内容对应的拼音数据库数据版本
+        self._data_version = self.pinyin_database.data_version
+        # 仅关闭由本转换器打开的长连接
+        self._owns_connection = False
+        # 后台预热线程
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._warmup_lock = threading.Lock()
+
+
+    def open(self) -> None:
+        """打开拼音数据库长连接。首次转换时会自动调用"""
+        # 预热尚未完成时等待，避免重复载入
+        thread = self._warmup_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self._warmup_thread = None
+        if not self.pinyin_database.is_open:
+            self.pinyin_database.open()
+            self._owns_connection = True
+
+
+    def close(self) -> None:
+        """关闭由本转换器打开的拼音数据库长连接"""
+        if self._owns_connection:
+            self.pinyin_database.close()
+            self._owns_connection = False
+
+
+    def warmup(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        预先载入jieba词典、pypinyin词典和拼音表，消除首次转换的延迟
+
+        后台预热期间开始的转换会等待预热完成，而不会重复载入。
+
+        Args:
+            background: 是否在后台线程中预热。为False时在当前线程中完成预热后返回
+
+        Returns:
+            后台预热线程（已在运行或已完成时返回同一线程），不在后台预热时返回None
+        """
+        with self._warmup_lock:
+            thread = self._warmup_thread
+            if thread is None and background:
+                thread = threading.Thread(target=self._warmup, name="yukkurimandarin-warmup", daemon=True)
+                self._warmup_thread = thread
+                thread.start()
+        if background:
+            return thread
+        if thread is not None:
+            thread.join()
         else:
-            result_list.append(hiragana_list[i])
-    result = "".join(result_list)
-    result = post_process(result, without_accent)
-    return result
\ No newline at end of file
+            self._warmup()
+        return None
+
+
+    def _warmup(self) -> None:
+        """载入分词词典、拼音词典和拼音表"""
+        self.open()
+        if self.tokenizer is not None:
+            self.tokenizer.initialize()
+        to_pinyin(["预热"])
+
+
+    def cache_info(self) -> CacheInfo:
+        """汉字片段缓存的命中统计"""
+        if self.cache is None:
+            return CacheInfo(0, 0, 0, 0)
+        return self.cache.cache_info()
+
+
+    def clear_cache(self) -> None:
+        """清空汉字片段缓存。修改分词词典后应调用此方法（拼音数据库被修改时会自动换用新的缓存）"""
+        if self.cache is not None:
+            self.cache.clear()
+
+
+    def _current_cache(self) -> Optional[LRUCache]:
+        """
+        当前的汉字片段缓存
+
+        拼音数据库的数据版本改变后（参见 `DatabaseManager.check_changes`），整体换用新的空缓存，
+        正在使用旧缓存的转换不受影响，其结果也不会进入新缓存。
+        """
+        version = self.pinyin_database.check_changes()
+        cache = self.cache
+        if cache is not None and version != self._data_version:
+            cache = self.cache = LRUCache(cache.maxsize)
+            self._data_version = version
+        return cache
+
+
+    def __enter__(self) -> "Converter":
+        self.open()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+    def text(self,
+             sentence: str,
+             without_accent: Optional[bool] = None,
+             non_hanzi_config: Optional[NonHanziModes] = None) -> str:
+        """
+        将中文句子中的汉字转换为伪日本语，非汉字字符按设置处理
+
+        Args:
+            sentence: 输入的句子
+            without_accent: 是否去除音声记号，None表示使用转换器的设置
+            non_hanzi_config: 非汉字处理模式，None表示使用转换器的设置
+
+        Returns:
+            转换后的句子
+        """
+        # 参数类型检查
+        if not isinstance(sentence, str):
+            raise ValueError(f"参数sentence必须是字符串: {sentence}")
+        # 空字符串检查
+        if not sentence:
+            return ""
+        if without_accent is None:
+            without_accent = self.without_accent
+        if non_hanzi_config is None:
+            non_hanzi_config = self.non_hanzi_config
+        self.open()
+        profiler = active_profiler()
+        if profiler is not None:
+            start = clock = perf_counter()
+        # 预处理
+        sentence = pre_process(sentence)
+        if profiler is not None:
+            clock = profiler.lap("pre_process", clock, 1)
+        # 切分
+        hanzi, non_hanzi, last_type = divide(sentence)
+        if profiler is not None:
+            clock = profiler.lap("divide", clock, len(hanzi) + len(non_hanzi))
+        # 分别处理汉字片段和非汉字片段
+        res_hanzi = hanzi_process(hanzi, self.tokenizer, self.pinyin_database, self._current_cache())
+        if profiler is not None:
+            # hanzi_process 自行报告耗时
+            clock = perf_counter()
+        res_non_hanzi = non_hanzi_process(non_hanzi, non_hanzi_config)
+        if profiler is not None:
+            clock = profiler.lap("non_hanzi_process", clock, len(non_hanzi))
+        # 还原
+        result = combine(res_hanzi, res_non_hanzi, last_type)
+        # 后处理
+        result = post_process(result, without_accent)
+        if profiler is not None:
+            profiler.lap("post_process", clock, 1)
+            profiler.lap("text", start, 1)
+        return result
+
+
+    def text_many(self,
+                  sentences: Iterable[str],
+                  without_accent: Optional[bool] = None,
+                  non_hanzi_config: Optional[NonHanziModes] = None) -> List[str]:
+        """
+        批量转换多个句子，结果与逐句调用 `text` 相同
+
+        Args:
+            sentences: 输入的句子
+            without_accent: 是否去除音声记号，None表示使用转换器的设置
+            non_hanzi_config: 非汉字处理模式，None表示使用转换器的设置
+
+        Returns:
+            与输入一一对应的转换结果
+        """
+        sentences = list(sentences)
+        # 参数类型检查
+        for sentence in sentences:
+            if not isinstance(sentence, str):
+                raise ValueError(f"参数sentence必须是字符串: {sentence}")
+        if without_accent is None:
+            without_accent = self.without_accent
+        if non_hanzi_config is None:
+            non_hanzi_config = self.non_hanzi_config
+        # 句子去重
+        unique_sentences = [s for s in dict.fromkeys(sentences) if s]
+        if not unique_sentences:
+            return ["" for _ in sentences]
+        self.open()
+        profiler = active_profiler()
+        if profiler is not None:
+            start = clock = perf_counter()
+        # 预处理并切分，同时对片段去重
+        divided: List[Tuple[List[str], List[str], bool]] = []
+        hanzi_index: Dict[str, int] = {}
+        non_hanzi_index: Dict[str, int] = {}
+        for sentence in unique_sentences:
+            hanzi, non_hanzi, last_type = divide(pre_process(sentence))
+            for fragment in hanzi:
+                hanzi_index.setdefault(fragment, len(hanzi_index))
+            for fragment in non_hanzi:
+                non_hanzi_index.setdefault(fragment, len(non_hanzi_index))
+            divided.append((hanzi, non_hanzi, last_type))
+        if profiler is not None:
+            # 批量转换时预处理计入切分
+            clock = profiler.lap("divide", clock, len(hanzi_index) + len(non_hanzi_index))
+        # 整批处理汉字片段和非汉字片段
+        res_hanzi = hanzi_process(list(hanzi_index), self.tokenizer, self.pinyin_database, self._current_cache())
+        if profiler is not None:
+            clock = perf_counter()
+        res_non_hanzi = non_hanzi_process(list(non_hanzi_index), non_hanzi_config)
+        if profiler is not None:
+            clock = profiler.lap("non_hanzi_process", clock, len(non_hanzi_index))
+        # 按句还原并后处理
+        results: Dict[str, str] = {"": ""}
+        for sentence, (hanzi, non_hanzi, last_type) in zip(unique_sentences, divided):
+            result = combine([res_hanzi[hanzi_index[f]] for f in hanzi],
+                             [res_non_hanzi[non_hanzi_index[f]] for f in non_hanzi],
+                             last_type)
+            results[sentence] = post_process(result, without_accent)
+        if profiler is not None:
+            profiler.lap("post_process", clock, len(unique_sentences))
+            profiler.lap("text_many", start, len(sentences))
+        return [results[sentence] for sentence in sentences]
+
+
+    def pinyin(self,
+               sentence: str,
+               error: str = "",
+               without_accent: Optional[bool] = None) -> str:
+        """
+        将拼音转换为伪日本语
+
+        Args:
+            sentence: 输入的拼音（以空格分开）
+            error: 无结果时的返回值
+            without_accent: 是否去除音声记号，None表示使用转换器的设置
+
+        Returns:
+            转换后的句子
+        """
+        # 参数类型检查
+        if not isinstance(sentence, str):
+            raise ValueError(f"参数sentence必须是字符串: {sentence}")
+        # 空字符串检查
+        if not sentence:
+            return ""
+        if without_accent is None:
+            without_accent = self.without_accent
+        self.open()
+        profiler = active_profiler()
+        if profiler is not None:
+            start = perf_counter()
+        # 获取拼音序列
+        mark = "/0"
+        pinyin_list = [mark]
+        pinyin_list.extend(sentence.split())
+        pinyin_list.append(mark)
+        # 无效拼音
+        for i, pinyin in enumerate(pinyin_list):
+            if pinyin[-1] not in "012345":
+                pinyin_list[i] = f"{pinyin}0"
+        # 构造拼音序列
+        serial: List[Tuple[str, str]] = []
+        for i in range(1, len(pinyin_list)-1):
+            serial.append((pinyin_list[i][:-1], f"{pinyin_list[i-1][-1]}{pinyin_list[i][-1]}{pinyin_list[i+1][-1]}"))
+        # 查询假名拟音
+        hiragana_list = self.pinyin_database.serial_search(serial, error)
+        result_list = []
+        punctuation_map = {",": "、", ".": "。", ";": ",", "?": "?"}
+        for i in range(len(serial)):
+            # 还原标点
+            if serial[i][1][1] == "0":
+                item = punctuation_map.get(serial[i][0], error)
+                result_list.append(item)
+            else:
+                result_list.append(hiragana_list[i])
+        result = "".join(result_list)
+        result = post_process(result, without_accent)
+        if profiler is not None:
+            profiler.lap("pinyin", start, 1)
+        return result
+
+
+# 共享的默认转换器
+_DEFAULT_CONVERTER: Optional[Converter] = None
+_DEFAULT_CONVERTER_LOCK = threading.Lock()
+# 默认转换器的后台预热线程
+_WARMUP_THREAD: Optional[threading.Thread] = None
+
+
+def warmup(background: bool = True) -> Optional[threading.Thread]:
+    """
+    预热 `text_convert` 和 `pinyin_convert` 共享的默认转换器
+
+    在程序启动时调用，可以在后台载入jieba词典、pypinyin词典和拼音表，避免第一次转换的延迟。
+    预热完成前开始的转换会等待预热结束。
+
+    Args:
+        background: 是否在后台线程中预热
+
+    Returns:
+        后台预热线程，不在后台预热时返回None
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> ym.warmup()
+      >>> # ……其他初始化工作……
+      >>> print(ym.text_convert("油库里普通话。"))
+
+    """
+    global _WARMUP_THREAD
+    if not background:
+        get_default_converter().warmup(background=False)
+        return None
+    # 默认转换器的创建（导入jieba）也在后台线程中进行
+    with _DEFAULT_CONVERTER_LOCK:
+        if _WARMUP_THREAD is None:
+            _WARMUP_THREAD = threading.Thread(target=lambda: get_default_converter().warmup(background=False),
+                                              name="yukkurimandarin-warmup", daemon=True)
+            _WARMUP_THREAD.start()
+        return _WARMUP_THREAD
+
+
+def get_default_converter() -> Converter:
+    """获取 `text_convert` 和 `pinyin_convert` 共享的默认转换器"""
+    global _DEFAULT_CONVERTER
+    # 预热尚未完成时等待
+    thread = _WARMUP_THREAD
+    if thread is not None and thread is not threading.current_thread():
+        thread.join()
+    if _DEFAULT_CONVERTER is None:
+        with _DEFAULT_CONVERTER_LOCK:
+            if _DEFAULT_CONVERTER is None:
+                _DEFAULT_CONVERTER = Converter()
+    return _DEFAULT_CONVERTER
@@ -1,6 +1,50 @@
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+import re
 import sqlite3
-from typing import List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# 单条语句中音节参数的上限（低于SQLite默认的变量数上限）
+_MAX_PARAMS = 500
+
+# 批量查询时每条语句中的(yinjie, tone)数，每个占2个参数
+_MAX_KEYS = 256
+
+
+@lru_cache(maxsize=None)
+def _batch_sql(size: int) -> str:
+    """查询 `size` 个(yinjie, tone)的语句"""
+    values = ",".join(["(?,?)"] * size)
+    return (f"WITH input(yinjie, tone) AS (VALUES {values}) "
+            "SELECT p.yinjie, p.tone, p.hiragana FROM input "
+            "JOIN pinyin_data AS p ON p.yinjie = input.yinjie AND p.tone = input.tone")
+
+
+# 数据表结构的版本（保存在 PRAGMA user_version 中，0表示版本1或空数据库）
+SCHEMA_VERSION = 2
+SCHEMAS = {
+    # 版本1：rowid表，自增id，(yinjie, tone)上另有唯一索引
+    1: """
+        CREATE TABLE IF NOT EXISTS pinyin_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            yinjie TEXT NOT NULL,
+            tone TEXT NOT NULL,
+            hiragana TEXT NOT NULL,
+            UNIQUE (yinjie, tone) ON CONFLICT REPLACE
+        )
+    """,
+    # 版本2：以(yinjie, tone)为主键的WITHOUT ROWID表，查询直接在主键上进行，覆盖写入不再产生新的id
+    2: """
+        CREATE TABLE IF NOT EXISTS pinyin_data (
+            yinjie TEXT NOT NULL,
+            tone TEXT NOT NULL,
+            hiragana TEXT NOT NULL,
+            PRIMARY KEY (yinjie, tone) ON CONFLICT REPLACE
+        ) WITHOUT ROWID
+    """,
+}
 
 
 class Database:
@@ -9,28 +53,124 @@ class Database:
     # 默认数据库路径
     DEFAULT_DB_PATH = Path(__file__).parent / "data" / "yinjie_database.db"
 
-    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
-        """初始化数据库连接"""
+    def __init__(self,
+                 db_path: Path = DEFAULT_DB_PATH,
+                 check_same_thread: bool = True,
+                 wal: bool = False,
+                 read_only: bool = False,
+                 immutable: bool = False,
+                 pragmas: Optional[Dict[str, Any]] = None):
+        """
+        初始化数据库连接
+
+        Args:
+            db_path: 数据库路径
+            check_same_thread: 是否只允许在创建连接的线程中使用
+            wal: 是否切换到WAL日志模式（写入时不阻塞其他连接的读取）
+            read_only: 是否以只读方式打开（`mode=ro`），只读时不创建数据表，数据库文件必须已经存在
+            immutable: 只读时是否假定数据库文件不会被修改（`immutable=1`），不再加锁和检查修改。
+                仅适用于不会被任何进程修改的数据库，例如安装包内置的数据库
+            pragmas: 连接建立后执行的PRAGMA设置，例如 `{"cache_size": -4096, "temp_store": "MEMORY"}`
+        """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        if read_only:
+            uri = f"{Path(db_path).absolute().as_uri()}?mode=ro"
+            if immutable:
+                uri += "&immutable=1"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+        else:
+            self.conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
         self.cursor = self.conn.cursor()
-        self._create_table()
+        # 是否处于 `transaction` 中（此时各操作不单独提交）
+        self._in_transaction = False
+        if pragmas:
+            self._set_pragmas(pragmas)
+        if not read_only:
+            if wal:
+                self._enable_wal()
+            self._create_table()
+
+
+    def _set_pragmas(self, pragmas: Dict[str, Any]) -> None:
+        """执行PRAGMA设置"""
+        for name, value in pragmas.items():
+            if not re.fullmatch(r"[a-z_]+", name) or not re.fullmatch(r"-?\w+", str(value)):
+                raise ValueError(f"PRAGMA设置格式错误: {name}={value}")
+            self.cursor.execute(f"PRAGMA {name}={value}")
+
+
+    def _enable_wal(self) -> None:
+        """切换到WAL日志模式。该设置保存在数据库文件中，只读的数据库保持原来的模式"""
+        try:
+            self.cursor.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            pass
 
 
     def _create_table(self) -> None:
-        """创建拼音数据表"""
-        self.cursor.execute("""
-        CREATE TABLE IF NOT EXISTS pinyin_data (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            yinjie TEXT NOT NULL,
-            tone TEXT NOT NULL,
-            hiragana TEXT NOT NULL,
-            UNIQUE (yinjie, tone) ON CONFLICT REPLACE
+        """创建拼音数据表，旧版本的数据表会被自动迁移"""
+        if self.schema_version() >= SCHEMA_VERSION:
+            return
+        with self.transaction():
+            self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pinyin_data'")
+            if self.cursor.fetchone() is not None:
+                self._migrate_v1()
+            else:
+                self.cursor.execute(SCHEMAS[SCHEMA_VERSION])
+            self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+    def _migrate_v1(self) -> None:
+        """将版本1的数据表迁移到当前版本"""
+        self.cursor.execute("ALTER TABLE pinyin_data RENAME TO _pinyin_data_v1")
+        self.cursor.execute(SCHEMAS[SCHEMA_VERSION])
+        self.cursor.execute(
+            "INSERT INTO pinyin_data (yinjie, tone, hiragana) SELECT yinjie, tone, hiragana FROM _pinyin_data_v1"
         )
-        """)
+        self.cursor.execute("DROP TABLE _pinyin_data_v1")
+
+
+    def schema_version(self) -> int:
+        """数据表结构的版本，没有数据表时返回0"""
+        version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version:
+            return version
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pinyin_data'")
+        return 1 if self.cursor.fetchone() is not None else 0
+
+
+    @contextmanager
+    def transaction(self) -> Iterator["Database"]:
+        """
+        在一个事务中执行多个操作：结束时只提交一次，出错时全部回滚。已在事务中时直接加入该事务
+
+        Usage:
+
+          >>> with db.transaction():
+          ...     db.insert_entry("a", "151", "あ")
+          ...     db.delete_by_pinyin("a", "152")
+        """
+        if self._in_transaction:
+            yield self
+            return
+        self.cursor.execute("BEGIN IMMEDIATE")
+        self._in_transaction = True
+        try:
+            yield self
+        except BaseException:
+            self._in_transaction = False
+            self.conn.rollback()
+            raise
+        self._in_transaction = False
         self.conn.commit()
 
 
+    def _commit(self) -> None:
+        """不在事务中时提交"""
+        if not self._in_transaction:
+            self.conn.commit()
+
+
     def insert_entry(self, yinjie: str, tone: str, hiragana: str) -> None:
         """插入单条拼音数据
         
@@ -43,7 +183,7 @@ class Database:
             "INSERT INTO pinyin_data (yinjie, tone, hiragana) VALUES (?, ?, ?)",
             (yinjie, tone, hiragana)
         )
-        self.conn.commit()
+        self._commit()
 
 
     def insert_batch(self, entries: List[Tuple[str, str, str]]) -> None:
@@ -64,7 +204,22 @@ class Database:
             "INSERT INTO pinyin_data (yinjie, tone, hiragana) VALUES (?, ?, ?)",
             entries
         )
-        self.conn.commit()
+        self._commit()
+
+
+    def update_entry(self, yinjie: str, tone: str, hiragana: str) -> bool:
+        """修改已有的拼音数据，返回是否存在该数据
+
+        Usage:
+
+          >>> db.update_entry("a", "151", "っあ")
+        """
+        self.cursor.execute(
+            "UPDATE pinyin_data SET hiragana = ? WHERE yinjie = ? AND tone = ?",
+            (hiragana, yinjie, tone)
+        )
+        self._commit()
+        return self.cursor.rowcount > 0
 
 
     def query_by_pinyin(self, yinjie: str, tone: str) -> List[Tuple[str, str, str]]:
@@ -97,38 +252,75 @@ class Database:
         return self.cursor.fetchall()
 
 
+    def query_by_pattern(self, yinjie_list: Sequence[str], tone_glob: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """查询多个音节中声调匹配GLOB模式的拼音数据，按音节在 `yinjie_list` 中的顺序和声调排序
+
+        Usage:
+
+          >>> results = db.query_by_pattern(["ni", "hao"], "?3?")
+          >>> results = db.query_by_pattern(["ni"])  # 所有声调
+        """
+        return self._select_pattern(yinjie_list, tone_glob)
+
+
+    def delete_by_pattern(self, yinjie_list: Sequence[str], tone_glob: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """在一个事务中删除多个音节中声调匹配GLOB模式的拼音数据，返回被删除的数据
+
+        Usage:
+
+          >>> deleted = db.delete_by_pattern(["ni", "hao"], "1[12345]?")
+        """
+        with self.transaction():
+            rows = self._select_pattern(yinjie_list, tone_glob)
+            for condition, params in self._pattern_chunks(yinjie_list, tone_glob):
+                self.cursor.execute(f"DELETE FROM pinyin_data WHERE {condition}", params)
+        return rows
+
+
+    def _select_pattern(self, yinjie_list: Sequence[str], tone_glob: Optional[str]) -> List[Tuple[str, str, str]]:
+        """查询匹配的数据并排序"""
+        rows: List[Tuple[str, str, str]] = []
+        for condition, params in self._pattern_chunks(yinjie_list, tone_glob):
+            self.cursor.execute(f"SELECT yinjie, tone, hiragana FROM pinyin_data WHERE {condition}", params)
+            rows += self.cursor.fetchall()
+        order = {yinjie: i for i, yinjie in reversed(list(enumerate(yinjie_list)))}
+        rows.sort(key=lambda row: (order[row[0]], row[1]))
+        return rows
+
+
+    def _pattern_chunks(self, yinjie_list: Sequence[str], tone_glob: Optional[str]) -> Iterator[Tuple[str, List[str]]]:
+        """按参数上限分段生成(WHERE条件, 参数)"""
+        yinjie_list = list(dict.fromkeys(yinjie_list))
+        for start in range(0, len(yinjie_list), _MAX_PARAMS):
+            chunk = yinjie_list[start:start + _MAX_PARAMS]
+            condition = f"yinjie IN ({','.join('?' * len(chunk))})"
+            params: List[str] = list(chunk)
+            if tone_glob is not None:
+                condition += " AND tone GLOB ?"
+                params.append(tone_glob)
+            yield condition, params
+
+
     def query_batch(self, entries: List[Tuple[str, str]], default: str) -> List[str]:
-        """批量查询数据，无结果返回默认值"""
+        """批量查询数据，无结果返回默认值
+
+        先对(yinjie, tone)去重，再以 `VALUES` 公用表表达式分段查询，每段只执行一条语句，不创建临时表。
+        """
         if not entries:
             return []
-        cur = self.cursor
-        # 建临时表
-        cur.execute("DROP TABLE IF EXISTS _tmp_query")
-        cur.execute("CREATE TEMP TABLE _tmp_query(yinjie TEXT, tone TEXT, ord INTEGER PRIMARY KEY)")
-        cur.executemany(
-            "INSERT INTO _tmp_query(yinjie, tone, ord) VALUES (?,?,?)",
-            [(yinjie, tone, idx) for idx, (yinjie, tone) in enumerate(entries)]
-        )
-        # 保留模式
+        keys = list(dict.fromkeys((yinjie, tone) for yinjie, tone in entries))
+        found: Dict[Tuple[str, str], str] = {}
+        for start in range(0, len(keys), _MAX_KEYS):
+            chunk = keys[start:start + _MAX_KEYS]
+            # 段长补齐到2的幂，使语句的种类有限，能够被语句缓存复用
+            size = 1 << (len(chunk) - 1).bit_length()
+            chunk += [chunk[-1]] * (size - len(chunk))
+            self.cursor.execute(_batch_sql(size), [value for key in chunk for value in key])
+            for yinjie, tone, hiragana in self.cursor.fetchall():
+                found[(yinjie, tone)] = hiragana
         if default == "keep":
-            cur.execute("""
-                SELECT COALESCE(p.hiragana, input.yinjie)
-                FROM _tmp_query AS input
-                LEFT JOIN "pinyin_data" AS p ON input.yinjie = p.yinjie AND input.tone = p.tone
-                ORDER BY input.ord
-            """)
-        # 替换模式
-        else:
-            cur.execute("""
-                SELECT COALESCE(p.hiragana, ?)
-                FROM _tmp_query AS input
-                LEFT JOIN "pinyin_data" AS p ON input.yinjie = p.yinjie AND input.tone = p.tone
-                ORDER BY input.ord
-            """, (default,))
-        rows = cur.fetchall()
-        # 清理临时表
-        cur.execute("DROP TABLE _tmp_query")
-        return [row[0] for row in rows]
+            return [found.get((yinjie, tone), yinjie) for yinjie, tone in entries]
+        return [found.get((yinjie, tone), default) for yinjie, tone in entries]
 
 
     def query_all(self) -> List[Tuple[str, str, str]]:
@@ -145,7 +337,7 @@ class Database:
             "DELETE FROM pinyin_data WHERE yinjie = ? AND tone = ?",
             (yinjie, tone)
         )
-        self.conn.commit()
+        self._commit()
 
 
     def delete_by_yinjie(self, yinjie: str) -> None:
@@ -154,7 +346,7 @@ class Database:
             "DELETE FROM pinyin_data WHERE yinjie = ?",
             (yinjie,)
         )
-        self.conn.commit()
+        self._commit()
 
 
     def close(self) -> None:
@@ -1,18 +1,30 @@
 # 数据库管理操作。
 
+from importlib.util import find_spec
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Any, ContextManager, Dict, List, Tuple, Optional, Sequence, Union
 import csv
+import os
+import sys
+import threading
 from datetime import datetime
+from time import monotonic, perf_counter
+from zlib import crc32
 
-from yukkurimandarin.database import Database
+from yukkurimandarin.charclass import display_width
+from yukkurimandarin.artifact import ArtifactTable, build_artifact
+from yukkurimandarin.codec import decode_tone
+from yukkurimandarin.database import SCHEMA_VERSION, Database
+from yukkurimandarin.pinyin_table import MemoryTable, RuleTable, rule_overrides
+from yukkurimandarin.profiling import active_profiler
 
-# 可选组件
-try:
-    import openpyxl
-    _HAS_OPENPYXL = True
-except ImportError:
-    _HAS_OPENPYXL = False
+# 可选组件（首次使用时才导入）
+_HAS_OPENPYXL = find_spec("openpyxl") is not None
+
+# 本进程中各数据库的写入次数（数据库的绝对路径 -> 次数），由所有管理类共享。
+# 通过任一实例写入后，同一数据库的其他实例在下次查询时即可发现，无需等待检查间隔
+_WRITE_COUNTS: Dict[str, int] = {}
+_WRITE_COUNTS_LOCK = threading.Lock()
 
 
 class DatabaseManager:
@@ -23,33 +35,324 @@ class DatabaseManager:
     DEFAULT_XLSX_PATH = DEFAULT_FILE_DIR / "yinjie_table.xlsx"
     DEFAULT_CSV_PATH = DEFAULT_FILE_DIR / "yinjie_table.csv"
 
-    def __init__(self, db_path: Optional[str] = None):
+    # 查询后端
+    BACKENDS = ("sqlite", "memory", "rule", "mmap")
+
+    # 查询连接默认的PRAGMA设置
+    DEFAULT_PRAGMAS: Dict[str, Any] = {"mmap_size": 1 << 24, "cache_size": -4096, "temp_store": "MEMORY"}
+
+    # 默认每秒最多检查一次数据库是否被其他进程修改
+    DEFAULT_RELOAD_INTERVAL = 1.0
+
+    def __init__(self,
+                 db_path: Optional[str] = None,
+                 backend: str = "sqlite",
+                 artifact_path: Optional[str] = None,
+                 immutable: bool = False,
+                 pragmas: Optional[Dict[str, Any]] = None,
+                 reload_interval: Optional[float] = DEFAULT_RELOAD_INTERVAL):
+        """
+        Args:
+            db_path: 数据库路径，默认使用内置数据库
+            backend: `serial_search` 使用的查询后端
+
+                * `sqlite`: 直接查询SQLite数据库
+                * `memory`: 首次查询时将整张拼音表载入内存，之后在进程内查询
+                * `rule`: 数据库只保存覆盖数据（参见 `compact`），其余条目按全局规则生成
+                * `mmap`: 通过mmap映射预编译的二进制拼音表（参见 `build_artifact`），启动时无需解析
+
+            artifact_path: 二进制拼音表路径，默认为数据库路径的后缀改为 `.bin`；
+                内置数据库的二进制拼音表默认保存在用户缓存目录中（参见 `artifact_cache_dir`），不写入安装目录
+            immutable: 查询时是否假定数据库文件不会被任何进程修改（`immutable=1`），仅适用于从不写入的部署。
+                通过本实例写入后自动停用
+            pragmas: 查询连接的PRAGMA设置，与 `DEFAULT_PRAGMAS` 合并，例如 `{"cache_size": -16384}`
+            reload_interval: 检查数据库是否被其他进程修改的最短间隔（秒），默认为1秒，None表示不检查。
+                检测到修改后自动重新载入内存拼音表（参见 `check_changes`）。`immutable` 为True时不检查
+        """
         if db_path is None:
             self.db_path = Database.DEFAULT_DB_PATH
         else:
             self.db_path = Path(db_path) # lazy initialization
+        if artifact_path is not None:
+            self.artifact_path = Path(artifact_path)
+        elif self.db_path == Database.DEFAULT_DB_PATH:
+            # 按安装路径区分，多个虚拟环境中的内置数据库互不影响
+            name = f"{self.db_path.stem}-{crc32(str(self.db_path.resolve()).encode('utf-8')):08x}.bin"
+            self.artifact_path = artifact_cache_dir() / name
+        else:
+            self.artifact_path = self.db_path.with_suffix(".bin")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"参数backend必须是{self.BACKENDS}之一: {backend}")
+        self.backend = backend
+        if reload_interval is not None and reload_interval < 0:
+            raise ValueError(f"参数reload_interval不能为负数: {reload_interval}")
+        if immutable:
+            # 已承诺数据库不会被修改，无需检查
+            reload_interval = None
+        # 被修改的文件以immutable=1读取时结果是未定义的，因此只在明确指定时启用
+        self.immutable = immutable
+        self.pragmas = {**self.DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.reload_interval = reload_interval
+        # 每个线程各自的长连接（仅供查询使用），关闭时按代数作废
+        self._local = threading.local()
+        self._readers: List[Tuple[threading.Thread, Database]] = []
+        self._generation = 0
+        self._opened = False
+        self._conn_lock = threading.Lock()
+        # 内存拼音表（仅供memory、rule和mmap后端使用）
+        self._table: Optional[Union[MemoryTable, RuleTable, ArtifactTable]] = None
+        # 二进制拼音表是否需要重新编译（数据库被本实例修改过）
+        self._artifact_stale = False
+        # 数据版本：数据库每次被修改（或检测到修改）时加1
+        self._data_version = 0
+        # 本进程中的写入次数（参见 `_WRITE_COUNTS`）
+        self._path_key = str(self.db_path.resolve())
+        self._writes_seen = _WRITE_COUNTS.get(self._path_key, 0)
+        # 修改检测：上次检查时的文件签名和下次检查的时间
+        self._watch_lock = threading.Lock()
+        self._signature = self._file_signature() if reload_interval is not None else None
+        self._next_check = monotonic() + reload_interval if reload_interval is not None else 0.0
+
+
+    @property
+    def data_version(self) -> int:
+        """数据版本，数据库每次被修改（或检测到修改）时加1。缓存了查询结果的调用方可以据此判断缓存是否过时"""
+        return self._data_version
+
+
+    @property
+    def is_open(self) -> bool:
+        """是否持有长连接或已载入的内存拼音表"""
+        return self._opened or self._table is not None
+
+
+    def open(self) -> None:
+        """
+        打开并保持数据库长连接（其他后端则载入内存拼音表）。
+
+        此后 `serial_search` 将复用长连接，而不是每次查询时重新连接数据库。
+        每个线程在首次查询时各自建立长连接，多个线程可以同时查询而无需互相等待。
+        """
+        if self.backend != "sqlite":
+            self._load_table()
+            return
+        with self._conn_lock:
+            self._opened = True
+        self._reader()
+
+
+    def close(self) -> None:
+        """
+        关闭所有线程的数据库长连接
+
+        已载入的内存拼音表会保留（它不占用数据库连接），之后的查询无需重新载入；如需释放内存请调用 `release`。
+        """
+        with self._conn_lock:
+            readers = self._readers
+            self._readers = []
+            self._generation += 1
+            self._opened = False
+        for _, db in readers:
+            db.close()
+
+
+    def release(self) -> None:
+        """关闭所有线程的数据库长连接，并释放内存拼音表"""
+        self.close()
+        self._table = None
+
+
+    def _reader(self) -> Optional[Database]:
+        """当前线程的长连接，未调用 `open` 时返回None"""
+        local = self._local
+        db = getattr(local, "db", None)
+        if db is not None and local.generation == self._generation:
+            return db
+        with self._conn_lock:
+            if not self._opened:
+                return None
+            self._prune_readers()
+            # 连接可能由其他线程关闭，因此不限制所在线程
+            db = self._connect(check_same_thread=False)
+            self._readers.append((threading.current_thread(), db))
+            local.db = db
+            local.generation = self._generation
+        return db
+
+
+    def _prune_readers(self) -> None:
+        """关闭已结束的线程遗留的长连接（调用时需持有 `_conn_lock`）"""
+        alive = []
+        for thread, db in self._readers:
+            if thread.is_alive():
+                alive.append((thread, db))
+            else:
+                db.close()
+        self._readers = alive
+
+
+    def _connect(self, write: bool = False, check_same_thread: bool = True) -> Database:
+        """
+        建立连接
+
+        查询时以只读方式打开已存在的数据库，不创建数据表；
+        写入时（或数据库尚不存在时）创建数据表，并切换到WAL日志模式，使写入不阻塞其他线程或进程的读取。
+        内置数据库保持原来的日志模式，以免在安装目录中留下 `-wal`/`-shm` 文件。
+        """
+        if not write and self.db_path.exists():
+            return Database(self.db_path, check_same_thread, read_only=True, immutable=self.immutable,
+                            pragmas=self.pragmas)
+        wal = write and self.db_path != Database.DEFAULT_DB_PATH
+        return Database(self.db_path, check_same_thread, wal=wal, pragmas=self.pragmas)
+
+
+    def reload(self) -> None:
+        """重新载入内存拼音表（仅memory、rule和mmap后端）"""
+        self._table = None
+        self._data_version += 1
+        if self.backend != "sqlite":
+            self._load_table()
+
+
+    def _load_table(self) -> Union[MemoryTable, RuleTable, ArtifactTable]:
+        """载入内存拼音表，已载入时直接返回"""
+        table = self._table
+        if table is None:
+            with self._conn_lock:
+                table = self._table
+                if table is None:
+                    table = self._table = self._build_table()
+        return table
+
+
+    def _build_table(self) -> Union[MemoryTable, RuleTable, ArtifactTable]:
+        """从数据库（或二进制拼音表）构造新的内存拼音表"""
+        if self.backend == "mmap":
+            # 二进制拼音表不存在或已过时则先编译
+            if self._artifact_stale or self._artifact_outdated():
+                self._build_artifact(self.artifact_path)
+            return ArtifactTable.open(self.artifact_path)
+        db = self._connect()
+        try:
+            data = db.query_all()
+        finally:
+            db.close()
+        return RuleTable(data) if self.backend == "rule" else MemoryTable(data)
+
+
+    def _artifact_outdated(self) -> bool:
+        """二进制拼音表是否不存在，或者早于数据库文件（例如数据库被其他进程修改或随新版本安装）"""
+        try:
+            built = os.stat(self.artifact_path).st_mtime_ns
+        except OSError:
+            return True
+        for path in (self.db_path, self.db_path.with_name(self.db_path.name + "-wal")):
+            try:
+                if os.stat(path).st_mtime_ns > built:
+                    return True
+            except OSError:
+                pass
+        return False
+
+
+    def _invalidate_table(self) -> None:
+        """数据库被修改后，丢弃已载入的内存拼音表"""
+        self._table = None
+        self._artifact_stale = True
+        self._data_version += 1
+        with _WRITE_COUNTS_LOCK:
+            self._writes_seen = _WRITE_COUNTS[self._path_key] = _WRITE_COUNTS.get(self._path_key, 0) + 1
+        if self.immutable:
+            # 数据库已不再是不可变的，之后的查询连接改为正常检查修改
+            with self._conn_lock:
+                self.immutable = False
+                self._generation += 1
+
+
+    def _file_signature(self) -> Tuple[Any, ...]:
+        """
+        数据库文件的签名，任何写入都会改变签名
+
+        由数据库文件和WAL文件的修改时间、大小、inode，以及数据库文件头中的修改计数组成，
+        只需几次 `stat` 和一次4字节的读取（偏移24处的修改计数），无需连接数据库。
+        """
+        signature: List[Any] = []
+        for path in (self.db_path, self.db_path.with_name(self.db_path.name + "-wal")):
+            try:
+                st = os.stat(path)
+            except OSError:
+                signature.append(None)
+            else:
+                signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        try:
+            with open(self.db_path, "rb") as f:
+                f.seek(24)
+                # 文件修改计数（非WAL模式下每次提交都会增加）
+                signature.append(f.read(4))
+        except OSError:
+            signature.append(None)
+        return tuple(signature)
+
+
+    def check_changes(self) -> int:
+        """
+        检查数据库是否被其他实例或进程修改
+
+        本进程中其他实例的写入每次都会检查（只需一次字典查询）；其他进程的写入仅在指定了 `reload_interval` 时检查，
+        且距上次检查不足 `reload_interval` 秒时直接返回，因此可以在每次查询前调用。
+        检测到修改后，先在当前线程中载入新的内存拼音表，再整体替换旧表，其他线程的查询不会等待或读到一半的数据；
+        sqlite后端的查询连接本身就能读到最新数据，无需重新载入。
+
+        Returns:
+            数据版本（参见 `data_version`）
+        """
+        interval = self.reload_interval
+        if (_WRITE_COUNTS.get(self._path_key, 0) == self._writes_seen
+                and (interval is None or monotonic() < self._next_check)):
+            return self._data_version
+        # 其他线程正在检查时不必等待
+        if not self._watch_lock.acquire(blocking=False):
+            return self._data_version
+        try:
+            writes = _WRITE_COUNTS.get(self._path_key, 0)
+            changed = writes != self._writes_seen
+            self._writes_seen = writes
+            if interval is not None and (changed or monotonic() >= self._next_check):
+                # 本进程中的写入同样会改变文件签名，一并记录，避免到达检查时间后再次重新载入
+                self._next_check = monotonic() + interval
+                signature = self._file_signature()
+                changed = changed or signature != self._signature
+                self._signature = signature
+            if changed:
+                # 先记录写入次数和签名再重新载入，载入期间的修改会在下次检查时发现
+                self._reload_changed()
+        finally:
+            self._watch_lock.release()
+        return self._data_version
+
+
+    def _reload_changed(self) -> None:
+        """数据库被其他实例或进程修改后，重新载入内存拼音表并增加数据版本"""
+        self._artifact_stale = True
+        if self.backend != "sqlite" and self._table is not None:
+            table = self._build_table()
+            with self._conn_lock:
+                self._table = table
+        self._data_version += 1
+
+
+    def __enter__(self) -> "DatabaseManager":
+        self.open()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
 
     def _get_width(self, s: str) -> int:
         """计算字符串的显示宽度，全宽字符计为2，半宽字符计为1"""
-        width = 0
-        for char in s:
-            # 全宽字符范围：
-            # - CJK统一汉字：\u4e00-\u9fff
-            # - 全角标点：\u3000-\u303f
-            # - 全角英数符号：\uff01-\uff5e
-            # - 全角平假名：\u3040-\u309f
-            # - 全角片假名：\u30a0-\u30ff（不包含半角片假名\uff61-\uff9f）
-            code = ord(char)
-            if 0x4e00 <= code <= 0x9fff or \
-            0x3000 <= code <= 0x303f or \
-            0x3040 <= code <= 0x309f or \
-            0x30a0 <= code <= 0x30ff or \
-            0xff01 <= code <= 0xff5e:
-                width += 2
-            else:
-                width += 1
-        return width
+        return display_width(s)
 
 
     def _report_result(self, result: dict) -> None:
@@ -123,9 +426,10 @@ class DatabaseManager:
                 self._report_result(result)
             return False
         try:
-            self.db = Database(self.db_path)
-            self.db.insert_entry(yinjie, tone, hiragana)
-            self.db.close()
+            db = self._connect(write=True)
+            db.insert_entry(yinjie, tone, hiragana)
+            db.close()
+            self._invalidate_table()
             if report:
                 result = {"操作": "增加拼音数据",
                         "结果": True,
@@ -152,7 +456,23 @@ class DatabaseManager:
         Returns:
             对应的平假名拟音（含音声记号）
         """
-        if any(t not in "012345*" for t in tone) or tone[1] == "0":
+        return self.search_by_pinyin_batch([yinjie], tone, report)
+
+
+    def search_by_pinyin_batch(self, yinjie_list: Sequence[str], tone: str = "***", report: bool = True) -> List[Tuple[str, str, str]]:
+        """在拼音数据库中查找多个音节对应的平假名拟音
+
+        通配符被编译为一条SQL语句中的GLOB模式，而不是逐一查询每种声调。
+
+        Args:
+            yinjie_list: 音节列表
+            tone: 前一字、本字、后一字的声调（通配符*）
+            report: 是否打印操作结果
+
+        Returns:
+            对应的平假名拟音（含音声记号），按音节在 `yinjie_list` 中的顺序和声调排序
+        """
+        if not _valid_tone_pattern(tone):
             if report:
                 result = {"操作": "查询拼音数据",
                         "结果": False,
@@ -160,20 +480,9 @@ class DatabaseManager:
                 self._report_result(result)
             return []
         try:
-            self.db = Database(self.db_path)
-            record = []
-            if tone == "***":
-                record += self.db.query_by_yinjie(yinjie)
-            else:
-                first_digits = "012345" if tone[0] == "*" else [tone[0]]
-                second_digits = "12345" if tone[1] == "*" else [tone[1]]
-                third_digits = "012345" if tone[2] == "*" else [tone[2]]
-
-                for d1 in first_digits:
-                    for d2 in second_digits:
-                        for d3 in third_digits:
-                            record += self.db.query_by_pinyin(yinjie, f"{d1}{d2}{d3}")
-            self.db.close()
+            db = self._connect()
+            record = db.query_by_pattern(yinjie_list, _tone_glob(tone))
+            db.close()
             if report:
                 result = {"操作": "查询拼音数据",
                         "结果": True,
@@ -204,16 +513,68 @@ class DatabaseManager:
         """
         if not serial:
             return []
+        self.check_changes()
+        profiler = active_profiler()
+        if profiler is not None:
+            start = perf_counter()
+        hiragana_list = self._serial_search(serial, default)
+        if profiler is not None:
+            misses = _count_misses([yinjie for yinjie, _ in serial],
+                                   [tone[1:2] != "0" for _, tone in serial],
+                                   hiragana_list, default)
+            profiler.lap("serial_search", start, len(serial), misses)
+        return hiragana_list
+
+
+    def _serial_search(self, serial: List[Tuple[str, str]], default: str) -> List[str]:
+        """拼音序列搜索（不统计耗时）"""
         # 查询序列
-        self.db = Database(self.db_path)
-        hiragana_list = self.db.query_batch(serial, default)
-        self.db.close()
+        if self.backend != "sqlite":
+            return self._load_table().query_batch(serial, default)
+        reader = self._reader()
+        if reader is not None:
+            hiragana_list = reader.query_batch(serial, default)
+        else:
+            db = self._connect()
+            hiragana_list = db.query_batch(serial, default)
+            db.close()
         # 检查长度
         if len(serial) != len(hiragana_list):
             raise ValueError("序列查询与结果不匹配。")
         return hiragana_list
 
 
+    def serial_search_codes(self, syllables: Sequence[str], codes: Sequence[Optional[int]], default: str = "") -> List[str]:
+        """拼音序列搜索（整数编码）
+
+        与 `serial_search` 相同，但声调以 `codec` 中的整数编码给出，
+        sqlite以外的后端可以直接按编码查询而无需构造声调字符串。
+
+        Args:
+            syllables: 音节序列
+            codes: 与音节一一对应的声调编码，None表示声调无效
+            default: 若搜索无结果的返回值
+
+        Returns:
+            转换结果
+        """
+        if len(syllables) != len(codes):
+            raise ValueError("音节序列与声调序列长度不一致。")
+        if self.backend != "sqlite":
+            self.check_changes()
+            profiler = active_profiler()
+            if profiler is None:
+                return self._load_table().query_codes(syllables, codes, default)
+            start = perf_counter()
+            hiragana_list = self._load_table().query_codes(syllables, codes, default)
+            misses = _count_misses(syllables, [code is None or code // 6 % 6 != 0 for code in codes],
+                                   hiragana_list, default)
+            profiler.lap("serial_search", start, len(syllables), misses)
+            return hiragana_list
+        serial = [(yinjie, decode_tone(code) if code is not None else "") for yinjie, code in zip(syllables, codes)]
+        return self.serial_search(serial, default)
+
+
     def delete_pinyin(self, yinjie: str, tone: str, report: bool = True) -> bool:
         """删除拼音数据
         
@@ -225,7 +586,23 @@ class DatabaseManager:
         Returns:
             操作是否成功
             """
-        if len(tone) != 3 or any(t not in "012345*" for t in tone) or tone[1] == "0":
+        return self.delete_pinyin_batch([yinjie], tone, report)
+
+
+    def delete_pinyin_batch(self, yinjie_list: Sequence[str], tone: str, report: bool = True) -> bool:
+        """删除多个音节的拼音数据
+
+        通配符被编译为GLOB模式，查询和删除在同一个事务中完成，只提交一次。
+
+        Args:
+            yinjie_list: 音节列表
+            tone: 前一字、本字、后一字的声调（通配符*）
+            report: 是否打印操作结果
+
+        Returns:
+            操作是否成功
+        """
+        if not _valid_tone_pattern(tone):
             if report:
                 result = {"操作": "删除拼音数据",
                         "结果": False,
@@ -233,22 +610,12 @@ class DatabaseManager:
                 self._report_result(result)
             return False
         try:
-            self.db = Database(self.db_path)
-            record = []
-            if tone == "***":
-                record += self.db.query_by_yinjie(yinjie)
-                self.db.delete_by_yinjie(yinjie)
-            else:
-                first_digits = "012345" if tone[0] == "*" else [tone[0]]
-                second_digits = "12345" if tone[1] == "*" else [tone[1]]
-                third_digits = "012345" if tone[2] == "*" else [tone[2]]
-
-                for d1 in first_digits:
-                    for d2 in second_digits:
-                        for d3 in third_digits:
-                            record += self.db.query_by_pinyin(yinjie, f"{d1}{d2}{d3}")
-                            self.db.delete_by_pinyin(yinjie, f"{d1}{d2}{d3}")
-            self.db.close()
+            db = self._connect(write=True)
+            try:
+                record = db.delete_by_pattern(yinjie_list, _tone_glob(tone))
+            finally:
+                db.close()
+            self._invalidate_table()
             if report:
                 result = {"操作": "删除拼音数据",
                         "结果": True,
@@ -257,13 +624,158 @@ class DatabaseManager:
             return True
         except Exception as e:
             if report:
-                result = {"操作": "查询拼音数据",
+                result = {"操作": "删除拼音数据",
+                        "结果": False,
+                        "信息": [f"发生错误：{e}"]}
+                self._report_result(result)
+            return False
+
+
+    def session(self, report: bool = True) -> "EditSession":
+        """
+        开始一个批量编辑会话，参见 `EditSession`
+
+        Args:
+            report: 会话结束时是否打印操作结果（只输出一次汇总）
+
+        Usage:
+
+          >>> with dm.session() as s:
+          ...     s.add("giao", "040", "ぎゃ'お")
+          ...     s.delete("giao", "1**")
+        """
+        return EditSession(self, report)
+
+
+    def migrate(self, report: bool = True) -> bool:
+        """将数据库迁移到最新的数据表结构，并整理数据库文件
+
+        旧版本的数据库在首次写入时也会被自动迁移，但不会整理文件。
+
+        Args:
+            report: 是否打印操作结果
+
+        Returns:
+            操作是否成功
+        """
+        try:
+            version = 0
+            if self.db_path.exists():
+                db = Database(self.db_path, read_only=True)
+                version = db.schema_version()
+                db.close()
+            db = self._connect(write=True)
+            try:
+                db.cursor.execute("VACUUM")
+            finally:
+                db.close()
+            self._invalidate_table()
+            if report:
+                result = {"操作": "迁移拼音数据库",
+                        "结果": True,
+                        "信息": [f"数据表结构版本：{version} -> {SCHEMA_VERSION}"]}
+                self._report_result(result)
+            return True
+        except Exception as e:
+            if report:
+                result = {"操作": "迁移拼音数据库",
+                        "结果": False,
+                        "信息": [f"发生错误：{e}"]}
+                self._report_result(result)
+            return False
+
+
+    def compact(self, file_path: str, report: bool = True) -> bool:
+        """将数据库压缩为只含覆盖数据的新数据库，供rule后端使用
+
+        新数据库只保存与全局规则生成结果不同的条目；规则能够生成而本数据库中没有的条目，
+        以平假名为空字符串的删除标记保存。使用rule后端查询新数据库，结果与查询本数据库相同。
+
+        Args:
+            file_path: 新数据库的路径（不能是已存在的文件）
+            report: 是否打印操作结果
+
+        Returns:
+            操作是否成功
+        """
+        filepath = Path(file_path)
+        try:
+            if filepath.exists():
+                raise ValueError(f"文件{filepath}已存在！")
+            db = self._connect()
+            data = db.query_all()
+            db.close()
+            overrides = rule_overrides(data)
+            db = Database(filepath)
+            db.insert_batch(overrides)
+            db.close()
+            if report:
+                result = {"操作": "压缩拼音数据库",
+                        "结果": True,
+                        "信息": [f"成功压缩到{filepath}。原有{len(data)}条，保留{len(overrides)}条覆盖数据。"]}
+                self._report_result(result)
+            return True
+        except Exception as e:
+            if report:
+                result = {"操作": "压缩拼音数据库",
+                        "结果": False,
+                        "信息": [f"发生错误：{e}"]}
+                self._report_result(result)
+            return False
+
+
+    def build_artifact(self, file_path: Optional[str] = None, report: bool = True) -> bool:
+        """将数据库编译为二进制拼音表，供mmap后端使用
+
+        二进制拼音表由字符串池、偏移数组和音节的最小完美哈希组成，(音节, 声调)先由完美哈希得到音节的槽位，
+        再以声调编码为下标直接得到平假名的偏移。文件通过mmap映射后即可查询，多个进程可以共享同一份页面。
+
+        Args:
+            file_path: 输出文件路径，默认为 `artifact_path`
+            report: 是否打印操作结果
+
+        Returns:
+            操作是否成功
+        """
+        filepath = self.artifact_path if file_path is None else Path(file_path)
+        try:
+            count = self._build_artifact(filepath)
+            if report:
+                result = {"操作": "编译二进制拼音表",
+                        "结果": True,
+                        "信息": [f"成功编译到{filepath}，共{count}条。"]}
+                self._report_result(result)
+            return True
+        except Exception as e:
+            if report:
+                result = {"操作": "编译二进制拼音表",
                         "结果": False,
                         "信息": [f"发生错误：{e}"]}
                 self._report_result(result)
             return False
 
 
+    def _build_artifact(self, filepath: Path) -> int:
+        """编译二进制拼音表，返回条目数"""
+        db = self._connect()
+        try:
+            data = db.query_all()
+        finally:
+            db.close()
+        if filepath == self.artifact_path:
+            table = self._table
+            if os.name == "nt" and isinstance(table, ArtifactTable):
+                # Windows无法替换仍被映射的文件，先释放旧的映射（其他平台上旧映射在替换后仍然有效）
+                self._table = None
+                table.close()
+            if filepath.parent == artifact_cache_dir():
+                filepath.parent.mkdir(parents=True, exist_ok=True)
+        count = build_artifact(data, filepath)
+        if filepath == self.artifact_path:
+            self._artifact_stale = False
+        return count
+
+
     def export_to_csv(self, file_path: Optional[str] = None, report: bool = True) -> bool:
         """导出数据到csv文件
             
@@ -285,9 +797,9 @@ class DatabaseManager:
             # 添加表头
             rows = [("拼音", "声调", "平假名")]
             # 获取所有数据
-            self.db = Database(self.db_path)
-            data = self.db.query_all()
-            self.db.close()
+            db = self._connect()
+            data = db.query_all()
+            db.close()
             # 填充数据
             rows += data
             # 保存文件
@@ -378,9 +890,10 @@ class DatabaseManager:
             
             # 插入有效数据
             if valid_entries:
-                self.db = Database(self.db_path)
-                self.db.insert_batch(valid_entries)
-                self.db.close()
+                db = self._connect(write=True)
+                db.insert_batch(valid_entries)
+                db.close()
+                self._invalidate_table()
 
             errors.append(f"导入完成。成功: {len(valid_entries)}, 失败: {len(errors)}")
             if report:
@@ -425,6 +938,7 @@ class DatabaseManager:
             if filepath.suffix.lower() != ".xlsx":
                 filepath.with_suffix(".xlsx")
             # 创建工作簿和工作表
+            import openpyxl
             workbook = openpyxl.Workbook()
             worksheet = workbook.active
             if not worksheet:
@@ -436,9 +950,9 @@ class DatabaseManager:
             worksheet["B1"] = "声调"
             worksheet["C1"] = "平假名"
             # 获取所有数据
-            self.db = Database(self.db_path)
-            data = self.db.query_all()
-            self.db.close()
+            db = self._connect()
+            data = db.query_all()
+            db.close()
             # 填充数据
             for row_idx, row_data in enumerate(data, 2):
                 pinyin, tone, hiragana = row_data
@@ -493,6 +1007,7 @@ class DatabaseManager:
                     self._report_result(result)
                 return False
             # 打开工作簿
+            import openpyxl
             workbook = openpyxl.load_workbook(filepath)
             worksheet = workbook.active
             if not worksheet:
@@ -541,9 +1056,10 @@ class DatabaseManager:
             
             # 插入有效数据
             if valid_entries:
-                self.db = Database(self.db_path)
-                self.db.insert_batch(valid_entries)
-                self.db.close()
+                db = self._connect(write=True)
+                db.insert_batch(valid_entries)
+                db.close()
+                self._invalidate_table()
 
             errors.append(f"导入完成。成功: {len(valid_entries)}, 失败: {len(errors)}")
             if report:
@@ -559,4 +1075,134 @@ class DatabaseManager:
                         "结果": False,
                         "信息": [f"发生错误：{e}"]}
                 self._report_result(result)
-            return False
\ No newline at end of file
+            return False
+
+
+class EditSession:
+    """
+    批量编辑会话
+
+    会话中的增加、修改和删除都在同一个连接、同一个事务中进行，退出with块时只提交一次；
+    with块中发生错误（包括声调格式错误）时回滚全部修改，并继续抛出该错误。
+    会话结束时只输出一次汇总，而不是每条数据各输出一次。
+    """
+
+    def __init__(self, manager: DatabaseManager, report: bool = True) -> None:
+        self.manager = manager
+        self.report = report
+        self.added = 0
+        self.updated = 0
+        self.deleted = 0
+        self._db: Optional[Database] = None
+        self._transaction: Optional[ContextManager[Database]] = None
+
+
+    def __enter__(self) -> "EditSession":
+        self._db = self.manager._connect(write=True)
+        self._transaction = self._db.transaction()
+        self._transaction.__enter__()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        db, transaction = self._db, self._transaction
+        if db is None or transaction is None:
+            return
+        self._db = self._transaction = None
+        try:
+            transaction.__exit__(exc_type, exc_value, traceback)
+        finally:
+            db.close()
+        if exc_type is None:
+            self.manager._invalidate_table()
+        if self.report:
+            if exc_type is None:
+                result = {"操作": "批量编辑拼音数据",
+                          "结果": True,
+                          "信息": [f"增加{self.added}条，修改{self.updated}条，删除{self.deleted}条。"]}
+            else:
+                result = {"操作": "批量编辑拼音数据",
+                          "结果": False,
+                          "信息": [f"发生错误：{exc_value}", "已回滚全部修改。"]}
+            self.manager._report_result(result)
+
+
+    def _database(self) -> Database:
+        if self._db is None:
+            raise ValueError("编辑会话尚未开始或已经结束，请在with块中使用。")
+        return self._db
+
+
+    def add(self, yinjie: str, tone: str, hiragana: str) -> None:
+        """增加或修改一条拼音数据，参见 `DatabaseManager.add_pinyin`"""
+        self.add_batch([(yinjie, tone, hiragana)])
+
+
+    def add_batch(self, entries: Sequence[Tuple[str, str, str]]) -> None:
+        """增加或修改多条拼音数据"""
+        for _, tone, _ in entries:
+            if len(tone) != 3 or any(t not in "012345" for t in tone) or tone[1] == "0":
+                raise ValueError(f"声调 {tone} 格式错误！")
+        self._database().insert_batch(list(entries))
+        self.added += len(entries)
+
+
+    def update(self, yinjie: str, tone: str, hiragana: str) -> bool:
+        """修改已有的拼音数据，返回是否存在该数据"""
+        updated = self._database().update_entry(yinjie, tone, hiragana)
+        if updated:
+            self.updated += 1
+        return updated
+
+
+    def delete(self, yinjie: str, tone: str = "***") -> List[Tuple[str, str, str]]:
+        """删除拼音数据，参见 `DatabaseManager.delete_pinyin`，返回被删除的数据"""
+        return self.delete_batch([yinjie], tone)
+
+
+    def delete_batch(self, yinjie_list: Sequence[str], tone: str = "***") -> List[Tuple[str, str, str]]:
+        """删除多个音节的拼音数据，返回被删除的数据"""
+        if not _valid_tone_pattern(tone):
+            raise ValueError(f"声调 {tone} 格式错误！")
+        rows = self._database().delete_by_pattern(yinjie_list, _tone_glob(tone))
+        self.deleted += len(rows)
+        return rows
+
+
+def artifact_cache_dir() -> Path:
+    """
+    内置数据库的二进制拼音表所在的用户缓存目录
+
+    可以通过环境变量 `YUKKURIMANDARIN_CACHE_DIR` 指定，默认为各平台的用户缓存目录下的 `yukkurimandarin`。
+    """
+    override = os.environ.get("YUKKURIMANDARIN_CACHE_DIR")
+    if override:
+        return Path(override)
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = str(Path.home() / "Library" / "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "yukkurimandarin"
+
+
+def _valid_tone_pattern(tone: str) -> bool:
+    """声调是否为3位、只含0-5和通配符*，且本字的声调不为0"""
+    return len(tone) == 3 and all(t in "012345*" for t in tone) and tone[1] != "0"
+
+
+def _tone_glob(tone: str) -> Optional[str]:
+    """将含通配符*的声调转换为GLOB模式，全通配时返回None（不限制声调）"""
+    if not _valid_tone_pattern(tone):
+        raise ValueError(f"声调 {tone} 格式错误！")
+    if tone == "***":
+        return None
+    return "".join(("[12345]" if i == 1 else "[012345]") if t == "*" else t for i, t in enumerate(tone))
+
+
+def _count_misses(syllables: Sequence[str], lookups: Sequence[bool], results: Sequence[str], default: str) -> int:
+    """统计拼音表未命中的音节数。`lookups` 为False的条目（分隔点、标点等声调为0的条目）不计入"""
+    keep = default == "keep"
+    return sum(1 for yinjie, lookup, result in zip(syllables, lookups, results)
+               if lookup and result == (yinjie if keep else default))
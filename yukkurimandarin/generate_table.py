@@ -1,18 +1,15 @@
 # 基于全局规则生成假名音声。
 # 用于快速构建数据库。
 
+from importlib.util import find_spec
 from pathlib import Path
 import csv
 from typing import List, Optional
 
 from yukkurimandarin.generate_gana import generate_hiragana, YINJIE
 
-# 可选组件
-try:
-    import openpyxl
-    _HAS_OPENPYXL = True
-except ImportError:
-    _HAS_OPENPYXL = False
+# 可选组件（首次使用时才导入）
+_HAS_OPENPYXL = find_spec("openpyxl") is not None
 
 
 def fill_xlsx(file_path: Optional[str] = None) -> None:
@@ -31,6 +28,7 @@ def fill_xlsx(file_path: Optional[str] = None) -> None:
         if not filepath.is_absolute():
             filepath = Path.cwd() / filepath
         # 加载活动工作簿
+        import openpyxl
         workbook = openpyxl.Workbook()
         sheet = workbook.active 
         if not sheet:
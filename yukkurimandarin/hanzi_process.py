@@ -1,25 +1,34 @@
 # 处理汉字片段。
 
 import logging
-from typing import List, Tuple, Optional
-from pypinyin import pinyin, Style
+import threading
+from importlib.util import find_spec
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+from yukkurimandarin.cache import CacheInfo, LRUCache
+from yukkurimandarin.codec import TONE_VALUE, tone_code
 from yukkurimandarin.database_mngr import DatabaseManager
+from yukkurimandarin.profiling import active_profiler
+from yukkurimandarin.sandhi import CHAR_RULES, INVALID, apply_sandhi, tone_array
 
-# 可选组件
-try:
+# 可选组件（首次使用时才导入）
+if TYPE_CHECKING:
     import jieba
-    from jieba import Tokenizer
 
-    jieba.setLogLevel(logging.WARNING)
-    
-    _HAS_JIEBA = True
-    _DEFAULT_TOKENIZER = Tokenizer()
-except ImportError:
-    _HAS_JIEBA = False
+_HAS_JIEBA = find_spec("jieba") is not None
+_DEFAULT_TOKENIZER: Optional["jieba.Tokenizer"] = None
+_DEFAULT_TOKENIZER_LOCK = threading.Lock()
+
+# 词语 -> TONE3拼音的缓存。pypinyin对传入列表中的每个词语分别注音，结果只取决于词语本身
+WORD_CACHE_SIZE = 65536
+_WORD_CACHE = LRUCache(WORD_CACHE_SIZE)
 
 
-def hanzi_process(fragments: List[str], tokenizer: Optional["jieba.Tokenizer"], db_mngr: Optional[DatabaseManager]) -> List[str]:
+def hanzi_process(fragments: List[str],
+                  tokenizer: Optional["jieba.Tokenizer"],
+                  db_mngr: Optional[DatabaseManager],
+                  cache: Optional[LRUCache] = None) -> List[str]:
     """
     处理汉字片段
 
@@ -27,12 +36,41 @@ def hanzi_process(fragments: List[str], tokenizer: Optional["jieba.Tokenizer"],
         fragments: 汉字片段
         tokenizer: jieba分词器
         db_mngr: 拼音数据库管理类
+        cache: 片段缓存。各片段之间以分隔点隔开，转换结果只取决于片段本身、分词器和数据库，
+            因此以(分词器, 数据库, 片段)为键缓存结果是精确的
 
     Returns:
         处理结果
     """
     if not fragments:
         return []
+    profiler = active_profiler()
+    if profiler is not None:
+        start = perf_counter()
+    if cache is None:
+        result = _convert_fragments(fragments, tokenizer, db_mngr)
+        if profiler is not None:
+            profiler.lap("hanzi_process", start, len(fragments), len(fragments))
+        return result
+    # 查询缓存
+    owner = (id(tokenizer), id(db_mngr))
+    found: Dict[str, Optional[str]] = {f: cache.get((owner, f)) for f in dict.fromkeys(fragments)}
+    missing = [f for f, r in found.items() if r is None]
+    # 转换未命中的片段并写入缓存
+    if missing:
+        for f, r in zip(missing, _convert_fragments(missing, tokenizer, db_mngr)):
+            cache.put((owner, f), r)
+            found[f] = r
+    if profiler is not None:
+        profiler.lap("hanzi_process", start, len(fragments), len(missing))
+    return [found[f] for f in fragments] # type: ignore[misc]
+
+
+def _convert_fragments(fragments: List[str], tokenizer: Optional["jieba.Tokenizer"], db_mngr: Optional[DatabaseManager]) -> List[str]:
+    """处理汉字片段（不使用缓存）"""
+    profiler = active_profiler()
+    if profiler is not None:
+        clock = perf_counter()
     # 标记片段的分隔点：音节为斜杠，声调为0
     mark = "/0"
     marked_frag = [mark]
@@ -41,34 +79,38 @@ def hanzi_process(fragments: List[str], tokenizer: Optional["jieba.Tokenizer"],
         marked_frag.append(mark)
     # 分词
     marked_frag = tokenize(marked_frag, tokenizer=tokenizer, mark=mark)
+    if profiler is not None:
+        clock = profiler.lap("tokenize", clock, len(fragments))
     # 拼音化
-    pinyin_list = pinyin(marked_frag, style=Style.TONE3, neutral_tone_with_five=True)
-    # 展开片段列表
-    marked_frag = extend_marked_frag(marked_frag, mark)
-    # 检查长度是否一致
-    if len(pinyin_list) != len(marked_frag):
-        raise ValueError(f"处理结果出错：展开后的片段长度({len(marked_frag)})与拼音列表长度({len(pinyin_list)})不相等！")
-    #print("marked_frag: ", marked_frag)
-    # 处理连续上声
-    modify_consecutive_threes(pinyin_list)
-    # 处理“不”字变调
-    modify_bu_tone(pinyin_list, marked_frag)
-    #print("pinyin_list: ", pinyin_list)
-    # 构造拼音序列
-    serial: List[Tuple[str, str]] = []
-    for i in range(1, len(pinyin_list)-1):
-        serial.append((pinyin_list[i][0][:-1], f"{pinyin_list[i-1][0][-1]}{pinyin_list[i][0][-1]}{pinyin_list[i+1][0][-1]}"))
-    #print("serial: ", serial)
+    pinyin_list, word_misses = _cached_pinyin(marked_frag)
+    if profiler is not None:
+        clock = profiler.lap("pypinyin", clock, len(marked_frag), word_misses)
+    # 变调：连续上声以及“不”“一”的变调一次完成
+    syllables = [p[0][:-1] for p in pinyin_list]
+    tones = tone_array(pinyin_list)
+    apply_sandhi(tones, syllables, marked_frag, mark)
+    if profiler is not None:
+        profiler.lap("sandhi", clock, len(pinyin_list))
+    # 构造拼音序列：音节与声调编码
+    codes: List[Optional[int]] = []
+    for i in range(1, len(tones)-1):
+        last_tone, this_tone, next_tone = tones[i-1], tones[i], tones[i+1]
+        if last_tone == INVALID or this_tone == INVALID or next_tone == INVALID:
+            codes.append(None)
+        else:
+            codes.append(tone_code(last_tone, this_tone, next_tone))
+    syllables = syllables[1:-1]
+    #print("serial: ", syllables, codes)
     # 查询假名拟音
     if db_mngr is None:
         db_mngr = DatabaseManager()
-    hiragana_list = db_mngr.serial_search(serial, "")
+    hiragana_list = db_mngr.serial_search_codes(syllables, codes, "")
     # 还原fragments结构
     result = []
     frag = []
-    for i, entry in enumerate(serial):
+    for i, yinjie in enumerate(syllables):
         # 当字是片段的结束时
-        if entry[0] == "/" and entry[1][1] == "0":
+        if yinjie == "/" and tones[i+1] == 0:
             result.append("".join(frag))
             frag.clear()
         else:
@@ -81,6 +123,67 @@ def hanzi_process(fragments: List[str], tokenizer: Optional["jieba.Tokenizer"],
     return result
 
 
+def default_tokenizer() -> Optional["jieba.Tokenizer"]:
+    """获取默认jieba分词器。未安装jieba时返回None"""
+    global _DEFAULT_TOKENIZER
+    if not _HAS_JIEBA:
+        return None
+    # 首次调用时导入jieba并创建分词器（词典在首次分词时才载入）
+    if _DEFAULT_TOKENIZER is None:
+        with _DEFAULT_TOKENIZER_LOCK:
+            if _DEFAULT_TOKENIZER is None:
+                import jieba
+                jieba.setLogLevel(logging.WARNING)
+                _DEFAULT_TOKENIZER = jieba.Tokenizer()
+    return _DEFAULT_TOKENIZER
+
+
+def to_pinyin(words: List[str]) -> List[List[str]]:
+    """
+    将词语列表转换为TONE3风格的拼音（轻声为5），结果与 `pypinyin.pinyin` 相同
+
+    已经转换过的词语直接从缓存中取得，只有未命中的词语才会交给pypinyin（在首次调用时才导入）。
+    """
+    return _cached_pinyin(words)[0]
+
+
+def _cached_pinyin(words: List[str]) -> Tuple[List[List[str]], int]:
+    """带缓存的拼音化，同时返回未命中的词语数"""
+    if _WORD_CACHE.maxsize == 0:
+        from pypinyin import pinyin, Style
+        return pinyin(words, style=Style.TONE3, neutral_tone_with_five=True), len(words)
+    found: Dict[str, Optional[Tuple[str, ...]]] = {w: _WORD_CACHE.get(w) for w in dict.fromkeys(words)}
+    missing = [w for w, r in found.items() if r is None]
+    if missing:
+        from pypinyin import pinyin, Style
+        for word in missing:
+            # 逐词注音，以便按词写入缓存
+            syllables = tuple(p[0] for p in pinyin([word], style=Style.TONE3, neutral_tone_with_five=True))
+            _WORD_CACHE.put(word, syllables)
+            found[word] = syllables
+    # 每次都构造新的列表，后续的变调处理会原地修改
+    return [[syllable] for w in words for syllable in found[w]], len(missing) # type: ignore[union-attr]
+
+
+def word_cache_info() -> CacheInfo:
+    """词语拼音缓存的命中统计"""
+    return _WORD_CACHE.cache_info()
+
+
+def clear_word_cache(maxsize: Optional[int] = None) -> None:
+    """
+    清空词语拼音缓存。修改pypinyin的自定义词典后应调用此方法
+
+    Args:
+        maxsize: 新的缓存容量，None表示不变，0表示不缓存
+    """
+    global _WORD_CACHE
+    if maxsize is None:
+        _WORD_CACHE.clear()
+    else:
+        _WORD_CACHE = LRUCache(maxsize)
+
+
 def tokenize(fragments: List[str], tokenizer: Optional["jieba.Tokenizer"], mark: str = "/0") -> List[str]:
     """使用jieba对片段列表进行分词
     
@@ -95,7 +198,7 @@ def tokenize(fragments: List[str], tokenizer: Optional["jieba.Tokenizer"], mark:
     if not _HAS_JIEBA:
         return fragments
     if tokenizer is None:
-        tokenizer = _DEFAULT_TOKENIZER
+        tokenizer = default_tokenizer()
     # 遍历列表中的每个句子，对每个句子进行分词
     result: List[str] = []
     for fragment in fragments:
@@ -123,29 +226,17 @@ def modify_consecutive_threes(pinyin_list: List[List[str]]) -> None:
     """
     处理连续上声的变调。采用简化的两字组和三字组组合模式。
     - 此函数直接修改传入的列表
+    - 转换流程中使用 `sandhi.apply_sandhi` 一次完成全部变调，此函数仅处理连续上声
     """
     if len(pinyin_list) < 2:
         return
-    # 遍历的索引
-    i = 0
-    # 首个两字组：0；三字组：1；两字组：2。
-    flag = 0
-    for i in range(len(pinyin_list) - 1):
-        if pinyin_list[i][0][-1] == "3" and pinyin_list[i+1][0][-1] == "3":
-            if flag == 0:
-                flag = 1
-            elif flag == 1:
-                flag = 2
-            elif flag == 2:
-                pinyin_list[i-1][0] = f"{pinyin_list[i-1][0][:-1]}3"
-                flag = 1
-            else:
-                raise ValueError(f"flag不正确：{flag}")
-            pinyin_list[i][0] = f"{pinyin_list[i][0][:-1]}2"
-        else:
-            if flag != 0:
-                flag = 0
-    return
+    tones = tone_array(pinyin_list)
+    apply_sandhi(tones, [p[0][:-1] for p in pinyin_list], ["/0"] * len(tones), rules=None)
+    _write_tones(pinyin_list, tones)
+
+
+# 仅包含“不”的规则表
+_BU_RULES = {"不": CHAR_RULES["不"]}
 
 
 def modify_bu_tone(pinyin_list: List[List[str]], extended_marked_frag: List[str]) -> None:
@@ -153,15 +244,17 @@ def modify_bu_tone(pinyin_list: List[List[str]], extended_marked_frag: List[str]
     处理汉字“不”的变调。
     - 此函数直接修改传入的列表
     - `extended_marked_frag` 为只读参数，展开后的片段列表
+    - 转换流程中使用 `sandhi.apply_sandhi` 一次完成全部变调，此函数仅处理“不”
     """
     if len(pinyin_list) < 2:
         return
-    # 遍历的索引
-    i = 0
-    for i in range(len(pinyin_list)-1):
-        if (extended_marked_frag[i] == "不" 
-            and extended_marked_frag[i+1] != "不"
-            and pinyin_list[i][0] == "bu4"
-            and pinyin_list[i+1][0][-1] == "4"):
-            pinyin_list[i][0] = "bu2"
-    return
+    tones = tone_array(pinyin_list)
+    apply_sandhi(tones, [p[0][:-1] for p in pinyin_list], extended_marked_frag, rules=_BU_RULES, threes=False)
+    _write_tones(pinyin_list, tones)
+
+
+def _write_tones(pinyin_list: List[List[str]], tones: bytearray) -> None:
+    """将改变了的声调写回拼音列表"""
+    for p, tone in zip(pinyin_list, tones):
+        if tone != INVALID and TONE_VALUE.get(p[0][-1]) != tone:
+            p[0] = f"{p[0][:-1]}{tone}"
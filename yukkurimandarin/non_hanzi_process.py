@@ -1,9 +1,8 @@
 # 处理非汉字片段。
 
-from typing import List, Union, Callable, Optional
-import string
-import unicodedata
+from typing import Dict, List, Union, Callable, Optional
 
+from yukkurimandarin.charclass import CLASS_MASK, CLASS_NAMES, char_class, class_runs
 from yukkurimandarin.settings import NonHanziModes
 
 
@@ -21,32 +20,23 @@ def non_hanzi_process(fragments: List[str], config: Optional[NonHanziModes] = No
     if not fragments:
         return []
     if config is None: # 如果用户未定义处理模式设置，使用默认设置模式
-        config = NonHanziModes(pc_mode=clean_punctuation, ja_mode=normalize_gana)
+        config = default_config()
     result = []
     for fragment in fragments:
         if not fragment:
             result.append("")
             continue
-        processed_fragment = []
-        char_basket = [fragment[0]]
-        basket_flag = classify(fragment[0])
-        for char in fragment[1:]:
-            current_flag = classify(char)
-            if current_flag == basket_flag:
-                char_basket.append(char)
-            else:
-                processed_fragment.append(convertor_handler("".join(char_basket),
-                                                            basket_flag,                                                             
-                                                            config))
-                char_basket = [char]
-                basket_flag = current_flag
-        processed_fragment.append(convertor_handler("".join(char_basket),
-                                                    basket_flag,                                                             
-                                                    config))
+        # 按字符种类切分为连续片段
+        processed_fragment = [convertor_handler(run, kind, config) for kind, run in class_runs(fragment)]
         result.append("".join(processed_fragment))
     return result
 
 
+def default_config() -> NonHanziModes:
+    """默认的非汉字处理模式：标点转换为停顿符号，假名统一为平假名"""
+    return NonHanziModes(pc_mode=clean_punctuation, ja_mode=normalize_gana)
+
+
 def classify(char: str) -> str:
     """
     对非汉字字符进行分类。
@@ -64,19 +54,7 @@ def classify(char: str) -> str:
     """
     if len(char) != 1:
         raise ValueError("输入必须是单个字符。")
-    code = ord(char)
-    if (0x3040 <= code <= 0x309F) or \
-        (0x30A0 <= code <= 0x30FF) or \
-        (0xFF65 <= code <= 0xFF9F):
-        return "gana"
-    if (0x0041 <= code <= 0x005A) or (0x0061 <= code <= 0x007A):
-        return "latin"
-    if char in string.punctuation:
-        return "punctuation"
-    category = unicodedata.category(char)
-    if category in {'Po', 'Pd', 'Ps', 'Pe', 'Pi', 'Pf', 'Pc'}:
-        return "punctuation"
-    return "others"
+    return CLASS_NAMES[char_class(char) & CLASS_MASK]
 
 
 def mode_handler(char: str, mode: Union[str, Callable[[str], str]], replace: str = "") -> str:
@@ -181,45 +159,13 @@ def normalize_gana(fragment: str) -> str:
     """
     if not fragment:
         return ""
-    # 全角片假名
-    full_width_katakana = ["ア", "イ", "ウ", "エ", "オ", "カ", "キ", "ク", "ケ", "コ", 
-                           "サ", "シ", "ス", "セ", "ソ", "タ", "チ", "ツ", "テ", "ト",
-                           "ナ", "ニ", "ヌ", "ネ", "ノ", "ハ", "ヒ", "フ", "ヘ", "ホ", 
-                           "マ", "ミ", "ム", "メ", "モ", "ヤ", "ユ", "ヨ", "ラ", "リ", 
-                           "ル", "レ", "ロ", "ワ", "ヲ", "ン", "ガ", "ギ", "グ", "ゲ", 
-                           "ゴ", "ザ", "ジ", "ズ", "ゼ", "ゾ", "ダ", "ヂ", "ヅ", "デ", 
-                           "ド", "バ", "ビ", "ブ", "ベ", "ボ", "パ", "ピ", "プ", "ペ", 
-                           "ポ", "ー", "ァ", "ィ", "ゥ", "ェ", "ォ", "ャ", "ュ", "ョ", 
-                           "ッ", "ヴ","ヰ", "ヱ"]
-    # 半角片假名
-    half_width_katakana = ["ｱ", "ｲ", "ｳ", "ｴ", "ｵ", "ｶ", "ｷ", "ｸ", "ｹ", "ｺ", "ｻ", 
-                           "ｼ", "ｽ", "ｾ", "ｿ", "ﾀ", "ﾁ", "ﾂ", "ﾃ", "ﾄ", "ﾅ", "ﾆ", 
-                           "ﾇ", "ﾈ", "ﾉ", "ﾊ", "ﾋ", "ﾌ", "ﾍ", "ﾎ", "ﾏ", "ﾐ", "ﾑ", 
-                           "ﾒ", "ﾓ", "ﾔ", "ﾕ", "ﾖ", "ﾗ", "ﾘ", "ﾙ", "ﾚ", "ﾛ", "ﾜ", 
-                           "ｦ", "ﾝ", "ｶﾞ", "ｷﾞ", "ｸﾞ", "ｹﾞ", "ｺﾞ", "ｻﾞ", "ｼﾞ", "ｽﾞ", 
-                           "ｾﾞ", "ｿﾞ", "ﾀﾞ", "ﾁﾞ", "ﾂﾞ", "ﾃﾞ", "ﾄﾞ", "ﾊﾞ", "ﾋﾞ", "ﾌﾞ", 
-                           "ﾍﾞ", "ﾎﾞ", "ﾊﾟ", "ﾋﾟ", "ﾌﾟ", "ﾍﾟ", "ﾎﾟ", "ｰ", "ｧ", "ｨ", 
-                           "ｩ", "ｪ", "ｫ", "ｬ", "ｭ", "ｮ", "ｯ", "ｳﾞ"]
-    hiragana = ["あ", "い", "う", "え", "お", "か", "き", "く", "け", "こ", "さ", "し", 
-                "す", "せ", "そ", "た", "ち", "つ", "て", "と", "な", "に","ぬ", "ね", 
-                "の", "は", "ひ", "ふ", "へ", "ほ", "ま", "み", "む", "め", "も", "や",
-                "ゆ", "よ", "ら", "り", "る", "れ", "ろ", "わ", "を", "ん", "が", "ぎ", 
-                "ぐ", "げ", "ご", "ざ", "じ", "ず", "ぜ", "ぞ", "だ", "ぢ", "づ", "で", 
-                "ど", "ば", "び", "ぶ", "べ", "ぼ", "ぱ", "ぴ", "ぷ", "ぺ", "ぽ", "ー", 
-                "ぁ", "ぃ", "ぅ", "ぇ", "ぉ", "ゃ", "ゅ", "ょ", "っ", "ゔ", "ゐ", "ゑ"]
-    # 转换映射
-    conversion_map = {}
-    for k, h in zip(full_width_katakana, hiragana):
-        conversion_map[k] = h
-    for k, h in zip(half_width_katakana, hiragana):
-        conversion_map[k] = h
     result = []
     for i, char in enumerate(fragment):
         if char in "ﾟﾞ" and i > 0:
             char = f"{fragment[i-1]}{char}"
-            result[-1] = conversion_map.get(char, char)
+            result[-1] = _GANA_MAP.get(char, char)
         else:
-            result.append(conversion_map.get(char, char))
+            result.append(_GANA_MAP.get(char, char))
     return ''.join(result)
 
 
@@ -231,5 +177,39 @@ def others_convert(fragment: str, mode: Union[str, Callable[[str], str]], replac
     return mode_handler(fragment, mode, replace)
 
 
+# 全角片假名
+_FULL_WIDTH_KATAKANA = ["ア", "イ", "ウ", "エ", "オ", "カ", "キ", "ク", "ケ", "コ", 
+                        "サ", "シ", "ス", "セ", "ソ", "タ", "チ", "ツ", "テ", "ト",
+                        "ナ", "ニ", "ヌ", "ネ", "ノ", "ハ", "ヒ", "フ", "ヘ", "ホ", 
+                        "マ", "ミ", "ム", "メ", "モ", "ヤ", "ユ", "ヨ", "ラ", "リ", 
+                        "ル", "レ", "ロ", "ワ", "ヲ", "ン", "ガ", "ギ", "グ", "ゲ", 
+                        "ゴ", "ザ", "ジ", "ズ", "ゼ", "ゾ", "ダ", "ヂ", "ヅ", "デ", 
+                        "ド", "バ", "ビ", "ブ", "ベ", "ボ", "パ", "ピ", "プ", "ペ", 
+                        "ポ", "ー", "ァ", "ィ", "ゥ", "ェ", "ォ", "ャ", "ュ", "ョ", 
+                        "ッ", "ヴ","ヰ", "ヱ"]
+# 半角片假名
+_HALF_WIDTH_KATAKANA = ["ｱ", "ｲ", "ｳ", "ｴ", "ｵ", "ｶ", "ｷ", "ｸ", "ｹ", "ｺ", "ｻ", 
+                        "ｼ", "ｽ", "ｾ", "ｿ", "ﾀ", "ﾁ", "ﾂ", "ﾃ", "ﾄ", "ﾅ", "ﾆ", 
+                        "ﾇ", "ﾈ", "ﾉ", "ﾊ", "ﾋ", "ﾌ", "ﾍ", "ﾎ", "ﾏ", "ﾐ", "ﾑ", 
+                        "ﾒ", "ﾓ", "ﾔ", "ﾕ", "ﾖ", "ﾗ", "ﾘ", "ﾙ", "ﾚ", "ﾛ", "ﾜ", 
+                        "ｦ", "ﾝ", "ｶﾞ", "ｷﾞ", "ｸﾞ", "ｹﾞ", "ｺﾞ", "ｻﾞ", "ｼﾞ", "ｽﾞ", 
+                        "ｾﾞ", "ｿﾞ", "ﾀﾞ", "ﾁﾞ", "ﾂﾞ", "ﾃﾞ", "ﾄﾞ", "ﾊﾞ", "ﾋﾞ", "ﾌﾞ", 
+                        "ﾍﾞ", "ﾎﾞ", "ﾊﾟ", "ﾋﾟ", "ﾌﾟ", "ﾍﾟ", "ﾎﾟ", "ｰ", "ｧ", "ｨ", 
+                        "ｩ", "ｪ", "ｫ", "ｬ", "ｭ", "ｮ", "ｯ", "ｳﾞ"]
+_HIRAGANA = ["あ", "い", "う", "え", "お", "か", "き", "く", "け", "こ", "さ", "し", 
+             "す", "せ", "そ", "た", "ち", "つ", "て", "と", "な", "に","ぬ", "ね", 
+             "の", "は", "ひ", "ふ", "へ", "ほ", "ま", "み", "む", "め", "も", "や",
+             "ゆ", "よ", "ら", "り", "る", "れ", "ろ", "わ", "を", "ん", "が", "ぎ", 
+             "ぐ", "げ", "ご", "ざ", "じ", "ず", "ぜ", "ぞ", "だ", "ぢ", "づ", "で", 
+             "ど", "ば", "び", "ぶ", "べ", "ぼ", "ぱ", "ぴ", "ぷ", "ぺ", "ぽ", "ー", 
+             "ぁ", "ぃ", "ぅ", "ぇ", "ぉ", "ゃ", "ゅ", "ょ", "っ", "ゔ", "ゐ", "ゑ"]
+# 转换映射（模块加载时构建一次）
+_GANA_MAP: Dict[str, str] = {}
+for k, h in zip(_FULL_WIDTH_KATAKANA, _HIRAGANA):
+    _GANA_MAP[k] = h
+for k, h in zip(_HALF_WIDTH_KATAKANA, _HIRAGANA):
+    _GANA_MAP[k] = h
+
+
 # def more_func(fragment: str, mode: Union[str, Callable[[str], str]], replace: str) -> str:
 # TODO: 添加更多处理函数：比如英文读音等。
\ No newline at end of file
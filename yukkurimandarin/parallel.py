@@ -0,0 +1,122 @@
+# 多进程批量转换。
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional
+
+from yukkurimandarin.core import Converter
+from yukkurimandarin.database_mngr import DatabaseManager
+from yukkurimandarin.settings import NonHanziModes
+
+# 工作进程持有的转换器
+_WORKER_CONVERTER: Optional[Converter] = None
+
+
+def convert_parallel(sentences: Iterable[str],
+                     jobs: Optional[int] = None,
+                     chunksize: int = 256,
+                     without_accent: bool = False,
+                     db_path: Optional[str] = None,
+                     backend: str = "memory",
+                     non_hanzi_config: Optional[NonHanziModes] = None) -> List[str]:
+    """
+    使用多进程批量转换句子，适合处理整本书等大量文本
+
+    每个工作进程只在启动时初始化一次分词器和拼音表，之后按块调用 `Converter.text_many`。
+    同时提交的任务最多为工作进程数的2倍，输入按需读取，不会一次性全部分块并发送给工作进程。
+    结果按输入顺序返回，工作进程中的异常会在调用处重新抛出。
+
+    Args:
+        sentences: 输入的句子
+        jobs: 工作进程数，默认为CPU核心数
+        chunksize: 每个任务包含的句子数
+        without_accent: 是否去除音声记号
+        db_path: 拼音数据库路径，默认使用内置数据库
+        backend: 工作进程使用的查询后端，参见 `DatabaseManager`
+        non_hanzi_config: 非汉字处理模式（必须可以被pickle，不能使用lambda等匿名函数）
+
+    Returns:
+        与输入一一对应的转换结果
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> if __name__ == "__main__":
+      ...     results = ym.convert_parallel(lines, jobs=8)
+
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"参数jobs必须是正整数: {jobs}")
+    if chunksize < 1:
+        raise ValueError(f"参数chunksize必须是正整数: {chunksize}")
+    init_args = (without_accent, db_path, backend, non_hanzi_config)
+    # 单进程时直接在当前进程转换
+    if jobs == 1:
+        with _make_converter(*init_args) as converter:
+            return [result for chunk in _chunked(sentences, chunksize) for result in converter.text_many(chunk)]
+    results: List[str] = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=init_args) as executor:
+        for chunk_result in _bounded_map(executor, _convert_chunk, _chunked(sentences, chunksize), 2 * jobs):
+            results.extend(chunk_result)
+    return results
+
+
+def _bounded_map(executor: Executor,
+                 func: Callable[[Any], Any],
+                 items: Iterable[Any],
+                 window: int) -> Iterator[Any]:
+    """
+    与 `executor.map` 相同，但同时最多提交 `window` 个任务，按提交顺序逐个返回结果
+
+    取出最早的结果后才读取并提交下一项，出错时取消尚未开始的任务。
+    """
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _chunked(sentences: Iterable[str], chunksize: int) -> Iterator[List[str]]:
+    """将输入按 `chunksize` 分块"""
+    iterator = iter(sentences)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _make_converter(without_accent: bool,
+                    db_path: Optional[str],
+                    backend: str,
+                    non_hanzi_config: Optional[NonHanziModes]) -> Converter:
+    """创建转换器，并预先载入分词词典和拼音表"""
+    converter = Converter(without_accent=without_accent,
+                          pinyin_database=DatabaseManager(db_path, backend=backend),
+                          non_hanzi_config=non_hanzi_config)
+    converter.warmup(background=False)
+    return converter
+
+
+def _init_worker(*args) -> None:
+    """工作进程初始化"""
+    global _WORKER_CONVERTER
+    _WORKER_CONVERTER = _make_converter(*args)
+
+
+def _convert_chunk(chunk: List[str]) -> List[str]:
+    """在工作进程中转换一块句子"""
+    if _WORKER_CONVERTER is None:
+        raise RuntimeError("工作进程未初始化。")
+    return _WORKER_CONVERTER.text_many(chunk)
@@ -0,0 +1,184 @@
+# 内存拼音表。
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from yukkurimandarin.codec import KanaMatrix, TONE_CODES, decode_tone, encode_tone, encode_serial
+from yukkurimandarin.database import Database
+from yukkurimandarin.generate_gana import YINJIE, generate_hiragana
+
+
+class MemoryTable:
+    """
+    内存拼音表
+
+    一次性将 `pinyin_data` 表载入以(音节id, 声调编码)为下标的假名矩阵，
+    之后的批量查询完全在进程内完成，不再访问SQLite。
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]]) -> None:
+        self._matrix = KanaMatrix()
+        # 声调无法编码的数据（一般不会出现）
+        self._extra: Dict[Tuple[str, str], str] = {}
+        count = 0
+        for yinjie, tone, hiragana in entries:
+            code = encode_tone(tone)
+            if code is None:
+                self._extra[(yinjie, tone)] = hiragana
+            else:
+                self._matrix.set(yinjie, code, hiragana)
+            count += 1
+        self._count = count
+
+
+    @classmethod
+    def load(cls, db_path: Path) -> "MemoryTable":
+        """从数据库文件载入拼音表"""
+        db = Database(db_path, read_only=True)
+        try:
+            return cls(db.query_all())
+        finally:
+            db.close()
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    def query_batch(self, entries: List[Tuple[str, str]], default: str) -> List[str]:
+        """批量查询数据，无结果返回默认值（与 `Database.query_batch` 语义相同）"""
+        syllables, codes = encode_serial(entries)
+        result = self._matrix.query_codes(syllables, codes, default)
+        if self._extra:
+            for i, (entry, code) in enumerate(zip(entries, codes)):
+                if code is None and tuple(entry) in self._extra:
+                    result[i] = self._extra[tuple(entry)]
+        return result
+
+
+    def query_codes(self, syllables: Sequence[str], codes: Sequence[Optional[int]], default: str) -> List[str]:
+        """按音节和声调编码批量查询，无结果返回默认值"""
+        return self._matrix.query_codes(syllables, codes, default)
+
+
+@lru_cache(maxsize=len(YINJIE) * TONE_CODES)
+def rule_hiragana(yinjie: str, code: int) -> str:
+    """
+    按全局规则生成的假名音声（带缓存的 `generate_hiragana`）
+
+    Args:
+        yinjie: 音节
+        code: 声调编码
+
+    Returns:
+        含有音声记号的平假名，音节未知或本字声调为0时返回空字符串
+    """
+    if yinjie not in YINJIE or code // 6 % 6 == 0:
+        return ""
+    return generate_hiragana(yinjie, decode_tone(code))
+
+
+def rule_overrides(entries: Iterable[Tuple[str, str, str]]) -> List[Tuple[str, str, str]]:
+    """
+    找出与全局规则生成结果不同的拼音数据，用于压缩数据库
+
+    Args:
+        entries: 完整的拼音数据
+
+    Returns:
+        覆盖数据：与规则不同的条目保持原样；规则能够生成但 `entries` 中没有的条目，平假名记为空字符串（删除标记）
+    """
+    overrides = []
+    # 规则能够生成的(音节, 声调编码)中，尚未出现在 entries 里的
+    uncovered = {(yinjie, code) for yinjie in YINJIE for code in range(TONE_CODES) if code // 6 % 6 != 0}
+    for yinjie, tone, hiragana in entries:
+        code = encode_tone(tone)
+        if code is not None and (yinjie, code) in uncovered:
+            uncovered.discard((yinjie, code))
+            if hiragana == rule_hiragana(yinjie, code):
+                continue
+        overrides.append((yinjie, tone, hiragana))
+    overrides.extend((yinjie, decode_tone(code), "") for yinjie, code in sorted(uncovered))
+    return overrides
+
+
+class RuleTable:
+    """
+    规则拼音表
+
+    查询时先查找数据库中的覆盖数据，没有覆盖数据时由 `generate_hiragana` 按全局规则生成（带缓存）。
+    覆盖数据的平假名为空字符串时表示删除标记：该条目视为没有数据。
+    数据库只需保存与规则不同的条目（参见 `DatabaseManager.compact`），体积更小，载入也更快。
+    """
+
+    def __init__(self, overrides: Iterable[Tuple[str, str, str]]) -> None:
+        # 覆盖数据。删除标记也写入矩阵：字符串池中的空字符串对应非0的下标
+        self._matrix = KanaMatrix()
+        self._extra: Dict[Tuple[str, str], str] = {}
+        count = 0
+        for yinjie, tone, hiragana in overrides:
+            code = encode_tone(tone)
+            if code is None:
+                self._extra[(yinjie, tone)] = hiragana
+            else:
+                self._matrix.set(yinjie, code, hiragana)
+            count += 1
+        self._count = count
+        # 规则生成结果的缓存：单元格下标 -> 平假名
+        self._generated: Dict[int, str] = {}
+
+
+    @classmethod
+    def load(cls, db_path: Path) -> "RuleTable":
+        """从数据库文件载入覆盖数据"""
+        db = Database(db_path, read_only=True)
+        try:
+            return cls(db.query_all())
+        finally:
+            db.close()
+
+
+    def __len__(self) -> int:
+        """覆盖数据的条数"""
+        return self._count
+
+
+    def query_batch(self, entries: List[Tuple[str, str]], default: str) -> List[str]:
+        """批量查询数据，无结果返回默认值（与 `Database.query_batch` 语义相同）"""
+        syllables, codes = encode_serial(entries)
+        result = self.query_codes(syllables, codes, default)
+        if self._extra:
+            for i, (entry, code) in enumerate(zip(entries, codes)):
+                hiragana = self._extra.get(tuple(entry)) if code is None else None
+                if hiragana:
+                    result[i] = hiragana
+        return result
+
+
+    def query_codes(self, syllables: Sequence[str], codes: Sequence[Optional[int]], default: str) -> List[str]:
+        """按音节和声调编码批量查询，无结果返回默认值"""
+        ids = self._matrix.index._ids
+        cells = self._matrix._cells
+        pool = self._matrix._pool
+        generated = self._generated
+        keep = default == "keep"
+        result = []
+        for yinjie, code in zip(syllables, codes):
+            sid = ids.get(yinjie)
+            if sid is None or code is None:
+                hiragana = ""
+            else:
+                cell = sid * TONE_CODES + code
+                pid = cells[cell]
+                if pid:
+                    hiragana = pool[pid]
+                else:
+                    hiragana = generated.get(cell)
+                    if hiragana is None:
+                        hiragana = generated[cell] = rule_hiragana(yinjie, code)
+            if hiragana:
+                result.append(hiragana)
+            else:
+                result.append(yinjie if keep else default)
+        return result
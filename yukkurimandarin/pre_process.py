@@ -1,5 +1,6 @@
 # 预处理输入的文本。
 
+from yukkurimandarin.charclass import normalize_hanzi
 from yukkurimandarin.digit_to_chinese import digit_to_chinese
 
 
@@ -7,7 +8,7 @@ def pre_process(sentence: str) -> str:
     """
     预处理输入的句子
 
-    将阿拉伯数字和一些符号转换为汉字。
+    将阿拉伯数字和一些符号转换为汉字，并将兼容汉字替换为统一汉字。
     
     Args:
         sentence: 输入的句子
@@ -47,7 +48,7 @@ def pre_process(sentence: str) -> str:
     # 处理遗留数字
     if num_basket:
         result.append(digit_to_chinese("".join(num_basket)))
-    return "".join(result)
+    return normalize_hanzi("".join(result))
 
 
 def is_num(char: str) -> bool:
@@ -0,0 +1,142 @@
+# 可选的分阶段性能统计。
+
+import json
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, TextIO
+
+# 当前启用的统计器，None表示未启用
+_ACTIVE: Optional["Profiler"] = None
+
+
+class StageStats(NamedTuple):
+    """单个阶段的累计统计"""
+    calls: int
+    seconds: float
+    items: int
+    misses: int
+
+
+class Profiler:
+    """
+    分阶段统计转换流程的耗时
+
+    启用后，`Converter.text`、`hanzi_process` 和 `DatabaseManager.serial_search` 等会向其报告：
+    各阶段的调用次数、墙钟时间、处理的条目数（句子、片段或音节）和未命中数（缓存或拼音表）。
+    未启用时各处只做一次判空，几乎没有额外开销。
+
+    阶段之间存在包含关系，例如 `hanzi_process` 的耗时包含 `tokenize`、`pypinyin`、`sandhi` 和 `serial_search`。
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> with ym.profile() as profiler:
+      ...     ym.text_convert("油库里普通话。")
+      >>> print(profiler.report())
+
+    """
+
+    def __init__(self, callback: Optional[Callable[[str, float, int, int], None]] = None) -> None:
+        """
+        Args:
+            callback: 每次报告时调用的函数，参数为(阶段, 耗时秒数, 条目数, 未命中数)
+        """
+        self.callback = callback
+        self._stats: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+
+    def record(self, stage: str, seconds: float, items: int = 0, misses: int = 0) -> None:
+        """记录一次阶段调用"""
+        with self._lock:
+            stats = self._stats.get(stage)
+            if stats is None:
+                self._stats[stage] = [1, seconds, items, misses]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] += items
+                stats[3] += misses
+        if self.callback is not None:
+            self.callback(stage, seconds, items, misses)
+
+
+    def lap(self, stage: str, start: float, items: int = 0, misses: int = 0) -> float:
+        """记录从 `start` 到现在的耗时，并返回当前时刻，便于连续计时"""
+        now = perf_counter()
+        self.record(stage, now - start, items, misses)
+        return now
+
+
+    def stats(self) -> Dict[str, StageStats]:
+        """各阶段的累计统计"""
+        with self._lock:
+            return {stage: StageStats(*values) for stage, values in self._stats.items()}
+
+
+    def reset(self) -> None:
+        """清空统计"""
+        with self._lock:
+            self._stats.clear()
+
+
+    def report(self) -> str:
+        """生成便于阅读的统计表"""
+        lines = [f"{'stage':<20}{'calls':>10}{'total(ms)':>12}{'mean(us)':>12}{'items':>10}{'misses':>10}"]
+        for stage, s in self.stats().items():
+            mean = s.seconds / s.calls * 1e6 if s.calls else 0.0
+            lines.append(f"{stage:<20}{s.calls:>10}{s.seconds * 1e3:>12.3f}{mean:>12.1f}{s.items:>10}{s.misses:>10}")
+        return "\n".join(lines)
+
+
+    def dump(self, file: Optional[TextIO] = None) -> None:
+        """
+        以JSON格式输出统计
+
+        Args:
+            file: 输出的文件对象，默认输出到标准输出
+        """
+        data = {stage: s._asdict() for stage, s in self.stats().items()}
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+        if file is None:
+            print(text)
+        else:
+            file.write(text + "\n")
+
+
+def active_profiler() -> Optional[Profiler]:
+    """当前启用的统计器，未启用时返回None"""
+    return _ACTIVE
+
+
+def enable_profiling(profiler: Optional[Profiler] = None) -> Profiler:
+    """
+    启用统计（对整个进程生效）
+
+    Args:
+        profiler: 使用的统计器，默认新建一个
+
+    Returns:
+        启用的统计器
+    """
+    global _ACTIVE
+    _ACTIVE = profiler if profiler is not None else Profiler()
+    return _ACTIVE
+
+
+def disable_profiling() -> None:
+    """停用统计"""
+    global _ACTIVE
+    _ACTIVE = None
+
+
+@contextmanager
+def profile(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """在with块内启用统计，退出时恢复之前的状态"""
+    global _ACTIVE
+    previous = _ACTIVE
+    try:
+        yield enable_profiling(profiler)
+    finally:
+        _ACTIVE = previous
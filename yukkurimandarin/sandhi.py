@@ -0,0 +1,167 @@
+# 变调处理。
+# 声调保存在bytearray中，连续上声和“不”“一”等字的变调在一次处理中完成。
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from yukkurimandarin.codec import TONE_VALUE
+
+# 无效声调（例如没有拼音的字）
+INVALID = 255
+# 分隔点在字符序列中的占位符
+_MARK_CHAR = "\0"
+# ASCII字符 -> 声调
+_TONE_BYTES = bytes(TONE_VALUE.get(chr(b), INVALID) for b in range(256))
+
+
+class CharRule:
+    """
+    单字变调规则：本字的声调按后一字的声调改变
+
+    Args:
+        syllable: 本字的音节
+        tone: 本字原本的声调
+        changes: 后一字的声调 -> 本字的新声调
+        skip_prev: 前一字为其中任一字符时不变调
+        skip_next: 后一字为其中任一字符时不变调
+        word_initial: 是否仅在本字所在的词语以本字开头时变调（例如“一天”“一心一意”变调，“统一”“唯一”不变调）
+    """
+
+    def __init__(self,
+                 syllable: str,
+                 tone: int,
+                 changes: Dict[int, int],
+                 skip_prev: str = "",
+                 skip_next: str = "",
+                 word_initial: bool = False) -> None:
+        self.syllable = syllable
+        self.tone = tone
+        # 按后一字的声调直接查表，0表示不变
+        self.table = bytes(changes.get(t, 0) for t in range(256))
+        self.skip_prev = skip_prev
+        self.skip_next = skip_next
+        self.word_initial = word_initial
+
+
+# 数字（“一”在数字中不变调，例如“十一”“一一零”）
+_NUMERALS = "零〇一二三四五六七八九十两"
+
+# 字 -> 变调规则
+CHAR_RULES: Dict[str, CharRule] = {
+    # 不 + 去声 -> 阳平。例如：不对 bu2 dui4
+    "不": CharRule("bu", 4, {4: 2}, skip_next="不"),
+    # 一 + 去声 -> 阳平；一 + 阴平/阳平/上声 -> 去声。例如：一样 yi2 yang4，一天 yi4 tian1
+    "一": CharRule("yi", 1, {1: 4, 2: 4, 3: 4, 4: 2}, skip_prev="第" + _NUMERALS, skip_next=_NUMERALS + "月号",
+                  word_initial=True),
+}
+
+
+class _Trigger(NamedTuple):
+    rules: Dict[str, CharRule]
+    pattern: "re.Pattern[str]"
+
+
+_TRIGGERS: Dict[int, _Trigger] = {}
+
+
+def _trigger(rules: Dict[str, CharRule]) -> _Trigger:
+    """由规则表构造匹配触发字的正则表达式（按规则表缓存）"""
+    trigger = _TRIGGERS.get(id(rules))
+    if trigger is None or trigger.rules is not rules:
+        chars = "".join(re.escape(c) for c in rules) or "(?!)"
+        trigger = _TRIGGERS[id(rules)] = _Trigger(rules, re.compile(f"[{chars}]"))
+    return trigger
+
+
+def tone_array(pinyin_list: Sequence[Sequence[str]]) -> bytearray:
+    """取出拼音列表中每项的声调，无效声调记为 `INVALID`"""
+    # 末位字符编码为ASCII（非ASCII字符变为“?”）后整体查表
+    last_chars = "".join([p[0][-1] for p in pinyin_list]).encode("ascii", "replace")
+    return bytearray(last_chars.translate(_TONE_BYTES))
+
+
+def apply_sandhi(tones: bytearray,
+                 syllables: Sequence[str],
+                 words: List[str],
+                 mark: str = "/0",
+                 rules: Optional[Dict[str, CharRule]] = CHAR_RULES,
+                 threes: bool = True) -> None:
+    """
+    一次完成全部变调处理。直接修改 `tones`
+
+    各规则只读取原本的声调，彼此互不影响：连续上声只改变上声，单字规则只改变非上声的字。
+
+    Args:
+        tones: 与字逐一对应的声调
+        syllables: 与字逐一对应的音节
+        words: 分词结果，分隔点为 `mark`，其余每个词语的每个字对应一个声调
+        mark: 片段分隔符
+        rules: 单字变调规则，None表示不处理
+        threes: 是否处理连续上声
+    """
+    # 词语均由汉字组成，分隔符只会是独立的一项
+    text = "".join(words).replace(mark, _MARK_CHAR)
+    if len(text) != len(tones):
+        raise ValueError(f"处理结果出错：展开后的片段长度({len(text)})与拼音列表长度({len(tones)})不相等！")
+    # 单字变调：先在原本的声调上找出全部变化
+    changes = _char_changes(tones, syllables, words, text, mark, rules) if rules else []
+    if threes:
+        _modify_threes(tones)
+    for i, tone in changes:
+        tones[i] = tone
+
+
+def _char_changes(tones: bytearray,
+                  syllables: Sequence[str],
+                  words: List[str],
+                  text: str,
+                  mark: str,
+                  rules: Dict[str, CharRule]) -> List[tuple]:
+    """查找单字变调，返回(位置, 新声调)的列表"""
+    trigger = _trigger(rules)
+    changes = []
+    word_ends: Optional[List[int]] = None
+    last = len(text) - 1
+    for m in trigger.pattern.finditer(text):
+        i = m.start()
+        if i == last:
+            continue
+        rule = rules[text[i]]
+        new_tone = rule.table[tones[i+1]]
+        if (not new_tone
+            or tones[i] != rule.tone
+            or syllables[i] != rule.syllable
+            or text[i+1] in rule.skip_next
+            or (i > 0 and text[i-1] in rule.skip_prev)):
+            continue
+        if rule.word_initial:
+            # 仅在需要时计算词语边界
+            if word_ends is None:
+                word_ends = list(accumulate(1 if w == mark else len(w) for w in words))
+            k = bisect_right(word_ends, i)
+            start = word_ends[k-1] if k > 0 else 0
+            if text[start] != text[i]:
+                continue
+        changes.append((i, new_tone))
+    return changes
+
+
+def _modify_threes(tones: bytearray) -> None:
+    """连续上声变调。采用简化的两字组和三字组组合模式"""
+    i = tones.find(b"\x03\x03")
+    while i != -1:
+        # 首个两字组：0；三字组：1；两字组：2。
+        flag = 0
+        while i < len(tones) - 1 and tones[i] == 3 and tones[i+1] == 3:
+            if flag == 0:
+                flag = 1
+            elif flag == 1:
+                flag = 2
+            else:
+                tones[i-1] = 3
+                flag = 1
+            tones[i] = 2
+            i += 1
+        i = tones.find(b"\x03\x03", i + 1)
@@ -0,0 +1,285 @@
+# 常驻转换服务（JSON Lines协议）。
+#
+# 每行一个JSON请求，服务按顺序逐行返回JSON响应，客户端可以连续发送多个请求而无需等待（流水线）。
+#
+# 请求：
+#   {"id": 1, "text": "油库里普通话。", "without_accent": false, "non_hanzi": {"global_mode": "keep"}}
+#   {"id": 2, "pinyin": "you2 ku4 li3", "error": "", "without_accent": false}
+# 响应：
+#   {"id": 1, "ok": true, "result": "..."}
+#   {"id": 2, "ok": false, "message": "..."}
+
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+from typing import IO, Any, Dict, Iterable, List, Optional
+
+from yukkurimandarin.core import Converter
+from yukkurimandarin.database_mngr import DatabaseManager
+from yukkurimandarin.settings import NonHanziModes
+
+# non_hanzi 中允许的参数（处理模式只能是字符串）
+NON_HANZI_KEYS = ("global_mode", "global_replace", "en_mode", "en_replace", "ja_mode", "ja_replace",
+                  "pc_mode", "pc_replace", "other_mode", "other_replace")
+
+
+def handle_request(converter: Converter, request: Any) -> Dict[str, Any]:
+    """
+    处理一个请求
+
+    Args:
+        converter: 转换器
+        request: 解析后的JSON请求
+
+    Returns:
+        JSON响应
+    """
+    request_id = request.get("id") if isinstance(request, dict) else None
+    try:
+        if not isinstance(request, dict):
+            raise ValueError("请求必须是JSON对象。")
+        without_accent = request.get("without_accent")
+        if without_accent is not None and not isinstance(without_accent, bool):
+            raise ValueError(f"参数without_accent必须是布尔值: {without_accent}")
+        if "text" in request:
+            config = _non_hanzi_config(request.get("non_hanzi"))
+            result = converter.text(request["text"], without_accent, config)
+        elif "pinyin" in request:
+            error = request.get("error", "")
+            if not isinstance(error, str):
+                raise ValueError(f"参数error必须是字符串: {error}")
+            result = converter.pinyin(request["pinyin"], error, without_accent)
+        else:
+            raise ValueError("请求中必须包含text或pinyin。")
+    except Exception as e:
+        return {"id": request_id, "ok": False, "message": str(e)}
+    return {"id": request_id, "ok": True, "result": result}
+
+
+def _non_hanzi_config(options: Any) -> Optional[NonHanziModes]:
+    """由请求中的 `non_hanzi` 构造非汉字处理模式，未指定时返回None（使用转换器的设置）"""
+    if options is None:
+        return None
+    if not isinstance(options, dict):
+        raise ValueError("参数non_hanzi必须是JSON对象。")
+    unknown = [key for key in options if key not in NON_HANZI_KEYS]
+    if unknown:
+        raise ValueError(f"未知的non_hanzi参数: {unknown}")
+    if not all(isinstance(value, str) for value in options.values()):
+        raise ValueError("non_hanzi的参数值必须是字符串。")
+    return NonHanziModes(**options)
+
+
+def serve_stream(converter: Converter, infile: IO[str], outfile: IO[str]) -> None:
+    """
+    从输入流逐行读取请求，并向输出流逐行写出响应，直到输入结束
+
+    Args:
+        converter: 转换器
+        infile: 输入流（文本模式）
+        outfile: 输出流（文本模式）
+    """
+    for line in infile:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response: Dict[str, Any] = {"id": None, "ok": False, "message": f"JSON格式错误: {e}"}
+        else:
+            response = handle_request(converter, request)
+        outfile.write(json.dumps(response, ensure_ascii=False))
+        outfile.write("\n")
+        outfile.flush()
+
+
+def serve(socket_path: Optional[str] = None,
+          db_path: Optional[str] = None,
+          backend: str = "memory",
+          without_accent: bool = False,
+          reload_interval: Optional[float] = DatabaseManager.DEFAULT_RELOAD_INTERVAL) -> None:
+    """
+    启动常驻转换服务。分词器、拼音词典和拼音表只在启动时载入一次
+
+    Args:
+        socket_path: Unix套接字路径，默认使用标准输入和标准输出
+        db_path: 拼音数据库路径，默认使用内置数据库
+        backend: 拼音表查询后端，参见 `DatabaseManager`
+        without_accent: 是否默认去除音声记号
+        reload_interval: 检查拼音数据库是否被其他进程修改的最短间隔（秒），检测到修改后无需重启即可使用新数据。
+            默认为1秒，None表示不检查
+    """
+    db_mngr = DatabaseManager(db_path, backend=backend, reload_interval=reload_interval)
+    with Converter(without_accent=without_accent, pinyin_database=db_mngr) as converter:
+        converter.warmup(background=False)
+        if socket_path is None:
+            stdin = open(sys.stdin.fileno(), "r", encoding="utf-8", closefd=False)
+            stdout = open(sys.stdout.fileno(), "w", encoding="utf-8", closefd=False)
+            serve_stream(converter, stdin, stdout)
+            return
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("当前平台不支持Unix套接字。")
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                infile = io.TextIOWrapper(self.rfile, encoding="utf-8")
+                outfile = io.TextIOWrapper(self.wfile, encoding="utf-8")
+                serve_stream(converter, infile, outfile)
+
+        # 清理上次残留的套接字文件
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as server:
+            server.daemon_threads = True
+            try:
+                server.serve_forever()
+            finally:
+                os.unlink(socket_path)
+
+
+class Client:
+    """
+    常驻转换服务的客户端
+
+    Usage:
+
+      >>> from yukkurimandarin.server import Client
+      >>> with Client.spawn() as client:
+      ...     print(client.text("油库里普通话。"))
+      ...     print(client.text_many(["你好。", "谢谢。"]))
+
+    """
+
+    # 流水线中最多同时等待的响应数
+    WINDOW = 32
+
+    def __init__(self, reader: IO[str], writer: IO[str], process: Optional[subprocess.Popen] = None,
+                 sock: Optional[socket.socket] = None) -> None:
+        """
+        一般通过 `Client.spawn` 或 `Client.connect` 创建
+
+        Args:
+            reader: 读取响应的文本流
+            writer: 发送请求的文本流
+            process: 由客户端启动的服务进程
+            sock: 客户端持有的套接字
+        """
+        self._reader = reader
+        self._writer = writer
+        self._process = process
+        self._sock = sock
+        self._next_id = 0
+
+
+    @classmethod
+    def spawn(cls, backend: str = "memory", db_path: Optional[str] = None) -> "Client":
+        """启动一个通过标准输入输出通信的服务子进程"""
+        command = [sys.executable, "-m", "yukkurimandarin", "serve", "--backend", backend]
+        if db_path is not None:
+            command += ["--db", db_path]
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   encoding="utf-8", bufsize=1)
+        return cls(process.stdout, process.stdin, process=process) # type: ignore[arg-type]
+
+
+    @classmethod
+    def connect(cls, socket_path: str) -> "Client":
+        """连接到监听Unix套接字的服务"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+        return cls(sock.makefile("r", encoding="utf-8"), sock.makefile("w", encoding="utf-8"), sock=sock)
+
+
+    def request_many(self, requests: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        连续发送多个请求后再依次读取响应（流水线）
+
+        Returns:
+            与请求一一对应的响应
+        """
+        responses: List[Dict[str, Any]] = []
+        pending = 0
+        for request in requests:
+            self._writer.write(json.dumps(request, ensure_ascii=False))
+            self._writer.write("\n")
+            pending += 1
+            # 限制未读取的响应数，避免双方的管道缓冲区都被写满而互相等待
+            if pending >= self.WINDOW:
+                self._writer.flush()
+                responses.append(self._read_response())
+                pending -= 1
+        self._writer.flush()
+        for _ in range(pending):
+            responses.append(self._read_response())
+        return responses
+
+
+    def _read_response(self) -> Dict[str, Any]:
+        line = self._reader.readline()
+        if not line:
+            raise ValueError("转换服务已断开。")
+        return json.loads(line)
+
+
+    def _results(self, requests: List[Dict[str, Any]]) -> List[str]:
+        """发送请求并取出结果，失败时抛出ValueError"""
+        for request in requests:
+            request["id"] = self._next_id
+            self._next_id += 1
+        results = []
+        for response in self.request_many(requests):
+            if not response.get("ok"):
+                raise ValueError(response.get("message"))
+            results.append(response["result"])
+        return results
+
+
+    def text(self, sentence: str, without_accent: Optional[bool] = None,
+             non_hanzi: Optional[Dict[str, str]] = None) -> str:
+        """转换汉字句子，参见 `text_convert`。`non_hanzi` 为 `NonHanziModes` 的参数（处理模式只能是字符串）"""
+        return self.text_many([sentence], without_accent, non_hanzi)[0]
+
+
+    def text_many(self, sentences: Iterable[str], without_accent: Optional[bool] = None,
+                  non_hanzi: Optional[Dict[str, str]] = None) -> List[str]:
+        """以流水线方式转换多个汉字句子"""
+        requests = []
+        for sentence in sentences:
+            request: Dict[str, Any] = {"text": sentence}
+            if without_accent is not None:
+                request["without_accent"] = without_accent
+            if non_hanzi is not None:
+                request["non_hanzi"] = non_hanzi
+            requests.append(request)
+        return self._results(requests)
+
+
+    def pinyin(self, sentence: str, error: str = "", without_accent: Optional[bool] = None) -> str:
+        """转换拼音，参见 `pinyin_convert`"""
+        request: Dict[str, Any] = {"pinyin": sentence, "error": error}
+        if without_accent is not None:
+            request["without_accent"] = without_accent
+        return self._results([request])[0]
+
+
+    def close(self) -> None:
+        """断开连接。由客户端启动的服务进程会随之退出"""
+        self._writer.close()
+        self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+        if self._process is not None:
+            self._process.wait()
+
+
+    def __enter__(self) -> "Client":
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,126 @@
+# 流式转换与文件转换。
+
+import os
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from yukkurimandarin.core import Converter, get_default_converter
+from yukkurimandarin.database_mngr import DatabaseManager
+from yukkurimandarin.settings import NonHanziModes
+
+# 可选组件（仅用于类型注解）
+if TYPE_CHECKING:
+    from jieba import Tokenizer
+
+
+def iter_convert(lines: Iterable[str],
+                 batch_size: int = 64,
+                 without_accent: bool = False,
+                 tokenizer: Optional["Tokenizer"] = None,
+                 pinyin_database: Optional[DatabaseManager] = None,
+                 non_hanzi_config: Optional[NonHanziModes] = None) -> Iterator[str]:
+    """
+    惰性地逐个转换输入的句子
+
+    每次最多从输入中读取 `batch_size` 个句子并批量转换，内存占用与输入总长度无关。
+
+    Args:
+        lines: 输入的句子，可以是任意可迭代对象（例如打开的文件）
+        batch_size: 每批转换的句子数。处理交互式输入时可设为1，避免等待凑满一批
+        without_accent: 是否去除音声记号
+        tokenizer: jieba分词器
+        pinyin_database: 拼音数据库管理类
+        non_hanzi_config: 非汉字处理模式
+
+    Returns:
+        惰性产生与输入一一对应的转换结果的迭代器
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> for result in ym.iter_convert(["油库里普通话。", "你好。"]):
+      ...     print(result)
+
+    """
+    # 参数检查在调用时进行，而不是推迟到首次迭代
+    if batch_size < 1:
+        raise ValueError(f"参数batch_size必须是正整数: {batch_size}")
+    return _iter_convert(lines, batch_size, without_accent, tokenizer, pinyin_database, non_hanzi_config)
+
+
+def _iter_convert(lines: Iterable[str],
+                  batch_size: int,
+                  without_accent: bool,
+                  tokenizer: Optional["Tokenizer"],
+                  pinyin_database: Optional[DatabaseManager],
+                  non_hanzi_config: Optional[NonHanziModes]) -> Iterator[str]:
+    """`iter_convert` 的生成器部分"""
+    # 使用共享的默认转换器
+    if tokenizer is None and pinyin_database is None:
+        yield from _iter_batches(get_default_converter(), lines, batch_size, without_accent, non_hanzi_config)
+        return
+    # 使用临时转换器
+    with Converter(tokenizer=tokenizer, pinyin_database=pinyin_database) as converter:
+        yield from _iter_batches(converter, lines, batch_size, without_accent, non_hanzi_config)
+
+
+def convert_file(src: str,
+                 dst: str,
+                 encoding: str = "utf-8",
+                 batch_size: int = 256,
+                 without_accent: bool = False,
+                 tokenizer: Optional["Tokenizer"] = None,
+                 pinyin_database: Optional[DatabaseManager] = None,
+                 non_hanzi_config: Optional[NonHanziModes] = None) -> int:
+    """
+    逐行转换文本文件，并将结果逐行写入另一个文件
+
+    读写均使用缓冲，按批处理，内存占用与文件大小无关。
+
+    Args:
+        src: 输入文件路径
+        dst: 输出文件路径，不能与输入文件相同
+        encoding: 输入和输出文件的编码
+        batch_size: 每批转换的行数
+        without_accent: 是否去除音声记号
+        tokenizer: jieba分词器
+        pinyin_database: 拼音数据库管理类
+        non_hanzi_config: 非汉字处理模式
+
+    Returns:
+        转换的行数
+
+    Usage:
+
+      >>> import yukkurimandarin as ym
+      >>> ym.convert_file("novel.txt", "novel_ym.txt")
+
+    """
+    # 输出文件以写入模式打开时会被清空，与输入为同一文件时将在读取前丢失全部内容
+    if Path(dst).exists() and os.path.samefile(src, dst):
+        raise ValueError(f"输入文件与输出文件不能是同一个文件: {dst}")
+    count = 0
+    with open(Path(src), "r", encoding=encoding) as infile, \
+         open(Path(dst), "w", encoding=encoding) as outfile:
+        lines = (line.rstrip("\n") for line in infile)
+        results = iter_convert(lines, batch_size, without_accent, tokenizer, pinyin_database, non_hanzi_config)
+        for result in results:
+            outfile.write(result)
+            outfile.write("\n")
+            count += 1
+    return count
+
+
+def _iter_batches(converter: Converter,
+                  lines: Iterable[str],
+                  batch_size: int,
+                  without_accent: Optional[bool],
+                  non_hanzi_config: Optional[NonHanziModes]) -> Iterator[str]:
+    """按批读取输入并转换"""
+    iterator = iter(lines)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield from converter.text_many(batch, without_accent, non_hanzi_config)